@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Run many headless games in parallel and write one JSON summary per game.
+
+Example:
+    python src/batch.py --games 10000 --workers 8 --seed 1 --out results.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from config.constants import INVENTORY_CAPACITY
+from engine.game import Action, Game
+from entity.entity import EntityType
+from utils.logger import configure_log_levels
+
+# バッチ実行時にレベルを下げるロガー
+LOGGERS = ("game", "map", "entity", "renderer", "prefetch")
+
+_MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+Policy = Callable[[Game, random.Random], Action]
+
+
+def random_policy(game: Game, rng: random.Random) -> Action:
+    """Move in a random direction (attacking whatever is in the way)."""
+    return ("move",) + rng.choice(_MOVES)
+
+
+def descend_policy(game: Game, rng: random.Random) -> Action:
+    """Heal when hurt, pick up items, and head for the down stairs.
+
+    The policy sees the whole map. Items are left behind once the inventory
+    is full. When there are no stairs or the way is blocked, it falls back
+    to a random move.
+    """
+    player = game.player
+    game_map = game.game_map
+
+    if player.hp * 3 < player.max_hp:
+        for i, item in enumerate(player.inventory):
+            if item.effect == "heal":
+                return ("use", i)
+
+    stairs = None
+    for entity in game_map.spatial_index.items_at(player.x, player.y):
+        if entity.entity_type == EntityType.STAIRS_DOWN:
+            return ("descend",)
+        # 満杯のときは拾えず手番も進まないので、そのまま階段を目指す
+        if entity.item is not None and len(player.inventory) < INVENTORY_CAPACITY:
+            return ("pickup",)
+
+    for entity in game.entities:
+        if entity.entity_type == EntityType.STAIRS_DOWN:
+            stairs = entity
+            break
+    if stairs is None:
+        return random_policy(game, rng)
+
+    distance = game_map.distance_map(stairs.x, stairs.y)
+    step = game_map.next_step(player.x, player.y, distance, (0, 0))
+    if step == (0, 0):
+        return random_policy(game, rng)
+    return ("move",) + step
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "descend": descend_policy,
+}
+
+
+def game_seed(base_seed: int, index: int) -> int:
+    """Derive the seed of the index-th game of a batch.
+
+    Args:
+        base_seed: The seed of the whole batch.
+        index: The game number.
+
+    Returns:
+        int: A 64-bit seed.
+    """
+    return random.Random(f"{base_seed}:game:{index}").getrandbits(64)
+
+
+def run_game(
+    seed: int, policy: str = "descend", max_turns: int = 5000
+) -> Dict[str, Any]:
+    """Play one headless game to the end and summarize it.
+
+    Args:
+        seed: The game seed.
+        policy: The name of the policy in POLICIES choosing the actions.
+        max_turns: Stop the game after this many turns.
+
+    Returns:
+        Dict[str, Any]: A JSON-serializable summary of the game.
+    """
+    # ワーカープロセスが全コアを使うため、階層の先読みスレッドは使わない
+    with Game(seed=seed, prefetch_levels=False) as game:
+        choose = POLICIES[policy]
+        rng = random.Random(f"{seed}:policy")
+        max_depth = game.player.dungeon_level
+        outcome = "max_turns"
+
+        while game.turn < max_turns:
+            observation = game.step(choose(game, rng))
+            max_depth = max(max_depth, observation.dungeon_level)
+            if observation.done:
+                outcome = "died" if game.player.hp <= 0 else "ended"
+                break
+
+        player = game.player
+        return {
+            "seed": seed,
+            "policy": policy,
+            "outcome": outcome,
+            "killed_by": game.killed_by,
+            "turns": game.turn,
+            "max_depth": max_depth,
+            "dungeon_level": player.dungeon_level,
+            "level": player.level,
+            "xp": player.xp,
+            "gold": player.gold,
+            "hp": player.hp,
+            "max_hp": player.max_hp,
+        }
+
+
+def _init_worker(log_level: str) -> None:
+    configure_log_levels({name: log_level for name in LOGGERS})
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run headless games in parallel and write per-game summaries."
+    )
+    parser.add_argument("--games", type=int, default=100, help="number of games")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes (default: all cores)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the batch")
+    parser.add_argument(
+        "--out",
+        default="batch_results.jsonl",
+        help="JSON Lines output file, or - for stdout",
+    )
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="descend")
+    parser.add_argument("--max-turns", type=int, default=5000)
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    seeds = [game_seed(args.seed, i) for i in range(args.games)]
+    play = partial(run_game, policy=args.policy, max_turns=args.max_turns)
+    workers = max(1, args.workers or 1)
+    # 小さすぎるチャンクはプロセス間通信が多くなるため、ある程度まとめて渡す
+    chunksize = max(1, args.games // (workers * 16))
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(args.log_level,)
+        ) as executor:
+            # 結果はゲーム順に、終わったものから逐次書き出す
+            for summary in executor.map(play, seeds, chunksize=chunksize):
+                out.write(json.dumps(summary) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+from typing import List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from entity.entity import Entity
+
+
+class CombatStats:
+    """
+    Stats of creatures (the player and monsters).
+    """
+
+    __slots__ = (
+        "hp",
+        "max_hp",
+        "power",
+        "sight_radius",
+        "level",
+        "xp",
+        "xp_given",
+        "dungeon_level",
+        "strength",
+        "speed",
+        "special",
+        "regeneration",
+        "confused_turns",
+        "move_count",
+        "gold",
+        "inventory",
+    )
+
+    def __init__(
+        self,
+        hp: Optional[int] = None,
+        max_hp: Optional[int] = None,
+        power: Optional[Tuple[int, int]] = None,
+        sight_radius: Optional[int] = None,
+        level: int = 1,
+        xp: int = 0,
+        xp_given: int = 0,
+        dungeon_level: int = 1,
+        strength: int = 0,
+        speed: float = 1.0,
+        special: Optional[str] = None,
+        regeneration: bool = False,
+        confused_turns: int = 0,
+        move_count: float = 0.0,
+        gold: int = 0,
+        inventory: Optional[List["Entity"]] = None,
+    ):
+        self.hp = hp
+        self.max_hp = max_hp
+        self.power = power
+        self.sight_radius = sight_radius
+        self.level = level
+        self.xp = xp
+        self.xp_given = xp_given
+        self.dungeon_level = dungeon_level
+        self.strength = strength
+        self.speed = speed
+        self.special = special
+        self.regeneration = regeneration
+        self.confused_turns = confused_turns
+        self.move_count = move_count
+        self.gold = gold
+        self.inventory = inventory if inventory is not None else []
+
+    def copy(self) -> "CombatStats":
+        """Return a copy of these stats with its own (shallow) inventory list."""
+        stats = CombatStats.__new__(CombatStats)
+        stats.hp = self.hp
+        stats.max_hp = self.max_hp
+        stats.power = self.power
+        stats.sight_radius = self.sight_radius
+        stats.level = self.level
+        stats.xp = self.xp
+        stats.xp_given = self.xp_given
+        stats.dungeon_level = self.dungeon_level
+        stats.strength = self.strength
+        stats.speed = self.speed
+        stats.special = self.special
+        stats.regeneration = self.regeneration
+        stats.confused_turns = self.confused_turns
+        stats.move_count = self.move_count
+        stats.gold = self.gold
+        stats.inventory = list(self.inventory)
+        return stats
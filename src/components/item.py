@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+from typing import Optional, Tuple
+
+
+class ItemStats:
+    """
+    Stats of items: weapons, ammunition, armor, rings, consumables and gold.
+    """
+
+    __slots__ = (
+        "damage_dice",
+        "hit_bonus",
+        "two_handed",
+        "ranged",
+        "ammo_type",
+        "ammo_count",
+        "nutrition",
+        "food_count",
+        "effect",
+        "effect_amount",
+        "defense",
+        "weight",
+        "strength",
+        "sustain",
+        "search",
+        "gold_amount",
+    )
+
+    def __init__(
+        self,
+        damage_dice: Optional[Tuple[int, int]] = None,
+        hit_bonus: Optional[int] = None,
+        two_handed: bool = False,
+        ranged: bool = False,
+        ammo_type: Optional[str] = None,
+        ammo_count: Optional[int] = None,
+        nutrition: Optional[int] = None,
+        food_count: Optional[int] = None,
+        effect: Optional[str] = None,
+        effect_amount: int = 0,
+        defense: int = 0,
+        weight: int = 0,
+        strength: int = 0,
+        sustain: bool = False,
+        search: int = 0,
+        gold_amount: int = 0,
+    ):
+        self.damage_dice = damage_dice
+        self.hit_bonus = hit_bonus
+        self.two_handed = two_handed
+        self.ranged = ranged
+        self.ammo_type = ammo_type
+        self.ammo_count = ammo_count
+        self.nutrition = nutrition
+        self.food_count = food_count
+        self.effect = effect
+        self.effect_amount = effect_amount
+        self.defense = defense
+        self.weight = weight
+        self.strength = strength
+        self.sustain = sustain
+        self.search = search
+        self.gold_amount = gold_amount
+
+    def copy(self) -> "ItemStats":
+        """Return an independent copy of these stats."""
+        stats = ItemStats.__new__(ItemStats)
+        for name in ItemStats.__slots__:
+            setattr(stats, name, getattr(self, name))
+        return stats
@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+from typing import Optional
+
+
+class StackInfo:
+    """
+    Stacking information of items that can be carried in piles.
+    """
+
+    __slots__ = ("stack_size", "count")
+
+    def __init__(self, stack_size: Optional[int] = None, count: int = 1):
+        self.stack_size = stack_size  # 最大スタックサイズ
+        self.count = count  # 現在のスタック数
+
+    def copy(self) -> "StackInfo":
+        """Return an independent copy of this stack information."""
+        return StackInfo(self.stack_size, self.count)
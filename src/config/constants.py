@@ -13,6 +13,7 @@ ROOM_MIN_SIZE = 4  # Rogueの部屋サイズ
 MAX_ROOMS = 9  # Rogueの部屋数
 MAX_DUNGEON_LEVEL = 26
 INVENTORY_CAPACITY = 26
+MAX_RESIDENT_LEVELS = 8  # メモリ上に保持する訪問済み階層の数
 
 # Entity Generation Settings
 MAX_MONSTERS_PER_ROOM = 4  # Rogueに準拠
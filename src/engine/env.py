@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""Gym-style environments around a headless Game.
+
+RogueEnv follows the Gymnasium API (reset() returns (observation, info),
+step() returns (observation, reward, terminated, truncated, info)) without
+depending on it. VectorRogueEnv steps several games in lockstep, one after
+another, and stacks their observations.
+
+An observation is a dict of two arrays:
+
+    "map"    uint8 (MAP_CHANNELS, width, height), indexed [channel, x, y]:
+             walkable, transparent, visible, explored, then one layer per
+             group of ENTITY_LAYERS (only entities on visible cells appear).
+    "stats"  float32 (len(STAT_NAMES),): the player's stats.
+"""
+
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .game import Action, Game
+from config.constants import MAP_HEIGHT, MAP_WIDTH
+from entity.entity import EntityType
+from map.game_map import TILE_LAYERS
+from map.spatial_index import kind_mask
+
+_ITEM_TYPES = (
+    EntityType.ITEM,
+    EntityType.WEAPON,
+    EntityType.RANGED,
+    EntityType.AMMO,
+    EntityType.FOOD,
+    EntityType.ARMOR,
+    EntityType.SHIELD,
+    EntityType.RING,
+)
+
+# エンティティ層の名前と、その層に描くエンティティの種類
+ENTITY_LAYERS: Tuple[Tuple[str, Tuple[EntityType, ...]], ...] = (
+    ("player", (EntityType.PLAYER,)),
+    ("monster", (EntityType.MONSTER,)),
+    ("item", _ITEM_TYPES),
+    ("gold", (EntityType.GOLD,)),
+    ("stairs_down", (EntityType.STAIRS_DOWN,)),
+    ("stairs_up", (EntityType.STAIRS_UP,)),
+    ("amulet", (EntityType.AMULET,)),
+)
+MAP_CHANNELS = len(TILE_LAYERS) + len(ENTITY_LAYERS)
+# 各エンティティ層に対応する SpatialIndex.kinds のビット
+_LAYER_MASKS = tuple(kind_mask(*types) for _, types in ENTITY_LAYERS)
+
+STAT_NAMES = (
+    "hp",
+    "max_hp",
+    "level",
+    "xp",
+    "gold",
+    "strength",
+    "dungeon_level",
+    "inventory_size",
+    "x",
+    "y",
+)
+
+_MOVES = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+_INVENTORY_SLOTS = 26
+
+# 整数の行動番号と Game.perform の行動の対応
+ACTIONS: Tuple[Action, ...] = tuple(
+    [("move", dx, dy) for dx, dy in _MOVES]
+    + [("wait",), ("pickup",), ("descend",), ("ascend",)]
+    + [("use", i) for i in range(_INVENTORY_SLOTS)]
+    + [("drop", i) for i in range(_INVENTORY_SLOTS)]
+)
+
+Observation = Dict[str, np.ndarray]
+
+
+def observe_into(game: Game, tiles: np.ndarray, stats: np.ndarray) -> None:
+    """Write the observation of a game into caller-provided arrays.
+
+    Nothing is allocated besides small temporaries: the tile layers are
+    copied from GameMap.tile_layers and the entity layers are derived from
+    GameMap.entity_kinds, so rows of a preallocated batch can be filled in
+    place.
+
+    Args:
+        game: The game to observe.
+        tiles: A (MAP_CHANNELS, width, height) uint8 array.
+        stats: A (len(STAT_NAMES),) float32 array.
+
+    Raises:
+        ValueError: If the arrays do not have the observation shapes.
+    """
+    game_map = game.game_map
+    shape = (MAP_CHANNELS, game_map.width, game_map.height)
+    if tiles.shape != shape or stats.shape != (len(STAT_NAMES),):
+        raise ValueError(
+            f"Expected arrays of shapes {shape} and {(len(STAT_NAMES),)}, "
+            f"got {tiles.shape} and {stats.shape}"
+        )
+    layers = game_map.tile_layers
+    tiles[: len(TILE_LAYERS)] = layers
+    visible = layers[TILE_LAYERS.index("visible")]
+    kinds = game_map.entity_kinds
+    for channel, mask in enumerate(_LAYER_MASKS, len(TILE_LAYERS)):
+        np.logical_and(kinds & mask, visible, out=tiles[channel], casting="unsafe")
+
+    player = game.player
+    stats[:] = (
+        player.hp,
+        player.max_hp,
+        player.level,
+        player.xp,
+        player.gold,
+        player.strength,
+        player.dungeon_level,
+        len(player.inventory),
+        player.x,
+        player.y,
+    )
+
+
+def observe(game: Game) -> Observation:
+    """Build the array observation of a game.
+
+    Args:
+        game: The game to observe.
+
+    Returns:
+        Observation: The "map" and "stats" arrays.
+    """
+    game_map = game.game_map
+    tiles = np.empty((MAP_CHANNELS, game_map.width, game_map.height), dtype=np.uint8)
+    stats = np.empty(len(STAT_NAMES), dtype=np.float32)
+    observe_into(game, tiles, stats)
+    return {"map": tiles, "stats": stats}
+
+
+class RogueEnv:
+    """
+    One headless game with a Gym-style interface.
+
+    Actions are indexes into ACTIONS (or the action tuples themselves). The
+    reward is 1 for every dungeon level reached for the first time and -1
+    for dying. An episode terminates when the game ends and is truncated
+    after max_turns turns.
+    """
+
+    def __init__(self, max_turns: int = 5000):
+        """Create the environment. Call reset() before step().
+
+        Args:
+            max_turns: Truncate episodes after this many turns.
+        """
+        self.max_turns = max_turns
+        self.game: Optional[Game] = None
+        self._max_depth = 0
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[Observation, Dict[str, Any]]:
+        """Start a new game.
+
+        Args:
+            seed: The game seed. If None, one is drawn from the global random
+                module.
+
+        Returns:
+            Tuple[Observation, Dict[str, Any]]: The first observation and info.
+        """
+        self.start(seed)
+        assert self.game is not None
+        return observe(self.game), self.info()
+
+    def step(
+        self, action: Union[int, Action]
+    ) -> Tuple[Observation, float, bool, bool, Dict[str, Any]]:
+        """Play one turn.
+
+        Args:
+            action: An index into ACTIONS, or an action for Game.perform.
+
+        Returns:
+            Tuple[Observation, float, bool, bool, Dict[str, Any]]: The
+            observation, reward, terminated and truncated flags, and info.
+
+        Raises:
+            RuntimeError: If reset() has not been called.
+        """
+        reward, terminated, truncated = self.play(action)
+        assert self.game is not None
+        return observe(self.game), reward, terminated, truncated, self.info()
+
+    def start(self, seed: Optional[int]) -> None:
+        """Start a new game without building an observation.
+
+        Args:
+            seed: The game seed, as for reset().
+        """
+        self.close()
+        # 1ゲームずつ進めるため、先読みスレッドは使わない
+        self.game = Game(seed=seed, prefetch_levels=False)
+        self._max_depth = self.game.player.dungeon_level
+
+    def play(self, action: Union[int, Action]) -> Tuple[float, bool, bool]:
+        """Play one turn without building an observation.
+
+        Args:
+            action: As for step().
+
+        Returns:
+            Tuple[float, bool, bool]: The reward, terminated and truncated.
+
+        Raises:
+            RuntimeError: If reset() has not been called.
+        """
+        game = self.game
+        if game is None:
+            raise RuntimeError("Call reset() before step()")
+        if not isinstance(action, tuple):
+            action = ACTIONS[action]
+
+        result = game.step(action)
+        reward = 0.0
+        depth = result.dungeon_level
+        if depth > self._max_depth:
+            reward += depth - self._max_depth
+            self._max_depth = depth
+        if game.player.hp <= 0:
+            reward -= 1.0
+
+        terminated = result.done
+        truncated = not terminated and game.turn >= self.max_turns
+        return reward, terminated, truncated
+
+    def info(self) -> Dict[str, Any]:
+        """Return the info dict of the current game."""
+        game = self.game
+        assert game is not None
+        return {
+            "seed": game.rng.seed,
+            "turn": game.turn,
+            "max_depth": self._max_depth,
+            "killed_by": game.killed_by,
+        }
+
+    def close(self) -> None:
+        if self.game is not None:
+            self.game.close()
+            self.game = None
+
+
+class VectorRogueEnv:
+    """
+    num_envs independent games stepped in lockstep.
+
+    Observations, rewards and flags are stacked along a first axis of size
+    num_envs; each game writes its observation straight into its row of the
+    stacked arrays. A game that terminates or is truncated is reset at once
+    with the next seed of its slot: the returned observation is then the
+    first one of the new game, and the info of that slot holds the last
+    observation and info of the old game under "final_observation" and
+    "final_info".
+
+    The games are stepped one after another in the calling thread, so a step
+    takes as long as stepping num_envs RogueEnvs in a loop; only the result
+    arrays are shared. Use batch.py for parallel games.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        max_turns: int = 5000,
+        copy: bool = True,
+        out: Optional[Observation] = None,
+    ):
+        """Create the environments. Call reset() before step().
+
+        Args:
+            num_envs: The number of games.
+            max_turns: Truncate episodes after this many turns.
+            copy: Return copies of the observation arrays. If False, the same
+                arrays are returned and overwritten by the next step.
+            out: Caller-provided "map" (num_envs, MAP_CHANNELS, width, height)
+                uint8 and "stats" (num_envs, len(STAT_NAMES)) float32 arrays.
+                Every observation is written into them in place and they are
+                returned as is, whatever copy says.
+
+        Raises:
+            ValueError: If num_envs is less than 1 or out has the wrong shapes.
+        """
+        if num_envs < 1:
+            raise ValueError("num_envs must be at least 1")
+        self.num_envs = num_envs
+        self.copy = copy and out is None
+        self.envs = [RogueEnv(max_turns) for _ in range(num_envs)]
+        self._seed: Optional[int] = None
+        self._episodes = [0] * num_envs
+        if out is None:
+            out = {
+                "map": np.zeros(
+                    (num_envs, MAP_CHANNELS, MAP_WIDTH, MAP_HEIGHT), dtype=np.uint8
+                ),
+                "stats": np.zeros((num_envs, len(STAT_NAMES)), dtype=np.float32),
+            }
+        self._tiles = out["map"]
+        self._stats = out["stats"]
+        if len(self._tiles) != num_envs or len(self._stats) != num_envs:
+            raise ValueError(f"out must hold {num_envs} observations")
+
+    def _episode_seed(self, index: int) -> Optional[int]:
+        if self._seed is None:
+            return None
+        episode = self._episodes[index]
+        self._episodes[index] += 1
+        return random.Random(f"{self._seed}:env:{index}:{episode}").getrandbits(64)
+
+    def _observation(self) -> Observation:
+        if self.copy:
+            return {"map": self._tiles.copy(), "stats": self._stats.copy()}
+        return {"map": self._tiles, "stats": self._stats}
+
+    def reset(
+        self, seed: Optional[int] = None
+    ) -> Tuple[Observation, List[Dict[str, Any]]]:
+        """Start a new game in every slot.
+
+        Args:
+            seed: The seed of the whole batch; every game and every later
+                episode gets its own seed derived from it. If None, seeds are
+                drawn from the global random module.
+
+        Returns:
+            Tuple[Observation, List[Dict[str, Any]]]: The stacked first
+            observations and the info of each game.
+        """
+        self._seed = seed
+        self._episodes = [0] * self.num_envs
+        infos = []
+        for i, env in enumerate(self.envs):
+            env.start(self._episode_seed(i))
+            observe_into(env.game, self._tiles[i], self._stats[i])
+            infos.append(env.info())
+        return self._observation(), infos
+
+    def step(
+        self, actions: Sequence[Union[int, Action]]
+    ) -> Tuple[Observation, np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        """Play one turn in every game.
+
+        Args:
+            actions: One action per game.
+
+        Returns:
+            The stacked observations, and arrays of rewards, terminated and
+            truncated flags, and the info of each game.
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}")
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            rewards[i], terminated[i], truncated[i] = env.play(action)
+            info = env.info()
+            if terminated[i] or truncated[i]:
+                # 終了したゲームの最後の観測を残してから次のゲームを始める
+                final_observation = observe(env.game)
+                env.start(self._episode_seed(i))
+                info = {
+                    **env.info(),
+                    "final_observation": final_observation,
+                    "final_info": info,
+                }
+            observe_into(env.game, self._tiles[i], self._stats[i])
+            infos.append(info)
+
+        return self._observation(), rewards, terminated, truncated, infos
+
+    def close(self) -> None:
+        for env in self.envs:
+            env.close()
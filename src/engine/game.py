@@ -1,18 +1,26 @@
 #!/usr/bin/env python3
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, TYPE_CHECKING
 import tcod
-import random
+import numpy as np
 from tcod.event import KeySym
 from entity.entity import Entity, EntityType
 from map.game_map import GameMap
+from map.level_cache import LevelCache
+from map.spatial_index import EntityList
+from .observation import Observation
+from .prefetch import LevelPrefetcher
 from .render import Renderer
+from .replay import Recorder
+from .savefile import read_save, write_save
 from utils.logger import setup_logger
+from utils.rng import RandomStreams
 from config.constants import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
     MAP_WIDTH,
     MAP_HEIGHT,
     INVENTORY_CAPACITY,
+    MAX_RESIDENT_LEVELS,
     TITLE,
     STARTING_WEAPON_POWER,
     STARTING_WEAPON_BONUS,
@@ -28,28 +36,138 @@ from config.constants import (
 from config.messages import MESSAGES
 from config.items import MELEE_WEAPONS, RANGED_WEAPONS, AMMO, FOODS
 
+if TYPE_CHECKING:
+    from entity.monster_store import MonsterStore
+
+# プレイヤーの行動（例: ("move", 1, 0)、("use", 2)、("descend",)）
+Action = Tuple[Any, ...]
+
 
 class Game:
     instance = None  # シングルトンインスタンス
 
-    def __init__(self):
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        prefetch_levels: bool = True,
+        level_spill_dir: Optional[str] = None,
+        record_path: Optional[str] = None,
+    ):
+        """Create a new game.
+
+        Args:
+            seed: The game seed. Games with the same seed play out the same
+                for the same actions. If None, a seed is drawn from the global
+                random module.
+            prefetch_levels: Generate the next level in a background thread
+                while the current one is played. The levels are the same
+                either way.
+            level_spill_dir: A directory to write visited levels to once more
+                than MAX_RESIDENT_LEVELS are cached. If None, the least
+                recently visited levels are forgotten instead.
+            record_path: Record the game to this replay file, see
+                engine.replay.
+        """
         Game.instance = self  # インスタンスを保存
         self.logger = setup_logger("game")
         self.logger.info("Game initializing...")
+        # マップ生成・戦闘・AIで別々の乱数ストリームを使う
+        self.rng = RandomStreams(seed)
+        self.recorder: Optional[Recorder] = None
+        if record_path is not None:
+            self.recorder = Recorder(record_path, self.rng.seed)
 
         self.player = self._create_player()
-        self.entities: List[Entity] = [self.player]
-        self.game_map = GameMap(MAP_WIDTH, MAP_HEIGHT, 1)
-        self.game_map.make_map(self.player, self.entities)
+        # ウィンドウを開くまでは None（run() で作成）
+        self.renderer: Optional[Renderer] = None
+        self.game_map, self.entities = self._generate_level(1, self.player)
         self._equip_player(self.player)
         self.game_map.compute_fov(
             self.player.x, self.player.y, self.player.sight_radius
         )
 
+        self._init_levels(prefetch_levels, level_spill_dir)
+
         self.logger.info("Game initialized successfully")
         self.messages = []  # メッセージ履歴を保持
+        self.message_count = 0  # add_message で追加されたメッセージの総数
+        self.turn = 0  # step() で進めたターン数
+        self.killed_by: Optional[str] = None  # プレイヤーを倒したモンスターの名前
+        self.game_state = "playing"
         self._show_welcome_message()
 
+    def _init_levels(
+        self, prefetch_levels: bool, level_spill_dir: Optional[str]
+    ) -> None:
+        # 訪問済みの階層（戻ったときは再生成せずに復元する）
+        self.level_cache = LevelCache(MAX_RESIDENT_LEVELS, level_spill_dir)
+        # 次の階層をバックグラウンドで先に生成しておく
+        self.prefetcher: Optional[LevelPrefetcher] = None
+        if prefetch_levels:
+            self.prefetcher = LevelPrefetcher(self._generate_level_ahead)
+            next_level = self.player.dungeon_level + 1
+            if next_level not in self.level_cache:
+                self.prefetcher.prefetch(next_level)
+
+    def save(self, path: str) -> None:
+        """Save the game to a file.
+
+        The file holds the player, the current and visited levels, the
+        message log and the random streams, so a loaded game plays on exactly
+        like this one.
+
+        Args:
+            path: The file to write.
+        """
+        write_save(self, path)
+        self.logger.info(f"Game saved to {path}")
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        prefetch_levels: bool = True,
+        level_spill_dir: Optional[str] = None,
+    ) -> "Game":
+        """Load a game written by save().
+
+        Args:
+            path: The save file.
+            prefetch_levels: As for Game().
+            level_spill_dir: As for Game().
+
+        Returns:
+            Game: The loaded game, which becomes Game.instance.
+
+        Raises:
+            SaveFormatError: If the file is not a save file of this version.
+        """
+        saved = read_save(path)
+        game = cls.__new__(cls)
+        Game.instance = game
+        game.logger = setup_logger("game")
+        game.rng = RandomStreams(saved.seed)
+        game.rng.setstate(saved.rng_state)
+        game.recorder = None
+        game.player = saved.player
+        game.renderer = None
+        game.game_map = saved.game_map
+        game.entities = saved.entities
+        game.game_map.compute_fov(
+            game.player.x, game.player.y, game.player.sight_radius
+        )
+        game._init_levels(prefetch_levels, level_spill_dir)
+        for snapshot in saved.cached_levels:
+            game.level_cache.put(snapshot)
+
+        game.messages = saved.messages
+        game.message_count = saved.message_count
+        game.turn = saved.turn
+        game.killed_by = saved.killed_by
+        game.game_state = saved.game_state
+        game.logger.info(f"Game loaded from {path}")
+        return game
+
     def _show_welcome_message(self) -> None:
         """Display the initial welcome message in the message area."""
         welcome_messages = [
@@ -170,23 +288,23 @@ class Game:
             vsync=True,
         ) as context:
             console = tcod.console.Console(SCREEN_WIDTH, SCREEN_HEIGHT, order="F")
-            renderer = Renderer(console)
-
-            # 初期ゲーム状態を設定
-            self.game_state = "playing"
+            # 変化したマスだけを描き直す差分描画モード
+            self.renderer = Renderer(console, incremental=True)
 
             while True:
-                renderer.render_all(
+                self.renderer.render_all(
                     self.entities, self.game_map, self.player, self.messages
                 )
 
                 # インベントリ表示中はインベントリを描画
                 if self.game_state == "inventory":
                     self._render_inventory(console)
+                    # 次のフレームではインベントリの跡を消すため全体を描き直す
+                    self.renderer.invalidate()
 
                 context.present(console)
 
-                renderer.clear_all(self.entities)
+                self.renderer.clear_all(self.entities)
 
                 # プレイヤーが死亡している場合はゲームを終了
                 if self.player.hp <= 0:
@@ -197,45 +315,130 @@ class Game:
                 for event in tcod.event.wait():
                     action = self._handle_input(event)
                     if action:
-                        if self._process_result(action):
+                        result = self.perform(action)
+                        if result and self._process_result(result):
                             return
 
                 # プレイ中のみモンスターのターンを処理
                 if self.game_state == "playing":
                     self._process_monster_turns()
 
-    def _handle_input(self, event: tcod.event.Event) -> Optional[str]:
-        if isinstance(event, tcod.event.Quit):
+    def step(self, action: Action) -> Observation:
+        """Play one turn without a window, renderer or keyboard.
+
+        The action goes through the same code as keyboard input, then the
+        monsters take their turn, just like one iteration of run().
+
+        Args:
+            action: The player's action, see perform().
+
+        Returns:
+            Observation: The state of the game after the turn.
+        """
+        Game.instance = self
+        message_count = self.message_count
+        done = False
+
+        result = self.perform(action)
+        if result and self._process_result(result):
+            done = True
+        elif self.game_state == "playing":
+            self._process_monster_turns()
+        done = self._end_turn(done)
+
+        new_messages = min(self.message_count - message_count, len(self.messages))
+        return Observation.from_game(
+            self, self.messages[len(self.messages) - new_messages :], done
+        )
+
+    def _end_turn(self, done: bool) -> bool:
+        """Finish a turn the way step() does, also used by replays.
+
+        Args:
+            done: Whether the player's action already ended the game.
+
+        Returns:
+            bool: Whether the game is over.
+        """
+        # run() と同様に、死亡したらメッセージを出して終了
+        if not done and self.player.hp <= 0:
+            self.add_message(MESSAGES["death"])
+            done = True
+        self.turn += 1
+        return done
+
+    def perform(self, action: Action) -> Optional[str]:
+        """Carry out one player action.
+
+        Keyboard input is translated into these actions, so interactive and
+        headless play behave the same.
+
+        Args:
+            action: One of ("move", dx, dy), ("pickup",), ("use", index),
+                ("drop", index), ("descend",), ("ascend",), ("wait",) or
+                ("quit",). Indexes are inventory positions.
+
+        Returns:
+            Optional[str]: A result for _process_result, e.g. "quit".
+
+        Raises:
+            ValueError: If the action is not one of the above.
+        """
+        # 実行前に記録する（この行動でクラッシュしてもリプレイに残る）
+        if self.recorder is not None:
+            self.recorder.record(action)
+        name = action[0]
+        if name == "move":
+            self._move_player(action[1], action[2])
+            return None
+        if name == "pickup":
+            return self._handle_pickup()
+        if name == "use":
+            self._use_item(action[1])
+            return None
+        if name == "drop":
+            return self._drop_item(action[1])
+        if name == "descend":
+            return self._handle_stairs(EntityType.STAIRS_DOWN)
+        if name == "ascend":
+            return self._handle_stairs(EntityType.STAIRS_UP)
+        if name == "wait":
+            return None
+        if name == "quit":
             return "quit"
+        raise ValueError(f"Unknown action: {action!r}")
+
+    def _handle_input(self, event: tcod.event.Event) -> Optional[Action]:
+        if isinstance(event, tcod.event.Quit):
+            return ("quit",)
         elif isinstance(event, tcod.event.KeyDown):
             return self._handle_key(event)
         return None
 
-    def _handle_key(self, event: tcod.event.KeyDown) -> Optional[str]:
+    def _handle_key(self, event: tcod.event.KeyDown) -> Optional[Action]:
         # インベントリ表示中は専用の入力処理
-        if hasattr(self, "game_state") and self.game_state == "inventory":
+        if self.game_state == "inventory":
             return self._handle_inventory_input(event)
 
         if self._is_movement_key(event):
             dx, dy = self._get_movement_delta(event)
-            self._move_player(dx, dy)
-            return None
+            return ("move", dx, dy)
 
         if event.sym == KeySym.g:
-            return self._handle_pickup()
+            return ("pickup",)
 
         if event.sym == KeySym.i:
             self._show_inventory()
             return None
 
         if event.sym == KeySym.d:
-            return self._drop_item()
+            return self._prompt_drop_item()
 
         if self._is_stairs_key(event):
-            return self._handle_stairs(event)
+            return ("descend",) if event.sym == KeySym.PERIOD else ("ascend",)
 
         if event.sym == KeySym.ESCAPE:
-            return "quit"
+            return ("quit",)
 
         return None
 
@@ -284,28 +487,18 @@ class Game:
             return
 
         # Check if walkable
-        if not self.game_map.tiles[new_x][new_y].walkable:
+        if not self.game_map.walkable[new_x, new_y]:
             return
 
         # Check for monster collision
-        target = None
-        for entity in self.entities:
-            if (
-                entity.blocks
-                and entity.x == new_x
-                and entity.y == new_y
-                and entity.entity_type == EntityType.MONSTER
-            ):
-                target = entity
-                break
+        target = self.game_map.spatial_index.blocking_entity_at(new_x, new_y)
 
-        if target:
+        if target and target.entity_type == EntityType.MONSTER:
             # Attack monster
             self._attack_monster(target)
         else:
             # Move
-            self.player.x = new_x
-            self.player.y = new_y
+            self.game_map.spatial_index.move(self.player, new_x, new_y)
 
             # Auto pickup items at destination
             self._auto_pickup()
@@ -318,12 +511,9 @@ class Game:
     def _auto_pickup(self) -> None:
         """Automatically pick up gold at the player's current position."""
         # Look for gold at player's position
-        for entity in list(self.entities):  # Create copy of list for iteration
-            if (
-                entity.x == self.player.x
-                and entity.y == self.player.y
-                and entity.entity_type == EntityType.GOLD
-            ):
+        index = self.game_map.spatial_index
+        for entity in index.items_at(self.player.x, self.player.y):
+            if entity.entity_type == EntityType.GOLD:
                 # Add gold to player's purse and show message
                 self.player.gold += entity.gold_amount
                 self.add_message(MESSAGES["gold_picked"].format(entity.gold_amount))
@@ -337,6 +527,7 @@ class Game:
     def add_message(self, message: str) -> None:
         """メッセージをゲームのメッセージログに追加する"""
         self.messages.append(message)
+        self.message_count += 1
         if len(self.messages) > 100:  # メッセージ履歴の上限
             self.messages.pop(0)
 
@@ -357,7 +548,7 @@ class Game:
         )
 
         # クリティカルヒットの判定（10%の確率）
-        if random.random() < 0.1:
+        if self.rng.combat.random() < 0.1:
             damage *= 2
             self.add_message(MESSAGES["player_crit"].format(target.name))
 
@@ -382,38 +573,102 @@ class Game:
         Returns:
             int: The total damage value.
         """
-        import random
-
         base_damage, dice = damage_dice
-        return base_damage + random.randint(1, dice)
+        return base_damage + self.rng.combat.randint(1, dice)
 
     def _process_monster_turns(self) -> None:
+        if self.recorder is not None:
+            self.recorder.tick()
+
         # プレイヤーが死亡している場合はモンスターのターンを処理しない
         if self.player.hp <= 0:
             return
 
-        for entity in self.entities:
-            if entity.entity_type == EntityType.MONSTER and entity.hp > 0:
-                entity.take_turn(self.player, self.game_map, self.entities)
+        # ターン開始時点のモンスター一覧（ゴールド回収でリストが変化しても影響しない）
+        monsters = [
+            entity
+            for entity in self.entities
+            if entity.entity_type == EntityType.MONSTER and entity.hp > 0
+        ]
+        if not monsters:
+            return
+
+        store = self.game_map.monster_store
+        if store is None or any(monster._store is not store for monster in monsters):
+            for monster in monsters:
+                monster.take_turn(self.player, self.game_map, self.entities)
+            return
+
+        self._process_monster_turns_batched(monsters, store)
+
+    def _process_monster_turns_batched(
+        self, monsters: List[Entity], store: "MonsterStore"
+    ) -> None:
+        """Run one turn for every monster using the MonsterStore arrays.
+
+        Speed, distances, sight checks and move directions are computed for
+        all monsters at once. Actions are then resolved in entity-list order,
+        so each move sees the occupancy left by the monsters before it, exactly
+        as if Entity.take_turn had been called for each monster in turn. Movers
+        share one distance map to the player and pick their steps from it.
+
+        Args:
+            monsters: The living monsters, in entity-list order.
+            store: The MonsterStore every monster is attached to.
+        """
+        slots = store.slots_of(monsters)
+        acting = store.accumulate_speed(slots)
+        confused = acting & (store.confused_turns[slots] > 0)
+
+        # プレイヤーまでの距離と移動方向を一括計算
+        px, py = self.player.x, self.player.y
+        dx, dy, distances = store.offsets_to(px, py, slots)
+        in_sight = acting & ~confused & (distances <= store.sight_radius[slots])
+        attackers = in_sight & (distances <= 1)
+        movers = in_sight & ~attackers
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step_x = np.rint(dx / distances).astype(int).tolist()
+            step_y = np.rint(dy / distances).astype(int).tolist()
+        # 全モンスターで共有するプレイヤーへの距離マップ（移動するモンスターがいる時だけ）
+        distance_map = None
+
+        # 行動の解決はリスト順に1回だけ行う（先に動いたモンスターが優先）
+        for i in np.flatnonzero(acting):
+            monster = monsters[i]
+            if confused[i]:
+                monster._handle_confusion(self.game_map, self.entities)
+                monster.confused_turns -= 1
+            elif attackers[i]:
+                monster.attack(self.player, self.entities)
+            elif movers[i]:
+                if distance_map is None:
+                    distance_map = self.game_map.distance_map(px, py)
+                step = self.game_map.next_step(
+                    monster.x, monster.y, distance_map, (step_x[i], step_y[i])
+                )
+                if step != (0, 0):
+                    monster.move(step[0], step[1], self.game_map, self.entities)
+
+        acted = slots[acting]
+        store.move_count[acted] -= 1.0
+        # 混乱中のモンスターは再生しない
+        store.regenerate(slots[acting & ~confused])
 
     def _is_stairs_key(self, event: tcod.event.KeyDown) -> bool:
         return event.sym in (KeySym.PERIOD, KeySym.COMMA)
 
-    def _handle_stairs(self, event: tcod.event.KeyDown) -> Optional[str]:
-        for entity in self.entities:
-            if entity.x == self.player.x and entity.y == self.player.y:
-                if (
-                    event.sym == KeySym.PERIOD
-                    and entity.entity_type == EntityType.STAIRS_DOWN
-                ):
-                    self._change_level(self.player.dungeon_level + 1)
-                    return None
-                elif (
-                    event.sym == KeySym.COMMA
-                    and entity.entity_type == EntityType.STAIRS_UP
-                ):
-                    self._change_level(self.player.dungeon_level - 1)
-                    return None
+    def _handle_stairs(self, stairs_type: EntityType) -> Optional[str]:
+        """Take the stairs of the given type if the player stands on them.
+
+        Args:
+            stairs_type: EntityType.STAIRS_DOWN or EntityType.STAIRS_UP.
+        """
+        index = self.game_map.spatial_index
+        for entity in index.items_at(self.player.x, self.player.y):
+            if entity.entity_type == stairs_type:
+                step = 1 if stairs_type == EntityType.STAIRS_DOWN else -1
+                self._change_level(self.player.dungeon_level + step)
+                return None
         return None
 
     def _handle_pickup(self) -> str:
@@ -428,7 +683,7 @@ class Game:
         self.game_state = "inventory"
         self.inventory_index = None
 
-    def _handle_inventory_input(self, event: tcod.event.KeyDown) -> Optional[str]:
+    def _handle_inventory_input(self, event: tcod.event.KeyDown) -> Optional[Action]:
         # ESCキーでインベントリを閉じる
         if event.sym == KeySym.ESCAPE:
             self.game_state = "playing"
@@ -437,23 +692,24 @@ class Game:
         # a-zキーでアイテムを選択
         index = event.sym - KeySym.a
         if 0 <= index < len(self.player.inventory):
-            self._use_item(index)
             self.game_state = "playing"
-            return None
+            return ("use", index)
 
         return None
 
     def _use_item(self, index: int) -> None:
-        if index >= len(self.player.inventory):
+        if not 0 <= index < len(self.player.inventory):
             return
 
         item = self.player.inventory[index]
         if item.effect:
             self.player.use_item(item, self.entities, self.game_map)
 
-    def _drop_item(self) -> Optional[str]:
+    def _prompt_drop_item(self) -> Optional[Action]:
+        """Ask on the terminal which item to drop."""
         if not self.player.inventory:
-            return MESSAGES["inventory_empty"]
+            # 所持品がない場合のメッセージは _drop_item が返す
+            return ("drop", 0)
 
         print("\nSelect an item to drop:")
         for i, item in enumerate(self.player.inventory):
@@ -461,11 +717,17 @@ class Game:
 
         key = input()
         if ord("a") <= ord(key) <= ord("z"):
-            item_index = ord(key) - ord("a")
-            if item_index < len(self.player.inventory):
-                item = self.player.inventory[item_index]
-                self.player.drop_item(item, self.entities)
-                return None
+            return ("drop", ord(key) - ord("a"))
+
+        return None
+
+    def _drop_item(self, index: int) -> Optional[str]:
+        if not self.player.inventory:
+            return MESSAGES["inventory_empty"]
+
+        if 0 <= index < len(self.player.inventory):
+            item = self.player.inventory[index]
+            self.player.drop_item(item, self.entities)
 
         return None
 
@@ -477,12 +739,9 @@ class Game:
             self.add_message(MESSAGES["death"])
             return True
 
-        for entity in self.entities:
-            if (
-                entity.entity_type == EntityType.AMULET
-                and entity.x == self.player.x
-                and entity.y == self.player.y
-            ):
+        index = self.game_map.spatial_index
+        for entity in index.items_at(self.player.x, self.player.y):
+            if entity.entity_type == EntityType.AMULET:
                 self.add_message(MESSAGES["victory"])
                 return True
 
@@ -492,20 +751,116 @@ class Game:
         # 階層移動メッセージを表示
         self.add_message(MESSAGES["welcome_level"].format(new_level))
 
+        # プレイヤーを除いて今の階層を保存する
+        going_down = new_level > self.player.dungeon_level
+        self.entities.remove(self.player)
+        self.level_cache.store(self.game_map, self.entities)
+
         self.player.dungeon_level = new_level
-        self.entities = [self.player]
-        self.game_map = GameMap(MAP_WIDTH, MAP_HEIGHT, new_level)
-        self.game_map.make_map(self.player, self.entities)
+        # 前の階層の背景レイヤーは不要になる
+        if self.renderer is not None:
+            self.renderer.drop_map_cache()
+        snapshot = self.level_cache.load(new_level)
+        prefetched = None
+        if snapshot is None and self.prefetcher is not None:
+            prefetched = self.prefetcher.take(new_level)
+        if snapshot is not None:
+            self.game_map, self.entities = snapshot.restore()
+            arrival = EntityType.STAIRS_UP if going_down else EntityType.STAIRS_DOWN
+            self._place_player_at_stairs(arrival)
+        elif prefetched is not None:
+            self.game_map, self.entities, stand_in = prefetched
+            self._replace_stand_in(stand_in)
+        else:
+            self.game_map, self.entities = self._generate_level(new_level, self.player)
 
         # 新しい階層でFOVを計算
         self.game_map.compute_fov(
             self.player.x, self.player.y, self.player.sight_radius
         )
+        if self.prefetcher is not None and new_level + 1 not in self.level_cache:
+            self.prefetcher.prefetch(new_level + 1)
 
         # アミュレットが近くにある場合のメッセージ（26階のみ）
         if new_level == 26:
             self.add_message(MESSAGES["amulet_nearby"])
 
+    def _generate_level(
+        self, dungeon_level: int, player: Entity
+    ) -> Tuple[GameMap, EntityList]:
+        """Generate a dungeon level with the player placed in it.
+
+        Args:
+            dungeon_level: The level to generate.
+            player: The entity to place in the first room.
+
+        Returns:
+            Tuple[GameMap, EntityList]: The new map and its entity list.
+        """
+        game_map = GameMap(
+            MAP_WIDTH, MAP_HEIGHT, dungeon_level, rng=self.rng.mapgen(dungeon_level)
+        )
+        entities = game_map.create_entity_list([player])
+        game_map.make_map(player, entities)
+        return game_map, entities
+
+    def _generate_level_ahead(
+        self, dungeon_level: int
+    ) -> Tuple[GameMap, EntityList, Entity]:
+        """Generate a level for the prefetcher, with a stand-in for the player.
+
+        Level generation only uses the player's position and sight radius, so
+        the result is the same as generating with the real player.
+        """
+        stand_in = Entity(
+            0,
+            0,
+            self.player.char,
+            self.player.color,
+            self.player.name,
+            EntityType.PLAYER,
+            sight_radius=self.player.sight_radius,
+        )
+        game_map, entities = self._generate_level(dungeon_level, stand_in)
+        return game_map, entities, stand_in
+
+    def _replace_stand_in(self, stand_in: Entity) -> None:
+        """Put the player where the stand-in of a prefetched level stands."""
+        self.entities.remove(stand_in)
+        self.player.x = stand_in.x
+        self.player.y = stand_in.y
+        self.entities.insert(0, self.player)
+
+    def _place_player_at_stairs(self, stairs_type: EntityType) -> None:
+        """Put the player on the stairs of a restored level.
+
+        The player arrives on the up stairs when coming from above and on the
+        down stairs when coming from below, or in the first room if the
+        stairs are missing. A monster standing there pushes the player to the
+        nearest free cell.
+        """
+        x, y = self.game_map.rooms[0].center if self.game_map.rooms else (0, 0)
+        for entity in self.entities:
+            if entity.entity_type == stairs_type:
+                x, y = entity.x, entity.y
+                break
+        self.player.x, self.player.y = self.game_map.find_free_cell(x, y)
+        self.entities.insert(0, self.player)
+
+    def close(self) -> None:
+        """Stop background level generation and close the level and replay files."""
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown()
+        self.level_cache.clear()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def __enter__(self) -> "Game":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def _render_inventory(self, console: tcod.console.Console) -> None:
         # Set inventory window position and size
         inventory_width = 40
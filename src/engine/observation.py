@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass, field
+from typing import List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from engine.game import Game
+
+
+@dataclass
+class Observation:
+    """
+    What a headless caller sees after Game.step: the player's state and the
+    messages produced during the turn.
+    """
+
+    turn: int
+    x: int
+    y: int
+    hp: int
+    max_hp: int
+    level: int
+    xp: int
+    gold: int
+    dungeon_level: int
+    inventory_size: int
+    done: bool
+    messages: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_game(cls, game: "Game", messages: List[str], done: bool) -> "Observation":
+        """Build an observation from the current state of a game.
+
+        Args:
+            game: The game to observe.
+            messages: The messages added during the turn.
+            done: Whether the game is over.
+
+        Returns:
+            Observation: The observation.
+        """
+        player = game.player
+        return cls(
+            turn=game.turn,
+            x=player.x,
+            y=player.y,
+            hp=player.hp,
+            max_hp=player.max_hp,
+            level=player.level,
+            xp=player.xp,
+            gold=player.gold,
+            dungeon_level=player.dungeon_level,
+            inventory_size=len(player.inventory),
+            done=done,
+            messages=messages,
+        )
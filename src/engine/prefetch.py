@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+from utils.logger import setup_logger
+
+T = TypeVar("T")
+
+
+class LevelPrefetcher(Generic[T]):
+    """
+    Generates dungeon levels ahead of time in a background thread.
+
+    The generate function must be deterministic for a given level (e.g. by
+    drawing from a per-level random stream), so a prefetched level is the
+    same as one generated on demand.
+    """
+
+    def __init__(self, generate: Callable[[int], T]):
+        """Create the prefetcher.
+
+        Args:
+            generate: Builds the level with the given number. It runs in the
+                background thread and must not touch state shared with the
+                current level.
+        """
+        self.logger = setup_logger("prefetch")
+        self._generate = generate
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[int, "Future[T]"] = {}
+
+    def prefetch(self, level: int) -> None:
+        """Start generating a level unless it is already being generated.
+
+        Levels requested earlier that were never taken are discarded.
+
+        Args:
+            level: The dungeon level to generate.
+        """
+        if level in self._pending:
+            return
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="level-prefetch"
+            )
+        self.logger.debug(f"Prefetching dungeon level {level}")
+        self._pending[level] = self._executor.submit(self._generate, level)
+
+    def take(self, level: int) -> Optional[T]:
+        """Return a prefetched level, waiting for it if it is not finished yet.
+
+        Args:
+            level: The dungeon level wanted.
+
+        Returns:
+            Optional[T]: The generated level, or None if it was not prefetched.
+        """
+        future = self._pending.pop(level, None)
+        if future is None:
+            return None
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Discard pending levels and stop the background thread."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,26 +1,84 @@
 #!/usr/bin/env python3
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+import logging
+import numpy as np
 import tcod
 from tcod import libtcodpy
 from entity.entity import Entity, EntityType
 from map.game_map import GameMap
-from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT, MAP_HEIGHT
 from utils.logger import setup_logger
 
+# マップタイルの見た目（インデックス = 壁なら2 + 視界内なら1）
+_TILE_GRAPHICS = np.array(
+    [
+        (ord("."), (64, 64, 64), (0, 0, 0)),  # 床（探索済み）
+        (ord("."), (192, 192, 192), (0, 0, 0)),  # 床（視界内）
+        (ord("#"), (128, 128, 128), (0, 0, 0)),  # 壁（探索済み）
+        (ord("#"), (255, 255, 255), (0, 0, 0)),  # 壁（視界内）
+    ],
+    dtype=tcod.console.rgb_graphic,
+)
+# 何も描かれていないマス（console.clear() の既定値と同じ）
+_BLANK = np.array(
+    (ord(" "), (255, 255, 255), (0, 0, 0)), dtype=tcod.console.rgb_graphic
+)
+# メッセージエリアの先頭行
+MESSAGE_TOP = 47
+
+# エンティティの見た目（文字, 前景色）
+EntityGraphic = Tuple[str, Tuple[int, int, int]]
+
 
 class Renderer:
     """Handles all rendering operations for the game."""
 
-    def __init__(self, console: tcod.console.Console):
+    def __init__(self, console: tcod.console.Console, incremental: bool = False):
         """Initialize the renderer.
 
         Args:
             console: The TCOD console to render to.
+            incremental: If True, frames after the first only redraw the cells
+                that changed since the previous frame. Nothing else may draw
+                on the console in between unless invalidate() is called.
         """
-        self.logger = setup_logger("renderer")
+        # 毎フレーム呼ばれるため、既定ではデバッグログを出力しない
+        self.logger = setup_logger("renderer", logging.INFO)
         self.logger.info("Initializing renderer")
         self.console = console
         self.game_map = None
+        self.incremental = incremental
+
+        # 前フレームで描画した内容（差分描画に使う）
+        self._full_redraw = True
+        self._drawn_visible: Optional[np.ndarray] = None
+        self._drawn_explored: Optional[np.ndarray] = None
+        self._drawn_entities: Dict[Tuple[int, int], EntityGraphic] = {}
+        self._drawn_status: Optional[str] = None
+        self._drawn_messages: Optional[List[str]] = None
+
+        # 探索済みタイルを描いておく背景レイヤー（GameMap ごとに作り直す）
+        self._background: Optional[tcod.console.Console] = None
+        self._background_map: Optional[GameMap] = None
+        self._background_explored: Optional[np.ndarray] = None
+
+    def invalidate(self) -> None:
+        """Make the next frame a full redraw.
+
+        Call this after drawing over the console outside of the renderer, e.g.
+        an inventory overlay.
+        """
+        self._full_redraw = True
+
+    def drop_map_cache(self) -> None:
+        """Forget the cached background layer of the current map.
+
+        Call this when the level is replaced; the next frame is redrawn from
+        scratch with a new layer for the new map.
+        """
+        self._background = None
+        self._background_map = None
+        self._background_explored = None
+        self._full_redraw = True
 
     def render_all(
         self,
@@ -31,13 +89,22 @@ class Renderer:
     ) -> None:
         """Render the entire game screen.
 
+        In incremental mode only the changes since the previous frame are
+        drawn, unless the map was replaced or invalidate() was called.
+
         Args:
             entities: List of all entities to render.
             game_map: The current game map.
             player: The player entity.
             messages: List of messages to display.
         """
-        self.logger.debug("Rendering frame")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Rendering frame")
+
+        if self.incremental and not self._full_redraw and game_map is self.game_map:
+            self._render_changes(entities, game_map, player, messages)
+            return
+
         # Clear console completely
         self.console.clear()
 
@@ -46,32 +113,103 @@ class Renderer:
         self._render_entities(entities)
         self._render_ui(player)
         self._render_messages(messages)
+        self._drawn_visible = game_map.visible.copy()
+        self._drawn_explored = game_map.explored.copy()
+        self._full_redraw = False
+
+    def _render_changes(
+        self,
+        entities: List[Entity],
+        game_map: GameMap,
+        player: Entity,
+        messages: List[str],
+    ) -> None:
+        """Redraw only the cells, status and messages that changed.
+
+        Args:
+            entities: List of all entities to render.
+            game_map: The current game map, the same as in the previous frame.
+            player: The player entity.
+            messages: List of messages to display.
+        """
+        # FOVや探索状態が変わったマス
+        dirty = (game_map.visible != self._drawn_visible) | (
+            game_map.explored != self._drawn_explored
+        )
+
+        # エンティティが現れた・消えた・変わったマス
+        entity_cells = self._entity_cells(entities)
+        for cell, graphic in self._drawn_entities.items():
+            if entity_cells.get(cell) != graphic:
+                dirty[cell] = True
+        for cell, graphic in entity_cells.items():
+            if self._drawn_entities.get(cell) != graphic:
+                dirty[cell] = True
 
-    def _render_map(self, game_map: GameMap) -> None:
+        if dirty.any():
+            self._render_map(game_map, dirty)
+            for (x, y), (char, color) in entity_cells.items():
+                if dirty[x, y]:
+                    self.console.print(x, y + 1, char, color, (0, 0, 0))
+            self._drawn_visible[dirty] = game_map.visible[dirty]
+            self._drawn_explored[dirty] = game_map.explored[dirty]
+        self._drawn_entities = entity_cells
+
+        if self._status_text(player) != self._drawn_status:
+            self._render_ui(player)
+        if messages[-3:] != self._drawn_messages:
+            self._render_messages(messages)
+
+    def _render_map(self, game_map: GameMap, mask: Optional[np.ndarray] = None) -> None:
         """Render the game map with FOV.
 
+        The explored tiles come from a cached background layer, and the
+        visible tiles are drawn over it with a few array operations on
+        console.rgb. This requires the console to be created with order="F".
+        Map row y is drawn on console row y + 1, below the status bar.
+
         Args:
             game_map: The game map to render.
+            mask: If given, only these cells are redrawn. Otherwise the whole
+                map area is.
+        """
+        background = self._update_background(game_map)
+        view = self.console.rgb[0 : game_map.width, 1 : game_map.height + 1]
+        if mask is None:
+            background.blit(self.console, dest_x=0, dest_y=1)
+            lit = game_map.visible
+        else:
+            view[mask] = background.rgb[mask]
+            lit = game_map.visible & mask
+        graphic = (~game_map.transparent[lit]).astype(np.intp) * 2 + 1
+        view[lit] = _TILE_GRAPHICS[graphic]
+
+    def _update_background(self, game_map: GameMap) -> tcod.console.Console:
+        """Return the background layer of a map, adding newly explored tiles.
+
+        The layer holds every explored tile in its not-visible colors and is
+        only rebuilt when the map changes, so each frame only draws the tiles
+        explored since the previous one.
+
+        Args:
+            game_map: The game map being rendered.
+
+        Returns:
+            tcod.console.Console: A console of the map's size.
         """
-        for y in range(game_map.height):
-            for x in range(game_map.width):
-                visible = game_map.visible[x][y]
-                explored = game_map.explored[x][y]
-
-                if not visible and not explored:
-                    continue
-
-                wall = not game_map.tiles[x][y].transparent
-                if wall:
-                    if visible:
-                        self.console.print(x, y + 1, "#", (255, 255, 255), (0, 0, 0))
-                    elif explored:
-                        self.console.print(x, y + 1, "#", (128, 128, 128), (0, 0, 0))
-                else:
-                    if visible:
-                        self.console.print(x, y + 1, ".", (192, 192, 192), (0, 0, 0))
-                    elif explored:
-                        self.console.print(x, y + 1, ".", (64, 64, 64), (0, 0, 0))
+        if self._background is None or self._background_map is not game_map:
+            self._background = tcod.console.Console(
+                game_map.width, game_map.height, order="F"
+            )
+            self._background_map = game_map
+            self._background_explored = np.zeros_like(game_map.explored)
+
+        new = game_map.explored & ~self._background_explored
+        if new.any():
+            graphic = (~game_map.transparent[new]).astype(np.intp) * 2
+            self._background.rgb[new] = _TILE_GRAPHICS[graphic]
+            self._background_explored |= new
+        return self._background
 
     def _render_entities(self, entities: List[Entity]) -> None:
         """Render all entities in the game.
@@ -79,6 +217,23 @@ class Renderer:
         Args:
             entities: List of entities to render.
         """
+        self._drawn_entities = self._entity_cells(entities)
+        for (x, y), (char, color) in self._drawn_entities.items():
+            self.console.print(x, y + 1, char, color, (0, 0, 0))
+
+    def _entity_cells(
+        self, entities: List[Entity]
+    ) -> Dict[Tuple[int, int], EntityGraphic]:
+        """Work out what to draw on each cell occupied by a shown entity.
+
+        Args:
+            entities: List of entities to render.
+
+        Returns:
+            Dict[Tuple[int, int], EntityGraphic]: The topmost entity's character
+            and color for each map cell.
+        """
+
         # エンティティを描画順序でソート
         # 1. アイテム（最背面）
         # 2. モンスター
@@ -93,16 +248,16 @@ class Renderer:
 
         entities_in_render_order = sorted(entities, key=get_render_order)
 
+        # 同じマスでは後に描画するエンティティが優先される
+        cells: Dict[Tuple[int, int], EntityGraphic] = {}
         for entity in entities_in_render_order:
             # プレイヤーは常に表示、他のエンティティはFOV内のみ表示
             if (
                 entity.entity_type == EntityType.PLAYER
-                or self.game_map.visible[entity.x][entity.y]
+                or self.game_map.visible[entity.x, entity.y]
             ):
-                self._draw_entity(entity)
-
-    def _draw_entity(self, entity: Entity) -> None:
-        self.console.print(entity.x, entity.y + 1, entity.char, entity.color, (0, 0, 0))
+                cells[entity.x, entity.y] = (entity.char, entity.color)
+        return cells
 
     def _render_ui(self, player: Entity) -> None:
         """Render the game UI including status bar and message area.
@@ -111,20 +266,10 @@ class Renderer:
             player: The player entity whose stats to display.
         """
         # Draw status bar background (line 1)
-        for x in range(SCREEN_WIDTH):
-            self.console.print(x, 0, " ", (255, 255, 255), (0, 0, 0))
+        self.console.rgb[:, 0] = _BLANK
 
         # Display NetHack-style status
-        status_text = (
-            f"{player.name} "  # Player name
-            f"St:{player.strength} "  # Strength
-            f"HP:{player.hp}/{player.max_hp} "  # HP
-            f"Lv:{player.level} "  # Player level
-            f"Dlv:{player.dungeon_level} "  # Dungeon level
-            f"$:{player.gold} "  # Gold
-            f"XP:{player.xp}"  # Experience
-        )
-
+        status_text = self._status_text(player)
         self.console.print(
             1,
             0,  # Display on line 1
@@ -133,11 +278,18 @@ class Renderer:
             (0, 0, 0),
             alignment=libtcodpy.LEFT,
         )
+        self._drawn_status = status_text
 
-        # Draw message area background (lines 47-49)
-        for x in range(SCREEN_WIDTH):
-            for y in range(47, SCREEN_HEIGHT):
-                self.console.print(x, y, " ", (255, 255, 255), (0, 0, 0))
+    def _status_text(self, player: Entity) -> str:
+        return (
+            f"{player.name} "  # Player name
+            f"St:{player.strength} "  # Strength
+            f"HP:{player.hp}/{player.max_hp} "  # HP
+            f"Lv:{player.level} "  # Player level
+            f"Dlv:{player.dungeon_level} "  # Dungeon level
+            f"$:{player.gold} "  # Gold
+            f"XP:{player.xp}"  # Experience
+        )
 
     def _render_messages(self, messages: List[str]) -> None:
         """Render the message log in the message area.
@@ -146,17 +298,25 @@ class Renderer:
             messages: List of messages to display.
         """
         # Clear message area background (lines 47-49)
-        for x in range(SCREEN_WIDTH):
-            for y in range(47, SCREEN_HEIGHT):
-                self.console.print(x, y, " ", (255, 255, 255), (0, 0, 0))
+        self.console.rgb[:, MESSAGE_TOP:] = _BLANK
 
         # Display latest 3 messages
-        for i, message in enumerate(messages[-3:]):
+        latest = messages[-3:]
+        for i, message in enumerate(latest):
             self.console.print(
-                1, 47 + i, message, (255, 255, 255), (0, 0, 0), alignment=libtcodpy.LEFT
+                1,
+                MESSAGE_TOP + i,
+                message,
+                (255, 255, 255),
+                (0, 0, 0),
+                alignment=libtcodpy.LEFT,
             )
+        self._drawn_messages = latest
 
     def clear_all(self, entities: List[Entity]) -> None:
+        # 差分描画モードでは次のフレームでエンティティのマスを描き直すため不要
+        if self.incremental:
+            return
         for entity in entities:
             self._clear_entity(entity)
 
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Replay files: the seed of a game and the player's actions, turn by turn.
+
+A replay file is a 20-byte header (magic, format version, seed) followed by
+one-byte opcodes, some with operands:
+
+    TICK                 the monsters took their turn
+    STEP + direction     a move by one cell (8 opcodes, no operand)
+    MOVE dx dy           any other move (int8 operands)
+    USE i, DROP i        an inventory action (uint8 operand)
+    PICKUP, DESCEND, ASCEND, WAIT, QUIT
+
+The file is only ever appended to and is flushed at every TICK, so the
+replay of a crashed game ends with the action that crashed it. A truncated
+last opcode is ignored.
+"""
+
+import os
+import re
+import struct
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, Optional, Tuple
+
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from .game import Action, Game
+
+MAGIC = b"ROGUEREP"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIQ")
+
+OP_TICK = 0x00
+OP_MOVE = 0x01
+OP_PICKUP = 0x02
+OP_USE = 0x03
+OP_DROP = 0x04
+OP_DESCEND = 0x05
+OP_ASCEND = 0x06
+OP_WAIT = 0x07
+OP_QUIT = 0x08
+OP_STEP = 0x10  # OP_STEP + _DIRECTIONS の番号
+
+_DIRECTIONS = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+_DIRECTION_OPS = {delta: OP_STEP + i for i, delta in enumerate(_DIRECTIONS)}
+_SIMPLE_OPS = {
+    "pickup": OP_PICKUP,
+    "descend": OP_DESCEND,
+    "ascend": OP_ASCEND,
+    "wait": OP_WAIT,
+    "quit": OP_QUIT,
+}
+_SIMPLE_ACTIONS = {op: (name,) for name, op in _SIMPLE_OPS.items()}
+_MOVE = struct.Struct("<bb")
+
+_CHECKPOINT_NAME = re.compile(r"turn_(\d+)_(\d+)\.sav$")
+
+
+class ReplayFormatError(ValueError):
+    """The file is not a replay file, or one written by another version."""
+
+
+def encode_action(action: "Action") -> bytes:
+    """Encode a player action as opcodes.
+
+    Args:
+        action: An action accepted by Game.perform.
+
+    Returns:
+        bytes: The opcode and its operands.
+
+    Raises:
+        ValueError: If the action cannot be recorded.
+    """
+    name = action[0]
+    if name == "move":
+        delta = (action[1], action[2])
+        op = _DIRECTION_OPS.get(delta)
+        if op is not None:
+            return bytes((op,))
+        return bytes((OP_MOVE,)) + _MOVE.pack(*delta)
+    if name in ("use", "drop"):
+        return bytes((OP_USE if name == "use" else OP_DROP, action[1]))
+    op = _SIMPLE_OPS.get(name)
+    if op is None:
+        raise ValueError(f"Unknown action: {action!r}")
+    return bytes((op,))
+
+
+def decode_ops(
+    data: bytes, offset: int = 0
+) -> Iterator[Tuple[int, Optional["Action"]]]:
+    """Decode opcodes.
+
+    Args:
+        data: The opcodes, without the file header.
+        offset: Where to start decoding.
+
+    Yields:
+        Tuple[int, Optional[Action]]: The offset after each opcode, and its
+        action, or None for a TICK.
+
+    Raises:
+        ReplayFormatError: On an unknown opcode.
+    """
+    end = len(data)
+    while offset < end:
+        op = data[offset]
+        if op == OP_TICK:
+            offset += 1
+            yield offset, None
+        elif OP_STEP <= op < OP_STEP + len(_DIRECTIONS):
+            offset += 1
+            yield offset, ("move",) + _DIRECTIONS[op - OP_STEP]
+        elif op in _SIMPLE_ACTIONS:
+            offset += 1
+            yield offset, _SIMPLE_ACTIONS[op]
+        elif op == OP_MOVE:
+            if offset + 3 > end:
+                return
+            dx, dy = _MOVE.unpack_from(data, offset + 1)
+            offset += 3
+            yield offset, ("move", dx, dy)
+        elif op in (OP_USE, OP_DROP):
+            if offset + 2 > end:
+                return
+            name = "use" if op == OP_USE else "drop"
+            offset += 2
+            yield offset, (name, data[offset - 1])
+        else:
+            raise ReplayFormatError(f"Unknown replay opcode {op:#04x} at {offset}")
+
+
+class Recorder:
+    """
+    Appends the actions of a game to a replay file.
+
+    Game calls record() for every action it performs and tick() every time
+    the monsters take their turn.
+    """
+
+    def __init__(self, path: str, seed: int):
+        """Create the replay file and write its header.
+
+        Args:
+            path: The file to create.
+            seed: The seed of the recorded game.
+
+        Raises:
+            ValueError: If the seed does not fit in 64 bits.
+        """
+        if not 0 <= seed < 2**64:
+            raise ValueError(f"Cannot record a game with seed {seed}")
+        self.path = path
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, seed))
+        self._file.flush()
+
+    def record(self, action: "Action") -> None:
+        """Append an action.
+
+        Raises:
+            ValueError: If the action cannot be recorded.
+        """
+        if self._file is not None:
+            self._file.write(encode_action(action))
+
+    def tick(self) -> None:
+        """Append a TICK and flush the file."""
+        if self._file is not None:
+            self._file.write(b"\0")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayPlayer:
+    """
+    Re-runs a replay file on a headless game as fast as possible.
+
+    With checkpoint_every set, the game is saved every that many turns while
+    playing, and seek() resumes from the nearest saved turn instead of
+    replaying from the start. A turn is one TICK.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        checkpoint_every: int = 0,
+        checkpoint_dir: Optional[str] = None,
+    ):
+        """Read a replay file.
+
+        Args:
+            path: The replay file.
+            checkpoint_every: Save a checkpoint every this many turns. 0
+                disables checkpoints.
+            checkpoint_dir: Where checkpoints are written. Checkpoints already
+                there (from an earlier run on the same file) are reused.
+
+        Raises:
+            ReplayFormatError: If the file is not a replay file of this version.
+            ValueError: If checkpoints are enabled without a directory.
+        """
+        if checkpoint_every and checkpoint_dir is None:
+            raise ValueError("checkpoint_every needs a checkpoint_dir")
+        self.logger = setup_logger("game")
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ReplayFormatError(f"{path} is not a replay file")
+            magic, version, self.seed = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ReplayFormatError(f"{path} is not a replay file")
+            if version != VERSION:
+                raise ReplayFormatError(
+                    f"{path} has replay format version {version}, expected {VERSION}"
+                )
+            self.data = f.read()
+
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_dir = checkpoint_dir
+        # ターン数 -> (セーブファイル, 再開する位置)
+        self.checkpoints: Dict[int, Tuple[str, int]] = {}
+        if checkpoint_dir is not None and os.path.isdir(checkpoint_dir):
+            for name in os.listdir(checkpoint_dir):
+                match = _CHECKPOINT_NAME.match(name)
+                if match:
+                    turn, offset = int(match.group(1)), int(match.group(2))
+                    checkpoint = os.path.join(checkpoint_dir, name)
+                    self.checkpoints[turn] = (checkpoint, offset)
+
+        from .game import Game  # 循環参照を避けるためにローカルインポート
+
+        self._game_class = Game
+        self.game = self._new_game()
+        self.turn = 0
+        self.finished = False
+        self._offset = 0
+
+    def _new_game(self) -> "Game":
+        return self._game_class(seed=self.seed, prefetch_levels=False)
+
+    def play(self, until_turn: Optional[int] = None) -> "Game":
+        """Replay from the current position.
+
+        Args:
+            until_turn: Stop once this many turns have been played. None plays
+                the whole file.
+
+        Returns:
+            Game: The game, in the state reached.
+        """
+        game = self.game
+        self._game_class.instance = game
+        for offset, action in decode_ops(self.data, self._offset):
+            if self.finished or (until_turn is not None and self.turn >= until_turn):
+                break
+            self._offset = offset
+            # ターンの終わり（TICK か、ゲームを終わらせた行動）は step() と同じく処理する
+            if action is None:
+                game._process_monster_turns()
+                self.turn += 1
+                self.finished = game._end_turn(False)
+                if self.checkpoint_every and self.turn % self.checkpoint_every == 0:
+                    self._save_checkpoint()
+                continue
+
+            result = game.perform(action)
+            if result and game._process_result(result):
+                self.finished = game._end_turn(True)
+        else:
+            self.finished = True
+        return game
+
+    def seek(self, turn: int) -> "Game":
+        """Go to a turn, from a checkpoint when that is faster.
+
+        Args:
+            turn: The number of turns to have played.
+
+        Returns:
+            Game: The game at that turn (or at the end of the replay).
+        """
+        start = max((t for t in self.checkpoints if t <= turn), default=0)
+        if turn < self.turn or start > self.turn:
+            if start == 0:
+                self.game = self._new_game()
+                self._offset = 0
+            else:
+                path, self._offset = self.checkpoints[start]
+                self.game = self._game_class.load(path, prefetch_levels=False)
+            self.turn = start
+            self.finished = False
+        return self.play(until_turn=turn)
+
+    def _save_checkpoint(self) -> None:
+        if self.turn in self.checkpoints:
+            return
+        assert self.checkpoint_dir is not None
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        name = f"turn_{self.turn:08d}_{self._offset}.sav"
+        path = os.path.join(self.checkpoint_dir, name)
+        self.game.save(path)
+        self.checkpoints[self.turn] = (path, self._offset)
+        self.logger.debug(f"Saved replay checkpoint for turn {self.turn} to {path}")
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""Binary save files.
+
+A save file is a small header followed by raw NumPy buffers::
+
+    magic (8 bytes) | version (uint32) | metadata length (uint32)
+    metadata (UTF-8 JSON) | padding to 64 bytes
+    buffers, each starting on a 64-byte boundary
+
+The metadata holds the scalars of the game (turn, messages, ...) and, for
+each level, the offsets of its buffers: the walkable, transparent and
+explored masks as (width, height) uint8 arrays, and its entities as records
+of ENTITY_DTYPE. Entities carried in an inventory are records too, pointing
+to their owner. Strings (names, glyphs, effects...) go into one string table.
+
+Loading memory-maps the file, so the buffers are read without parsing.
+Entities are rebuilt straight from their records, and those of the levels
+other than the current one only when the player goes back to them.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from components.combat import CombatStats
+from components.item import ItemStats
+from components.stack import StackInfo
+from entity.entity import Entity, EntityType
+from map.game_map import GameMap
+from map.level_cache import LevelSnapshot
+from map.spatial_index import EntityList
+from map.tile import Rectangle
+
+MAGIC = b"ROGUESAV"
+VERSION = 1
+ALIGNMENT = 64
+
+_HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("meta_length", "<u4")])
+
+# 値が None であることを表す番兵
+_NONE = np.iinfo(np.int32).min
+
+# コンポーネントのフィールドと保存形式（int, float, bool, str, pair）
+_COMPONENT_FIELDS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "combat": (
+        ("hp", "int"),
+        ("max_hp", "int"),
+        ("power", "pair"),
+        ("sight_radius", "int"),
+        ("level", "int"),
+        ("xp", "int"),
+        ("xp_given", "int"),
+        ("dungeon_level", "int"),
+        ("strength", "int"),
+        ("speed", "float"),
+        ("special", "str"),
+        ("regeneration", "bool"),
+        ("confused_turns", "int"),
+        ("move_count", "float"),
+        ("gold", "int"),
+    ),
+    "item": (
+        ("damage_dice", "pair"),
+        ("hit_bonus", "int"),
+        ("two_handed", "bool"),
+        ("ranged", "bool"),
+        ("ammo_type", "str"),
+        ("ammo_count", "int"),
+        ("nutrition", "int"),
+        ("food_count", "int"),
+        ("effect", "str"),
+        ("effect_amount", "int"),
+        ("defense", "int"),
+        ("weight", "int"),
+        ("strength", "int"),
+        ("sustain", "bool"),
+        ("search", "int"),
+        ("gold_amount", "int"),
+    ),
+    "stack": (("stack_size", "int"), ("count", "int")),
+}
+_COMPONENT_CLASSES = {"combat": CombatStats, "item": ItemStats, "stack": StackInfo}
+# コンポーネントの有無を表すビット
+_COMPONENT_BITS = {"combat": 1, "item": 2, "stack": 4}
+
+_KIND_DTYPES = {
+    "int": "<i4",
+    "float": "<f8",
+    "bool": "?",
+    "str": "<i4",
+    "pair": ("<i4", (2,)),
+}
+
+ENTITY_DTYPE = np.dtype(
+    [
+        ("owner", "<i4"),  # 持ち主のレコード番号（マップ上にある場合は -1）
+        ("x", "<i4"),
+        ("y", "<i4"),
+        ("char", "<i4"),
+        ("color", "u1", (3,)),
+        ("name", "<i4"),
+        ("entity_type", "<i4"),
+        ("blocks", "?"),
+        ("components", "u1"),
+    ]
+    + [
+        (f"{component}_{name}", _KIND_DTYPES[kind])
+        for component, fields in _COMPONENT_FIELDS.items()
+        for name, kind in fields
+    ]
+)
+
+
+class SaveFormatError(ValueError):
+    """The file is not a save file, or one written by another version."""
+
+
+@dataclass
+class SavedGame:
+    """
+    The game state read from a save file.
+    """
+
+    seed: int
+    rng_state: Dict[str, Any]
+    player: Entity
+    game_map: GameMap
+    entities: EntityList
+    cached_levels: List[LevelSnapshot]
+    messages: List[str] = field(default_factory=list)
+    message_count: int = 0
+    turn: int = 0
+    killed_by: Optional[str] = None
+    game_state: str = "playing"
+
+
+def _align(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+class _Buffers:
+    """Raw buffers of the data section, each aligned to ALIGNMENT bytes."""
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.size = 0
+
+    def add(self, array: np.ndarray) -> int:
+        data = np.ascontiguousarray(array).tobytes()
+        offset = self.size
+        padding = _align(len(data))
+        self.chunks.append(data + b"\0" * padding)
+        self.size += len(data) + padding
+        return offset
+
+
+def _encode_value(value: Any, kind: str, strings: _StringTable) -> Any:
+    if kind == "str":
+        return strings.add(value)
+    if kind == "pair":
+        return (_NONE, _NONE) if value is None else tuple(value)
+    if kind == "int":
+        return _NONE if value is None else value
+    return value
+
+
+def _flatten(entities: List[Entity]) -> List[Tuple[Entity, int]]:
+    """Entities followed by the contents of their inventories, with owners."""
+    flat = [(entity, -1) for entity in entities]
+    i = 0
+    while i < len(flat):
+        entity = flat[i][0]
+        flat.extend((item, i) for item in entity.inventory)
+        i += 1
+    return flat
+
+
+def _encode_entities(entities: List[Entity], strings: _StringTable) -> np.ndarray:
+    rows = []
+    for entity, owner in _flatten(entities):
+        row: List[Any] = [
+            owner,
+            entity.x,
+            entity.y,
+            strings.add(entity.char),
+            entity.color,
+            strings.add(entity.name),
+            strings.add(entity.entity_type.name),
+            entity.blocks,
+        ]
+        bits = 0
+        values: List[Any] = []
+        for component, fields in _COMPONENT_FIELDS.items():
+            stats = getattr(entity, component)
+            if stats is not None:
+                bits |= _COMPONENT_BITS[component]
+            for name, kind in fields:
+                # strength 以外はエンティティ経由で読む（ストアに格納中のモンスターも正しく読める）
+                if name == "strength":
+                    value = stats.strength if stats is not None else 0
+                else:
+                    value = getattr(entity, name)
+                values.append(_encode_value(value, kind, strings))
+        rows.append(tuple(row + [bits] + values))
+    return np.array(rows, dtype=ENTITY_DTYPE)
+
+
+def _decode_entities(records: np.ndarray, strings: List[str]) -> List[Entity]:
+    """Rebuild entities, putting owned records into their owner's inventory.
+
+    Returns:
+        List[Entity]: The entities without an owner, in record order.
+    """
+    entity_types = {}
+    built: List[Entity] = []
+    top: List[Entity] = []
+    for row in records.tolist():
+        owner, x, y, char, color, name, type_index, blocks, bits = row[:9]
+        entity = Entity.__new__(Entity)
+        entity._store = None
+        entity._slot = -1
+        entity.prototype = None
+        entity._x = x
+        entity._y = y
+        entity.char = strings[char]
+        entity.color = tuple(color)
+        entity.name = strings[name]
+        entity_type = entity_types.get(type_index)
+        if entity_type is None:
+            entity_type = entity_types[type_index] = EntityType[strings[type_index]]
+        entity.entity_type = entity_type
+        entity.blocks = blocks
+
+        column = 9
+        for component, fields in _COMPONENT_FIELDS.items():
+            stats = None
+            if bits & _COMPONENT_BITS[component]:
+                stats = _COMPONENT_CLASSES[component]()
+                for i, (field_name, kind) in enumerate(fields, column):
+                    value = row[i]
+                    if kind == "int":
+                        if value == _NONE:
+                            value = None
+                    elif kind == "str":
+                        value = strings[value] if value >= 0 else None
+                    elif kind == "pair":
+                        value = None if value[0] == _NONE else tuple(value)
+                    setattr(stats, field_name, value)
+            setattr(entity, component, stats)
+            column += len(fields)
+
+        built.append(entity)
+        if owner < 0:
+            top.append(entity)
+        else:
+            built[owner].inventory.append(entity)
+    return top
+
+
+class _EntityLoader:
+    """Builds the entities of a level from a copy of its records."""
+
+    def __init__(self, records: bytes, strings: List[str]):
+        self.records = records
+        self.strings = strings
+
+    def __call__(self) -> List[Entity]:
+        records = np.frombuffer(self.records, dtype=ENTITY_DTYPE)
+        return _decode_entities(records, self.strings)
+
+
+def _encode_rng_state(state: Tuple[Any, ...], buffers: _Buffers) -> Dict[str, Any]:
+    version, internal, gauss_next = state
+    offset = buffers.add(np.array(internal, dtype="<u4"))
+    return {
+        "version": version,
+        "gauss_next": gauss_next,
+        "offset": offset,
+        "length": len(internal),
+    }
+
+
+def _decode_rng_state(meta: Dict[str, Any], data: np.ndarray) -> Tuple[Any, ...]:
+    start = meta["offset"]
+    end = start + 4 * meta["length"]
+    internal = tuple(data[start:end].view("<u4").tolist())
+    return (meta["version"], internal, meta["gauss_next"])
+
+
+def _encode_level(
+    dungeon_level: int,
+    width: int,
+    height: int,
+    masks: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    rooms: List[Tuple[int, int, int, int]],
+    entities: List[Entity],
+    buffers: _Buffers,
+    strings: _StringTable,
+) -> Dict[str, Any]:
+    walkable, transparent, explored = masks
+    records = _encode_entities(entities, strings)
+    return {
+        "dungeon_level": dungeon_level,
+        "width": width,
+        "height": height,
+        "rooms": [list(room) for room in rooms],
+        "walkable": buffers.add(walkable.astype(np.uint8)),
+        "transparent": buffers.add(transparent.astype(np.uint8)),
+        "explored": buffers.add(explored.astype(np.uint8)),
+        "entities": buffers.add(records),
+        "entity_count": len(records),
+    }
+
+
+def write_save(game: Any, path: str) -> None:
+    """Write the state of a game to a save file.
+
+    Args:
+        game: The Game to save.
+        path: The file to write.
+    """
+    strings = _StringTable()
+    buffers = _Buffers()
+
+    game_map = game.game_map
+    levels = [
+        _encode_level(
+            game_map.dungeon_level,
+            game_map.width,
+            game_map.height,
+            (game_map.walkable, game_map.transparent, game_map.explored),
+            [(room.x, room.y, room.w, room.h) for room in game_map.rooms],
+            list(game.entities),
+            buffers,
+            strings,
+        )
+    ]
+    for snapshot in game.level_cache.snapshots():
+        levels.append(
+            _encode_level(
+                snapshot.dungeon_level,
+                snapshot.width,
+                snapshot.height,
+                snapshot.masks(),
+                snapshot.rooms,
+                snapshot.get_entities(),
+                buffers,
+                strings,
+            )
+        )
+
+    rng = game.rng.getstate()
+    meta = {
+        "seed": rng["seed"],
+        "rng": {
+            "combat": _encode_rng_state(rng["combat"], buffers),
+            "ai": _encode_rng_state(rng["ai"], buffers),
+        },
+        "player_index": next(
+            i for i, entity in enumerate(game.entities) if entity is game.player
+        ),
+        "levels": levels,
+        "strings": strings.strings,
+        "messages": list(game.messages),
+        "message_count": game.message_count,
+        "turn": game.turn,
+        "killed_by": game.killed_by,
+        "game_state": game.game_state,
+    }
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    header = np.array([(MAGIC, VERSION, len(meta_bytes))], dtype=_HEADER).tobytes()
+    head = header + meta_bytes
+
+    with open(path, "wb") as f:
+        f.write(head)
+        f.write(b"\0" * _align(len(head)))
+        for chunk in buffers.chunks:
+            f.write(chunk)
+
+
+def _read_header(path: str) -> Tuple[Dict[str, Any], int]:
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.itemsize)
+        if len(raw) < _HEADER.itemsize:
+            raise SaveFormatError(f"{path} is not a save file")
+        header = np.frombuffer(raw, dtype=_HEADER)[0]
+        if header["magic"] != MAGIC:
+            raise SaveFormatError(f"{path} is not a save file")
+        if header["version"] != VERSION:
+            raise SaveFormatError(
+                f"{path} has save format version {header['version']}, "
+                f"expected {VERSION}"
+            )
+        meta = json.loads(f.read(int(header["meta_length"])).decode("utf-8"))
+    head_length = _HEADER.itemsize + int(header["meta_length"])
+    return meta, head_length + _align(head_length)
+
+
+def read_save(path: str) -> SavedGame:
+    """Read a save file written by write_save.
+
+    Args:
+        path: The file to read.
+
+    Returns:
+        SavedGame: The saved state. The current level is ready to play; the
+        other levels are snapshots for a LevelCache, least recently used
+        first.
+
+    Raises:
+        SaveFormatError: If the file is not a save file of this version.
+    """
+    meta, data_offset = _read_header(path)
+    # コピーオンライトでマップするので、読み込んだ配列を書き換えてもファイルは変わらない
+    data = np.memmap(path, dtype=np.uint8, mode="c", offset=data_offset)
+    strings = meta["strings"]
+
+    def mask(level: Dict[str, Any], name: str) -> np.ndarray:
+        shape = (level["width"], level["height"])
+        start = level[name]
+        return data[start : start + shape[0] * shape[1]].view(bool).reshape(shape)
+
+    def records(level: Dict[str, Any]) -> np.ndarray:
+        start = level["entities"]
+        end = start + level["entity_count"] * ENTITY_DTYPE.itemsize
+        return data[start:end]
+
+    current, *cached = meta["levels"]
+    game_map = GameMap(current["width"], current["height"], current["dungeon_level"])
+    game_map.walkable[:] = mask(current, "walkable")
+    game_map.transparent[:] = mask(current, "transparent")
+    game_map.explored[:] = mask(current, "explored")
+    for room in current["rooms"]:
+        game_map._add_room(Rectangle(*room))
+    level_entities = game_map.create_entity_list(
+        _decode_entities(records(current).view(ENTITY_DTYPE), strings)
+    )
+
+    snapshots = []
+    for level in cached:
+        snapshot = LevelSnapshot.from_arrays(
+            level["dungeon_level"],
+            mask(level, "walkable"),
+            mask(level, "transparent"),
+            mask(level, "explored"),
+            [tuple(room) for room in level["rooms"]],
+            [],
+        )
+        # レコードはコピーしておく（ファイルを上書きしても影響しない）
+        snapshot.entity_loader = _EntityLoader(records(level).tobytes(), strings)
+        snapshots.append(snapshot)
+
+    rng = meta["rng"]
+    saved = SavedGame(
+        seed=meta["seed"],
+        rng_state={
+            "seed": meta["seed"],
+            "combat": _decode_rng_state(rng["combat"], data),
+            "ai": _decode_rng_state(rng["ai"], data),
+        },
+        player=level_entities[meta["player_index"]],
+        game_map=game_map,
+        entities=level_entities,
+        cached_levels=snapshots,
+        messages=meta["messages"],
+        message_count=meta["message_count"],
+        turn=meta["turn"],
+        killed_by=meta["killed_by"],
+        game_state=meta["game_state"],
+    )
+    del data
+    return saved
@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 from enum import Enum, auto
 from typing import Optional, List, Tuple, Dict, Any, TYPE_CHECKING
+import logging
 import random
+from components.combat import CombatStats
+from components.item import ItemStats
+from components.stack import StackInfo
 from config.messages import MESSAGES
 from utils.logger import setup_logger
 
 if TYPE_CHECKING:
     from map.game_map import GameMap
+    from map.spatial_index import EntityList
+    from entity.monster_store import MonsterStore
+    from entity.prototype import EntityPrototype
 
 
 class EntityType(Enum):
@@ -26,6 +33,9 @@ class EntityType(Enum):
     RING = auto()
 
 
+_CREATURE_TYPES = (EntityType.PLAYER, EntityType.MONSTER)
+
+
 class ItemEffect(Enum):
     HEAL = auto()
     LIGHTNING = auto()
@@ -35,7 +45,198 @@ class ItemEffect(Enum):
     IDENTIFY = auto()
 
 
+def _random_stream(name: str) -> Any:
+    """実行中のゲームの乱数ストリームを返す（ゲーム外ではグローバルの random）"""
+    from engine.game import Game  # 循環参照を避けるためにローカルインポート
+
+    streams = getattr(Game.instance, "rng", None)
+    return getattr(streams, name) if streams is not None else random
+
+
+# コンポーネントを持たないエンティティが参照したときのインベントリ
+_NO_INVENTORY: Tuple["Entity", ...] = ()
+
+# エンティティは大量に生成されるため、デバッグ時以外はログを出力しない
+logger = setup_logger("entity", logging.INFO)
+
+
+class _ComponentField:
+    """
+    Entity attribute stored on one of its components.
+
+    Reading returns the default when the component is absent; writing a
+    non-default value creates the component on demand.
+    """
+
+    __slots__ = ("component", "default", "name")
+
+    def __init__(self, component: str, default: Any = None):
+        self.component = component
+        self.default = default
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Optional["Entity"], objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        component = getattr(obj, self.component)
+        if component is None:
+            return self.default
+        return getattr(component, self.name)
+
+    def __set__(self, obj: "Entity", value: Any) -> None:
+        component = getattr(obj, self.component)
+        if component is None:
+            if value == self.default:
+                return
+            component = _COMPONENT_TYPES[self.component]()
+            setattr(obj, self.component, component)
+        elif obj.prototype is not None:
+            component = _own_component(obj, self.component, component)
+        setattr(component, self.name, value)
+
+
+_COMPONENT_TYPES = {"combat": CombatStats, "item": ItemStats, "stack": StackInfo}
+
+
+def _own_component(entity: "Entity", name: str, component: Any) -> Any:
+    """Copy a component the entity shares with its prototype before a write."""
+    if getattr(entity.prototype, name) is component:
+        component = component.copy()
+        setattr(entity, name, component)
+    return component
+
+
+class _SlotField:
+    """
+    Entity attribute kept in a private slot (used as a _StoredField fallback).
+    """
+
+    __slots__ = ("slot",)
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        pass
+
+    def __get__(self, obj: "Entity", objtype: Optional[type] = None) -> Any:
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj: "Entity", value: Any) -> None:
+        setattr(obj, self.slot, value)
+
+
+class _StoredField:
+    """
+    Entity attribute that lives in a MonsterStore while the entity is attached.
+
+    Detached entities use the fallback descriptor (a slot or a component field).
+    """
+
+    __slots__ = ("fallback", "name")
+
+    def __init__(self, fallback: Any):
+        self.fallback = fallback
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.fallback.__set_name__(owner, name)
+
+    def __get__(self, obj: Optional["Entity"], objtype: Optional[type] = None) -> Any:
+        if obj is None:
+            return self
+        store = obj._store
+        if store is None:
+            return self.fallback.__get__(obj, objtype)
+        return store.get(self.name, obj._slot)
+
+    def __set__(self, obj: "Entity", value: Any) -> None:
+        store = obj._store
+        if store is None:
+            self.fallback.__set__(obj, value)
+        else:
+            store.set(self.name, obj._slot, value)
+
+
 class Entity:
+    """
+    Anything that has a position on the map.
+
+    Only the fields shared by every entity live on the instance itself. Creature
+    stats, item stats and stack information are kept in optional components
+    that are created only when the entity needs them; the attributes below
+    forward to them so callers can keep using entity.hp, entity.damage_dice...
+
+    Monsters on a level with a MonsterStore additionally keep their position
+    and turn-related stats in the store's arrays while they are attached.
+
+    Entities created from an EntityPrototype reference it and share its item
+    and stack components until the first write to one of their fields, which
+    gives the entity its own copy of that component.
+    """
+
+    __slots__ = (
+        "_x",
+        "_y",
+        "char",
+        "color",
+        "name",
+        "entity_type",
+        "blocks",
+        "combat",
+        "item",
+        "stack",
+        "_store",
+        "_slot",
+        "prototype",
+    )
+
+    # 位置（MonsterStore に格納されている間は配列を参照する）
+    x = _StoredField(_SlotField("_x"))
+    y = _StoredField(_SlotField("_y"))
+
+    # CombatStats
+    hp = _StoredField(_ComponentField("combat"))
+    max_hp = _StoredField(_ComponentField("combat"))
+    power = _ComponentField("combat")
+    sight_radius = _StoredField(_ComponentField("combat"))
+    level = _ComponentField("combat", 1)
+    xp = _ComponentField("combat", 0)
+    xp_given = _ComponentField("combat", 0)
+    dungeon_level = _ComponentField("combat", 1)
+    speed = _StoredField(_ComponentField("combat", 1.0))
+    special = _ComponentField("combat")
+    regeneration = _StoredField(_ComponentField("combat", False))
+    confused_turns = _StoredField(_ComponentField("combat", 0))
+    move_count = _StoredField(_ComponentField("combat", 0.0))
+    gold = _ComponentField("combat", 0)
+    inventory = _ComponentField("combat", _NO_INVENTORY)
+
+    # ItemStats
+    damage_dice = _ComponentField("item")
+    hit_bonus = _ComponentField("item")
+    two_handed = _ComponentField("item", False)
+    ranged = _ComponentField("item", False)
+    ammo_type = _ComponentField("item")
+    ammo_count = _ComponentField("item")
+    nutrition = _ComponentField("item")
+    food_count = _ComponentField("item")
+    effect = _ComponentField("item")
+    effect_amount = _ComponentField("item", 0)
+    defense = _ComponentField("item", 0)
+    weight = _ComponentField("item", 0)
+    sustain = _ComponentField("item", False)
+    search = _ComponentField("item", 0)
+    gold_amount = _ComponentField("item", 0)
+
+    # StackInfo
+    stack_size = _ComponentField("stack")
+    count = _ComponentField("stack", 1)
+
     def __init__(
         self,
         x: int,
@@ -78,49 +279,121 @@ class Entity:
         stack_size: Optional[int] = None,  # 最大スタックサイズ
         count: Optional[int] = None,  # 現在のスタック数
     ):
-        self.logger = setup_logger("entity")
-        self.logger.debug(f"Creating entity: {name} ({entity_type})")
-
-        self.x = x
-        self.y = y
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Creating entity: {name} ({entity_type})")
+
+        self._store: Optional["MonsterStore"] = None
+        self._slot = -1
+        self.prototype: Optional["EntityPrototype"] = None
+        self._x = x
+        self._y = y
         self.char = char
         self.color = color
         self.name = name
         self.entity_type = entity_type
         self.blocks = blocks
-        self.inventory = inventory or []
-        self.hp = hp
-        self.max_hp = max_hp
-        self.power = power
-        self.sight_radius = sight_radius
-        self.damage_dice = damage_dice
-        self.hit_bonus = hit_bonus
-        self.two_handed = two_handed
-        self.ranged = ranged
-        self.ammo_type = ammo_type
-        self.ammo_count = ammo_count
-        self.nutrition = nutrition
-        self.food_count = food_count
-        self.level = level
-        self.xp = xp
-        self.xp_given = xp_given
-        self.dungeon_level = dungeon_level
-        self.strength = strength
-        self.sustain = sustain
-        self.search = search
-        self.gold_amount = gold_amount
-        self.effect = effect
-        self.effect_amount = effect_amount
-        self.confused_turns = confused_turns
-        self.speed = speed
-        self.special = special
-        self.regeneration = regeneration
-        self.defense = defense
-        self.weight = weight
-        self.move_count = 0.0
-        self.gold = gold
-        self.stack_size = stack_size  # 最大スタックサイズを追加
-        self.count = count or 1  # 現在のスタック数を追加
+
+        # プレイヤーとモンスター、または戦闘用の値を指定されたものだけが持つ
+        if (
+            entity_type in _CREATURE_TYPES
+            or hp is not None
+            or max_hp is not None
+            or power is not None
+            or sight_radius is not None
+            or inventory
+            or level != 1
+            or xp
+            or xp_given
+            or dungeon_level != 1
+            or speed != 1.0
+            or special is not None
+            or regeneration
+            or confused_turns
+            or gold
+        ):
+            self.combat = CombatStats(
+                hp=hp,
+                max_hp=max_hp,
+                power=power,
+                sight_radius=sight_radius,
+                level=level,
+                xp=xp,
+                xp_given=xp_given,
+                dungeon_level=dungeon_level,
+                strength=strength,
+                speed=speed,
+                special=special,
+                regeneration=regeneration,
+                confused_turns=confused_turns,
+                gold=gold,
+                inventory=inventory or [],
+            )
+        else:
+            self.combat = None
+
+        if (
+            damage_dice is not None
+            or hit_bonus is not None
+            or two_handed
+            or ranged
+            or ammo_type is not None
+            or ammo_count is not None
+            or nutrition is not None
+            or food_count is not None
+            or effect is not None
+            or effect_amount
+            or defense
+            or weight
+            or (strength and self.combat is None)
+            or sustain
+            or search
+            or gold_amount
+        ):
+            self.item = ItemStats(
+                damage_dice=damage_dice,
+                hit_bonus=hit_bonus,
+                two_handed=two_handed,
+                ranged=ranged,
+                ammo_type=ammo_type,
+                ammo_count=ammo_count,
+                nutrition=nutrition,
+                food_count=food_count,
+                effect=effect,
+                effect_amount=effect_amount,
+                defense=defense,
+                weight=weight,
+                strength=strength if self.combat is None else 0,
+                sustain=sustain,
+                search=search,
+                gold_amount=gold_amount,
+            )
+        else:
+            self.item = None
+
+        if stack_size is not None or count:
+            self.stack = StackInfo(stack_size, count or 1)
+        else:
+            self.stack = None
+
+    @property
+    def strength(self) -> int:
+        """筋力（生物は自身の値、指輪などのアイテムは補正値）"""
+        if self.combat is not None:
+            return self.combat.strength
+        if self.item is not None:
+            return self.item.strength
+        return 0
+
+    @strength.setter
+    def strength(self, value: int) -> None:
+        if self.combat is not None:
+            self.combat.strength = value
+        elif self.item is not None or value:
+            if self.item is None:
+                self.item = ItemStats()
+            elif self.prototype is not None:
+                _own_component(self, "item", self.item)
+            self.item.strength = value
 
     @property
     def display_name(self) -> str:
@@ -199,9 +472,11 @@ class Entity:
         if self.hp <= 0:
             if self.entity_type == EntityType.PLAYER:
                 from engine.game import Game
+
                 Game.instance.add_message(MESSAGES["death"])
             elif self.entity_type == EntityType.MONSTER:
                 from engine.game import Game
+
                 Game.instance.add_message(f"{self.name} {MESSAGES['monster_death']}")
 
     def drop_item(self, item: "Entity", entities: List["Entity"]) -> None:
@@ -258,12 +533,12 @@ class Entity:
         return True
 
     def _use_teleport_scroll(self, game_map: "GameMap") -> bool:
+        rng = _random_stream("combat")
         while True:
-            x = random.randint(0, game_map.width - 1)
-            y = random.randint(0, game_map.height - 1)
-            if game_map.tiles[x][y].walkable:
-                self.x = x
-                self.y = y
+            x = rng.randint(0, game_map.width - 1)
+            y = rng.randint(0, game_map.height - 1)
+            if game_map.walkable[x, y] and not game_map.spatial_index.is_blocked(x, y):
+                game_map.spatial_index.move(self, x, y)
                 return True
         return False
 
@@ -300,16 +575,11 @@ class Entity:
         new_y = self.y + dy
 
         if self._is_valid_move(new_x, new_y, game_map, entities):
-            self.x = new_x
-            self.y = new_y
+            game_map.spatial_index.move(self, new_x, new_y)
 
             # ゴールドの自動拾い
-            for entity in list(entities):  # リストのコピーを作成して反復
-                if (
-                    entity.entity_type == EntityType.GOLD
-                    and entity.x == self.x
-                    and entity.y == self.y
-                ):
+            for entity in game_map.spatial_index.items_at(self.x, self.y):
+                if entity.entity_type == EntityType.GOLD:
                     self._collect_gold(entity, entities)
                     break
 
@@ -318,41 +588,38 @@ class Entity:
     ) -> bool:
         return (
             game_map.in_bounds(x, y)
-            and game_map.tiles[x][y].walkable
-            and not any(
-                entity.blocks and entity.x == x and entity.y == y for entity in entities
-            )
+            and game_map.walkable[x, y]
+            and not game_map.spatial_index.is_blocked(x, y)
         )
 
     def _collect_gold(self, gold: "Entity", entities: List["Entity"]) -> None:
         self.gold += gold.gold_amount  # goldプロパティに加算
         entities.remove(gold)
 
-    def pick_up(self, entities: List["Entity"]) -> None:
-        for entity in list(entities):  # エンティティのリストのコピーを作成
-            if entity.x == self.x and entity.y == self.y:
-                if entity.entity_type == EntityType.GOLD:
-                    self._collect_gold(entity, entities)
-                    break
-                elif entity.entity_type not in [EntityType.PLAYER, EntityType.MONSTER]:
-                    if len(self.inventory) >= 26:  # インベントリ容量
-                        return
-
-                    # スタック可能なアイテムを探す
-                    stacked = False
-                    if entity.stack_size:
-                        for inv_item in self.inventory:
-                            if inv_item.can_stack_with(entity):
-                                if inv_item.stack_with(entity):
-                                    entities.remove(entity)
-                                    stacked = True
-                                    break
-
-                    # スタックできなかった場合は新しいアイテムとして追加
-                    if not stacked:
-                        self.inventory.append(entity)
-                        entities.remove(entity)
-                    break
+    def pick_up(self, entities: "EntityList") -> None:
+        for entity in entities.spatial_index.items_at(self.x, self.y):
+            if entity.entity_type == EntityType.GOLD:
+                self._collect_gold(entity, entities)
+                break
+            elif entity.entity_type not in [EntityType.PLAYER, EntityType.MONSTER]:
+                if len(self.inventory) >= 26:  # インベントリ容量
+                    return
+
+                # スタック可能なアイテムを探す
+                stacked = False
+                if entity.stack_size:
+                    for inv_item in self.inventory:
+                        if inv_item.can_stack_with(entity):
+                            if inv_item.stack_with(entity):
+                                entities.remove(entity)
+                                stacked = True
+                                break
+
+                # スタックできなかった場合は新しいアイテムとして追加
+                if not stacked:
+                    self.inventory.append(entity)
+                    entities.remove(entity)
+                break
 
     def take_turn(
         self, target: "Entity", game_map: "GameMap", entities: List["Entity"]
@@ -387,8 +654,9 @@ class Entity:
             self.heal(1)
 
     def _handle_confusion(self, game_map: "GameMap", entities: List["Entity"]) -> None:
-        dx = random.choice([-1, 0, 1])
-        dy = random.choice([-1, 0, 1])
+        rng = _random_stream("ai")
+        dx = rng.choice([-1, 0, 1])
+        dy = rng.choice([-1, 0, 1])
         self.move(dx, dy, game_map, entities)
 
     def _distance_to(self, other: "Entity") -> float:
@@ -432,21 +700,22 @@ class Entity:
         - 筋力は19以上は10%の確率で1上昇（最大25まで）
         """
         from engine.game import Game  # 循環参照を避けるためにローカルインポート
-        import random
+
+        rng = _random_stream("combat")
 
         # レベルアップメッセージ
         Game.instance.add_message(MESSAGES["level_up"].format(self.level))
 
         # HP増加 (4-8)
-        hp_increase = random.randint(4, 8)
+        hp_increase = rng.randint(4, 8)
         self.max_hp += hp_increase
         self.hp = self.max_hp  # HPを全回復
 
         # 筋力増加
         old_strength = self.strength
-        if self.strength < 18 and random.random() < 0.5:
+        if self.strength < 18 and rng.random() < 0.5:
             self.strength += 1
-        elif 18 <= self.strength < 25 and random.random() < 0.1:
+        elif 18 <= self.strength < 25 and rng.random() < 0.1:
             self.strength += 1
 
         # 筋力が上がった場合はメッセージを表示
@@ -478,11 +747,18 @@ class Entity:
         dx = int(round(dx / distance))
         dy = int(round(dy / distance))
 
-        self.move(dx, dy, game_map, entities)
+        # 距離マップに沿って壁を回り込む（到達できない場合は直進方向のまま）
+        dx, dy = game_map.next_step(
+            self.x, self.y, game_map.distance_map(target_x, target_y), (dx, dy)
+        )
+        if dx or dy:
+            self.move(dx, dy, game_map, entities)
 
     def attack(self, target: "Entity", entities: List["Entity"]) -> None:
         from engine.game import Game  # 循環参照を避けるためにローカルインポート
 
+        rng = _random_stream("combat")
+
         # 武器のダメージを計算
         damage = 1  # 素手の場合のデフォルトダメージ
         hit_bonus = 0
@@ -495,7 +771,7 @@ class Entity:
 
         if weapon and weapon.damage_dice:
             dice_count, dice_sides = weapon.damage_dice
-            damage = sum(random.randint(1, dice_sides) for _ in range(dice_count))
+            damage = sum(rng.randint(1, dice_sides) for _ in range(dice_count))
             hit_bonus = weapon.hit_bonus
 
         # 特殊能力の処理
@@ -503,13 +779,13 @@ class Entity:
             # 武器や防具を錆びさせる
             for item in target.inventory:
                 if item.entity_type in [EntityType.WEAPON, EntityType.ARMOR]:
-                    if item.hit_bonus > 0:
+                    if item.hit_bonus and item.hit_bonus > 0:
                         item.hit_bonus -= 1
-                    if item.defense > 0:
+                    if item.defense and item.defense > 0:
                         item.defense -= 1
         elif self.special == "fire":
             # 追加の火炎ダメージ
-            damage += random.randint(3, 6)
+            damage += rng.randint(3, 6)
 
         # 攻撃の実行
         if self.entity_type == EntityType.MONSTER:
@@ -527,4 +803,5 @@ class Entity:
                     self._add_xp(target.xp_given)
                     Game.instance.add_message(f"{target.name} {MESSAGES['monster_death']}")
             elif target.entity_type == EntityType.PLAYER:
+                Game.instance.killed_by = self.name
                 Game.instance.add_message(MESSAGES["death"])
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+import random
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.constants import MAX_DUNGEON_LEVEL
+from config.items import (
+    AMMO,
+    ARMORS,
+    FOODS,
+    MAGIC_ARMORS,
+    MAGIC_RINGS,
+    MAGIC_SHIELDS,
+    MAGIC_WEAPONS,
+    MELEE_WEAPONS,
+    POTIONS,
+    RANGED_WEAPONS,
+    RARE_ARMORS,
+    RARE_RINGS,
+    RARE_SHIELDS,
+    RARE_WEAPONS,
+    RINGS,
+    SCROLLS,
+    SHIELDS,
+    WANDS,
+)
+from entity.entity import Entity, EntityType
+from entity.prototype import EntityPrototype
+
+# 薬と巻物の最大スタック数
+POTION_STACK_SIZE = 5
+SCROLL_STACK_SIZE = 10
+
+
+def _prototype(
+    name: str, data: Dict[str, Any], entity_type: EntityType, **stats: Any
+) -> EntityPrototype:
+    levels = data.get("levels", (1, MAX_DUNGEON_LEVEL))
+    return EntityPrototype(
+        data["char"], data["color"], name, entity_type, levels=levels, **stats
+    )
+
+
+def _weapon(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    ranged = data.get("ranged", False)
+    return _prototype(
+        name,
+        data,
+        EntityType.RANGED if ranged else EntityType.WEAPON,
+        damage_dice=data["damage"],
+        hit_bonus=data["hit_bonus"],
+        two_handed=data["two_handed"],
+        ranged=ranged,
+        ammo_type=data.get("ammo_type"),
+    )
+
+
+def _armor(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return _prototype(
+        name,
+        data,
+        EntityType.ARMOR,
+        defense=data["defense"],
+        weight=data["weight"],
+    )
+
+
+def _shield(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return _prototype(
+        name,
+        data,
+        EntityType.SHIELD,
+        defense=data["defense"],
+        weight=data["weight"],
+    )
+
+
+def _ring(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return _prototype(
+        name,
+        data,
+        EntityType.RING,
+        defense=data.get("defense", 0),
+        strength=data.get("strength", 0),
+        sustain=data.get("sustain", False),
+        search=data.get("search", 0),
+    )
+
+
+def _potion(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    # 効果の強さ（回復量・持続ターン数・ダメージのいずれか）
+    amount = data.get("amount", data.get("duration", data.get("damage", 0)))
+    return _prototype(
+        name,
+        data,
+        EntityType.ITEM,
+        effect=data["effect"],
+        effect_amount=amount,
+        stack_size=POTION_STACK_SIZE,
+    )
+
+
+def _scroll(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return _prototype(
+        name,
+        data,
+        EntityType.ITEM,
+        effect=data["effect"],
+        stack_size=SCROLL_STACK_SIZE,
+    )
+
+
+def _wand(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return _prototype(
+        name,
+        data,
+        EntityType.ITEM,
+        effect=data["effect"],
+        damage_dice=data.get("damage"),
+    )
+
+
+def _food(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return _prototype(
+        name, data, EntityType.FOOD, nutrition=data["nutrition"], food_count=1
+    )
+
+
+def _ammo(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return _prototype(
+        name,
+        data,
+        EntityType.AMMO,
+        damage_dice=data["damage"],
+        ammo_type=data["ammo_type"],
+        stack_size=data["stack_size"],
+    )
+
+
+Builder = Callable[[str, Dict[str, Any]], EntityPrototype]
+ItemSource = Tuple[Builder, Dict[str, Dict[str, Any]], Optional[Tuple[str, ...]]]
+
+# 出現カテゴリ -> (プロトタイプの作り方, 元の表, 表のうち使う名前。None なら全部)
+ITEM_SOURCES: Dict[str, ItemSource] = {
+    "healing_potion": (_potion, POTIONS, ("Potion of Healing",)),
+    "extra_healing_potion": (_potion, POTIONS, ("Potion of Extra Healing",)),
+    "gain_strength_potion": (_potion, POTIONS, ("Potion of Gain Strength",)),
+    "restore_strength_potion": (_potion, POTIONS, ("Potion of Restore Strength",)),
+    "confusion_potion": (_potion, POTIONS, ("Potion of Confusion",)),
+    "poison_potion": (_potion, POTIONS, ("Potion of Poison",)),
+    "see_invisible_potion": (_potion, POTIONS, ("Potion of See Invisible",)),
+    "identify_scroll": (_scroll, SCROLLS, ("Scroll of Identify",)),
+    "light_scroll": (_scroll, SCROLLS, ("Scroll of Light",)),
+    "remove_curse_scroll": (_scroll, SCROLLS, ("Scroll of Remove Curse",)),
+    "enchant_weapon_scroll": (_scroll, SCROLLS, ("Scroll of Enchant Weapon",)),
+    "enchant_armor_scroll": (_scroll, SCROLLS, ("Scroll of Enchant Armor",)),
+    "teleportation_scroll": (_scroll, SCROLLS, ("Scroll of Teleportation",)),
+    "scare_monster_scroll": (_scroll, SCROLLS, ("Scroll of Scare Monster",)),
+    "magic_missile_wand": (_wand, WANDS, ("Wand of Magic Missile",)),
+    "lightning_wand": (_wand, WANDS, ("Wand of Lightning",)),
+    "fire_wand": (_wand, WANDS, ("Wand of Fire",)),
+    "cold_wand": (_wand, WANDS, ("Wand of Cold",)),
+    "polymorph_wand": (_wand, WANDS, ("Wand of Polymorph",)),
+    "slow_monster_wand": (_wand, WANDS, ("Wand of Slow Monster",)),
+    "teleportation_wand": (_wand, WANDS, ("Wand of Teleportation",)),
+    "food": (_food, FOODS, None),
+    "arrow": (_ammo, AMMO, ("Arrow",)),
+    "bolt": (_ammo, AMMO, ("Bolt",)),
+    "silver_arrow": (_ammo, AMMO, ("Silver Arrow",)),
+    "melee_weapon": (_weapon, MELEE_WEAPONS, None),
+    "ranged_weapon": (_weapon, RANGED_WEAPONS, None),
+    "armor": (_armor, ARMORS, None),
+    "shield": (_shield, SHIELDS, None),
+    "ring": (_ring, RINGS, None),
+    "magic_weapon": (_weapon, MAGIC_WEAPONS, None),
+    "magic_armor": (_armor, MAGIC_ARMORS, None),
+    "magic_shield": (_shield, MAGIC_SHIELDS, None),
+    "magic_ring": (_ring, MAGIC_RINGS, None),
+    "rare_weapon": (_weapon, RARE_WEAPONS, None),
+    "rare_armor": (_armor, RARE_ARMORS, None),
+    "rare_shield": (_shield, RARE_SHIELDS, None),
+    "rare_ring": (_ring, RARE_RINGS, None),
+}
+
+
+class ItemFactory:
+    """
+    Registry of item prototypes keyed by spawn category (see ITEM_CHANCES).
+
+    A category holds one or more prototypes; creating an item picks one of
+    those that appear on the dungeon level and clones it.
+    """
+
+    def __init__(self) -> None:
+        self._prototypes: Dict[str, Tuple[EntityPrototype, ...]] = {}
+        # (カテゴリ, 階層) -> その階層に出現するプロトタイプ
+        self._by_level: Dict[Tuple[str, int], Tuple[EntityPrototype, ...]] = {}
+
+    def __contains__(self, category: str) -> bool:
+        return category in self._prototypes
+
+    def register(self, category: str, prototypes: Iterable[EntityPrototype]) -> None:
+        """Add or replace the prototypes of a category.
+
+        Args:
+            category: The spawn category.
+            prototypes: The items the category can produce.
+        """
+        self._prototypes[category] = tuple(prototypes)
+        for key in [key for key in self._by_level if key[0] == category]:
+            del self._by_level[key]
+
+    def categories(self) -> List[str]:
+        """Return the registered categories in registration order."""
+        return list(self._prototypes)
+
+    def prototypes(
+        self, category: str, dungeon_level: int
+    ) -> Tuple[EntityPrototype, ...]:
+        """Return the prototypes of a category that appear on a level.
+
+        Args:
+            category: The spawn category.
+            dungeon_level: The depth.
+
+        Returns:
+            Tuple[EntityPrototype, ...]: The candidates, possibly empty.
+
+        Raises:
+            KeyError: If the category is not registered.
+        """
+        key = (category, dungeon_level)
+        candidates = self._by_level.get(key)
+        if candidates is None:
+            candidates = tuple(
+                prototype
+                for prototype in self._prototypes[category]
+                if prototype.appears_on(dungeon_level)
+            )
+            self._by_level[key] = candidates
+        return candidates
+
+    def create(
+        self,
+        category: str,
+        x: int,
+        y: int,
+        dungeon_level: int,
+        rng: Any = random,
+    ) -> Optional[Entity]:
+        """Create an item of a category.
+
+        Categories with several candidates draw one with rng.choice();
+        categories with one candidate use no randomness.
+
+        Args:
+            category: The spawn category.
+            x: The x-coordinate of the item.
+            y: The y-coordinate of the item.
+            dungeon_level: The depth the item appears on.
+            rng: The random stream to draw from.
+
+        Returns:
+            Optional[Entity]: The new item, or None if nothing in the
+            category appears on that level.
+
+        Raises:
+            KeyError: If the category is not registered.
+        """
+        candidates = self.prototypes(category, dungeon_level)
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0].create(x, y)
+        return rng.choice(candidates).create(x, y)
+
+
+def _build_item_factory() -> ItemFactory:
+    factory = ItemFactory()
+    for category, (builder, table, names) in ITEM_SOURCES.items():
+        chosen = names if names is not None else tuple(table)
+        factory.register(category, [builder(name, table[name]) for name in chosen])
+    return factory
+
+
+# config/items.py の表から作った既定のファクトリ
+ITEM_FACTORY = _build_item_factory()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from entity.entity import Entity
+
+
+class MonsterStore:
+    """
+    Struct-of-arrays storage for the monsters of one level.
+
+    While a monster is attached, its position and turn-related stats live in
+    the parallel arrays below and the Entity reads and writes them through its
+    slot number. This lets the per-turn bookkeeping of every monster run as a
+    handful of array operations.
+    """
+
+    # フィールド名 -> (配列のdtype, 読み出し時に変換するPythonの型)
+    FIELDS: Dict[str, Tuple[Any, Callable[[Any], Any]]] = {
+        "x": (np.int32, int),
+        "y": (np.int32, int),
+        "hp": (np.int32, int),
+        "max_hp": (np.int32, int),
+        "speed": (np.float64, float),
+        "move_count": (np.float64, float),
+        "sight_radius": (np.int32, int),
+        "confused_turns": (np.int32, int),
+        "regeneration": (np.bool_, bool),
+    }
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.entities: List[Optional["Entity"]] = [None] * capacity
+        self._columns: Dict[str, Tuple[np.ndarray, Callable[[Any], Any]]] = {}
+        for name, (dtype, convert) in self.FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            setattr(self, name, array)
+            self._columns[name] = (array, convert)
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return int(self.alive.sum())
+
+    def can_attach(self, entity: "Entity") -> bool:
+        """Check whether every stored field of an entity has a value.
+
+        Args:
+            entity: The entity to check.
+
+        Returns:
+            bool: True if the entity can be stored.
+        """
+        return entity.combat is not None and all(
+            getattr(entity, name) is not None for name in self.FIELDS
+        )
+
+    def attach(self, entity: "Entity") -> bool:
+        """Move an entity's stored fields into the arrays.
+
+        Args:
+            entity: The monster to attach.
+
+        Returns:
+            bool: True if the entity was attached, False if it is already
+            attached to a store or lacks one of the stored fields.
+        """
+        if entity._store is not None or not self.can_attach(entity):
+            return False
+
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        for name, (array, _) in self._columns.items():
+            array[slot] = getattr(entity, name)
+        self.alive[slot] = True
+        self.entities[slot] = entity
+        entity._store = self
+        entity._slot = slot
+        return True
+
+    def detach(self, entity: "Entity") -> None:
+        """Copy an entity's stored fields back into the entity and free its slot.
+
+        Args:
+            entity: The monster to detach. Entities of other stores are ignored.
+        """
+        if entity._store is not self:
+            return
+
+        slot = entity._slot
+        values = {name: self.get(name, slot) for name in self._columns}
+        entity._store = None
+        entity._slot = -1
+        for name, value in values.items():
+            setattr(entity, name, value)
+
+        self.alive[slot] = False
+        self.entities[slot] = None
+        self._free.append(slot)
+
+    def get(self, name: str, slot: int) -> Any:
+        array, convert = self._columns[name]
+        return convert(array[slot])
+
+    def set(self, name: str, slot: int, value: Any) -> None:
+        self._columns[name][0][slot] = value
+
+    def slots_of(self, entities: List["Entity"]) -> np.ndarray:
+        """Return the slot numbers of attached entities, in the given order.
+
+        Args:
+            entities: Entities attached to this store.
+
+        Returns:
+            np.ndarray: The slot numbers.
+        """
+        return np.fromiter(
+            (e._slot for e in entities), dtype=np.intp, count=len(entities)
+        )
+
+    def offsets_to(
+        self, x: int, y: int, slots: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the offset and Euclidean distance from each monster to a position.
+
+        Args:
+            x: The target x-coordinate.
+            y: The target y-coordinate.
+            slots: The monsters to measure from.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: dx, dy and the distance.
+        """
+        dx = (x - self.x[slots]).astype(np.float64)
+        dy = (y - self.y[slots]).astype(np.float64)
+        return dx, dy, np.sqrt(dx * dx + dy * dy)
+
+    def accumulate_speed(self, slots: np.ndarray) -> np.ndarray:
+        """Add each monster's speed to its move counter.
+
+        Args:
+            slots: The monsters taking a turn.
+
+        Returns:
+            np.ndarray: Mask over slots of the monsters that get to act.
+        """
+        self.move_count[slots] += self.speed[slots]
+        return self.move_count[slots] >= 1.0
+
+    def regenerate(self, slots: np.ndarray) -> None:
+        """Heal one HP for each regenerating monster below its maximum."""
+        heal = self.regeneration[slots] & (self.hp[slots] < self.max_hp[slots])
+        self.hp[slots[heal]] += 1
+
+    def _grow(self) -> None:
+        """Double the capacity of every array."""
+        old = self.capacity
+        self.capacity = old * 2
+        self.alive = np.concatenate([self.alive, np.zeros(old, dtype=bool)])
+        for name, (array, convert) in list(self._columns.items()):
+            grown = np.concatenate([array, np.zeros(old, dtype=array.dtype)])
+            setattr(self, name, grown)
+            self._columns[name] = (grown, convert)
+        self.entities.extend([None] * old)
+        self._free.extend(range(self.capacity - 1, old - 1, -1))
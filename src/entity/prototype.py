@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+from typing import Any, Dict, Optional, Tuple
+
+from components.combat import CombatStats
+from components.item import ItemStats
+from components.stack import StackInfo
+from config.constants import MAX_DUNGEON_LEVEL
+from config.monsters import MONSTERS
+from entity.entity import Entity, EntityType
+
+
+class EntityPrototype:
+    """
+    The static data of one kind of entity, shared by every entity of that kind.
+
+    Entities created from a prototype reference it. They share its item and
+    stack components (copied on the first write, see Entity) and get their
+    own copy of its creature stats, which hold per-instance state such as hp
+    and the inventory. A prototype cannot be modified once built.
+    """
+
+    __slots__ = (
+        "char",
+        "color",
+        "name",
+        "entity_type",
+        "blocks",
+        "levels",
+        "combat",
+        "item",
+        "stack",
+    )
+
+    char: str
+    color: Tuple[int, int, int]
+    name: str
+    entity_type: EntityType
+    blocks: bool
+    levels: Tuple[int, int]
+    combat: Optional[CombatStats]
+    item: Optional[ItemStats]
+    stack: Optional[StackInfo]
+
+    def __init__(
+        self,
+        char: str,
+        color: Tuple[int, int, int],
+        name: str,
+        entity_type: EntityType,
+        blocks: bool = False,
+        levels: Tuple[int, int] = (1, MAX_DUNGEON_LEVEL),
+        **stats: Any,
+    ):
+        """Build a prototype.
+
+        Args:
+            char: The character drawn for the entity.
+            color: The color of the character.
+            name: The entity name.
+            entity_type: The entity type.
+            blocks: Whether the entity blocks movement.
+            levels: The (min, max) dungeon levels the entity appears on.
+            **stats: Component fields, as accepted by Entity.
+        """
+        # 部品の作り分けは Entity のコンストラクタに任せる
+        template = Entity(0, 0, char, color, name, entity_type, blocks, **stats)
+        for slot, value in (
+            ("char", char),
+            ("color", color),
+            ("name", name),
+            ("entity_type", entity_type),
+            ("blocks", blocks),
+            ("levels", levels),
+            ("combat", template.combat),
+            ("item", template.item),
+            ("stack", template.stack),
+        ):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        values = tuple(getattr(self, slot) for slot in EntityPrototype.__slots__)
+        return (_restore_prototype, (values,))
+
+    def appears_on(self, dungeon_level: int) -> bool:
+        """Check whether the entity appears on a dungeon level."""
+        return self.levels[0] <= dungeon_level <= self.levels[1]
+
+    def create(self, x: int, y: int, **state: Any) -> Entity:
+        """Create an entity of this kind.
+
+        Args:
+            x: The x-coordinate of the entity.
+            y: The y-coordinate of the entity.
+            **state: Per-instance fields to set, e.g. hp=5 or count=3.
+
+        Returns:
+            Entity: A new entity referencing this prototype.
+        """
+        entity = Entity.__new__(Entity)
+        entity._store = None
+        entity._slot = -1
+        entity.prototype = self
+        entity._x = x
+        entity._y = y
+        entity.char = self.char
+        entity.color = self.color
+        entity.name = self.name
+        entity.entity_type = self.entity_type
+        entity.blocks = self.blocks
+        combat = self.combat
+        entity.combat = combat.copy() if combat is not None else None
+        entity.item = self.item
+        entity.stack = self.stack
+        for name, value in state.items():
+            setattr(entity, name, value)
+        return entity
+
+
+def _restore_prototype(values: Tuple[Any, ...]) -> EntityPrototype:
+    prototype = EntityPrototype.__new__(EntityPrototype)
+    for slot, value in zip(EntityPrototype.__slots__, values):
+        object.__setattr__(prototype, slot, value)
+    return prototype
+
+
+def _monster_prototype(name: str, data: Dict[str, Any]) -> EntityPrototype:
+    return EntityPrototype(
+        data["char"],
+        data["color"],
+        name,
+        EntityType.MONSTER,
+        blocks=True,
+        levels=(data["min_level"], data["max_level"]),
+        power=data["damage"],
+        xp_given=data["xp"],
+        speed=data.get("speed", 1.0),
+        special=data.get("special"),
+        regeneration=data.get("regeneration", False),
+        sight_radius=data.get("sight_radius", 8),
+    )
+
+
+# MONSTERS の各モンスターのプロトタイプ
+MONSTER_PROTOTYPES: Dict[str, EntityPrototype] = {
+    name: _monster_prototype(name, data) for name, data in MONSTERS.items()
+}
@@ -1,10 +1,23 @@
 #!/usr/bin/env python3
+import os
+from datetime import datetime
+
 from engine.game import Game
+from utils.logger import LOG_DIR, LOG_PREFIX, cleanup_old_logs, enable_async_logging
+
+REPLAY_SUFFIX = ".replay"
 
 
 def main():
-    game = Game()
-    game.run()
+    cleanup_old_logs()
+    cleanup_old_logs(suffix=REPLAY_SUFFIX)
+    enable_async_logging()
+    # 不具合を再現できるよう、毎回のプレイをリプレイとして記録する
+    os.makedirs(LOG_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    record_path = os.path.join(LOG_DIR, f"{LOG_PREFIX}{timestamp}{REPLAY_SUFFIX}")
+    with Game(record_path=record_path) as game:
+        game.run()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterable, List, Optional, Dict, Any, Tuple
 import random
-from .tile import Tile, Rectangle
+import numpy as np
+import tcod.path
+from .tile import TileGrid, Rectangle
+from .spatial_index import EntityList, SpatialIndex
+from .spawn_table import SpawnTable, spawn_table
 from utils.logger import setup_logger
 from config.constants import (
     ROOM_MIN_SIZE,
@@ -14,42 +18,112 @@ from config.constants import (
     GOLD_MAX_AMOUNT,
 )
 from config.monsters import MONSTERS
-from config.items import (
-    MELEE_WEAPONS,
-    RANGED_WEAPONS,
-    RARE_WEAPONS,
-    MAGIC_WEAPONS,
-    ARMORS,
-    RARE_ARMORS,
-    MAGIC_ARMORS,
-    RINGS,
-    RARE_RINGS,
-    MAGIC_RINGS,
-    ITEM_CHANCES,
-)
+from config.items import MELEE_WEAPONS, RANGED_WEAPONS
 from entity.entity import Entity, EntityType
+from entity.item_factory import ITEM_FACTORY
+from entity.prototype import MONSTER_PROTOTYPES
+from entity.monster_store import MonsterStore
+
+# 距離マップで到達できないマスの値
+UNREACHABLE = np.iinfo(np.int32).max
+# 距離マップから次の一歩を選ぶときに調べる隣接マス（同点の場合はこの順で優先）
+_NEIGHBOURS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+# GameMap.tile_layers の層の並び
+TILE_LAYERS = ("walkable", "transparent", "visible", "explored")
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
 
 
 class GameMap:
-    def __init__(self, width: int, height: int, dungeon_level: int):
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        dungeon_level: int,
+        use_monster_store: bool = True,
+        rng: Optional[random.Random] = None,
+    ):
+        """Create an empty map filled with walls.
+
+        Args:
+            width: The map width in tiles.
+            height: The map height in tiles.
+            dungeon_level: The depth of this level.
+            use_monster_store: Keep monster state in a MonsterStore.
+            rng: The random stream used to generate the level. Defaults to the
+                global random module.
+        """
         self.logger = setup_logger("map")
         self.logger.info(f"Initializing map for dungeon level {dungeon_level}")
 
         self.width = width
         self.height = height
         self.dungeon_level = dungeon_level
-        self.tiles = self._initialize_tiles()
-        self.visible = [[False for y in range(height)] for x in range(width)]
-        self.explored = [[False for y in range(height)] for x in range(width)]
+        self.rng = rng if rng is not None else random
+        # このフロアの出現テーブル（深さごとに一度だけ作って共有する）
+        self.spawn_table: SpawnTable = spawn_table(dungeon_level)
+        # TILE_LAYERS の4層を1つの配列に置き、各属性はその層のビューにする
+        self._tile_layers = np.zeros((len(TILE_LAYERS), width, height), dtype=bool)
+        self.walkable = self._tile_layers[0]
+        self.transparent = self._tile_layers[1]
+        self.tiles = TileGrid(self.walkable, self.transparent)
+        self.visible = self._tile_layers[2]
+        self.explored = self._tile_layers[3]
+        # 前回のFOVで可視にした範囲（次回はこの範囲だけを消去する）
+        self._fov_region: Tuple[slice, slice] = (slice(0, 0), slice(0, 0))
         self.rooms: List[Rectangle] = []
+        # 各マスが属する部屋の番号（通路・壁は -1）
+        self.room_ids = np.full((width, height), -1, dtype=np.int16)
+        # このフロアのエンティティの位置索引（EntityList と組み合わせて使う）
+        self.spatial_index = SpatialIndex(width, height)
+        self._views = (
+            _read_only(self._tile_layers),
+            _read_only(self.spatial_index.glyphs),
+            _read_only(self.spatial_index.kinds),
+        )
+        # モンスターの位置・HP・速度などを配列で保持するストア（無効時は None）
+        self.monster_store: Optional[MonsterStore] = (
+            MonsterStore() if use_monster_store else None
+        )
+        # プレイヤーへの距離マップとその目標位置（マップを掘ると破棄する）
+        self._distance_map: Optional[np.ndarray] = None
+        self._distance_target: Optional[Tuple[int, int]] = None
 
         self.logger.debug(f"Map initialized with size {width}x{height}")
 
-    def _initialize_tiles(self) -> List[List[Tile]]:
-        return [
-            [Tile(walkable=False, transparent=False) for y in range(self.height)]
-            for x in range(self.width)
-        ]
+    @property
+    def tile_layers(self) -> np.ndarray:
+        """A read-only (len(TILE_LAYERS), width, height) view of the tiles.
+
+        The layers are walkable, transparent, visible and explored, and the
+        view always shows the current state of the map.
+        """
+        return self._views[0]
+
+    @property
+    def entity_glyphs(self) -> np.ndarray:
+        """A read-only (width, height) view of SpatialIndex.glyphs."""
+        return self._views[1]
+
+    @property
+    def entity_kinds(self) -> np.ndarray:
+        """A read-only (width, height) view of SpatialIndex.kinds."""
+        return self._views[2]
+
+    def create_entity_list(self, entities: Iterable[Entity] = ()) -> EntityList:
+        """Create the entity list of this level, bound to its index and store.
+
+        Args:
+            entities: The entities to start with.
+
+        Returns:
+            EntityList: A list that keeps spatial_index and monster_store in sync.
+        """
+        return EntityList(self.spatial_index, entities, self.monster_store)
 
     def in_bounds(self, x: int, y: int) -> bool:
         """Check if coordinates are within map bounds.
@@ -64,20 +138,47 @@ class GameMap:
         return 0 <= x < self.width and 0 <= y < self.height
 
     def _create_room(self, room: Rectangle) -> None:
-        for x in range(room.x1 + 1, room.x2):
-            for y in range(room.y1 + 1, room.y2):
-                self.tiles[x][y].walkable = True
-                self.tiles[x][y].transparent = True
+        inner = (slice(room.x1 + 1, room.x2), slice(room.y1 + 1, room.y2))
+        self.walkable[inner] = True
+        self.transparent[inner] = True
+        self._distance_map = None
+
+    def _add_room(self, room: Rectangle) -> None:
+        """Register a carved room and mark its interior in the room-id grid.
+
+        Args:
+            room: The room to register.
+        """
+        self.room_ids[room.x1 + 1 : room.x2, room.y1 + 1 : room.y2] = len(self.rooms)
+        self.rooms.append(room)
+
+    def room_at(self, x: int, y: int) -> Optional[Rectangle]:
+        """Return the room whose interior contains the given position.
+
+        Args:
+            x: The x-coordinate to look up.
+            y: The y-coordinate to look up.
+
+        Returns:
+            Optional[Rectangle]: The room, or None for corridors, walls and
+            out-of-bounds positions.
+        """
+        if not self.in_bounds(x, y):
+            return None
+        room_id = self.room_ids[x, y]
+        return self.rooms[room_id] if room_id >= 0 else None
 
     def _create_h_tunnel(self, x1: int, x2: int, y: int) -> None:
-        for x in range(min(x1, x2), max(x1, x2) + 1):
-            self.tiles[x][y].walkable = True
-            self.tiles[x][y].transparent = True
+        xs = slice(min(x1, x2), max(x1, x2) + 1)
+        self.walkable[xs, y] = True
+        self.transparent[xs, y] = True
+        self._distance_map = None
 
     def _create_v_tunnel(self, y1: int, y2: int, x: int) -> None:
-        for y in range(min(y1, y2), max(y1, y2) + 1):
-            self.tiles[x][y].walkable = True
-            self.tiles[x][y].transparent = True
+        ys = slice(min(y1, y2), max(y1, y2) + 1)
+        self.walkable[x, ys] = True
+        self.transparent[x, ys] = True
+        self._distance_map = None
 
     def _place_entities(self, room: Rectangle, entities: List[Entity]) -> None:
         self._place_monsters(room, entities)
@@ -85,47 +186,27 @@ class GameMap:
         self._place_gold(room, entities)
 
     def _place_monsters(self, room: Rectangle, entities: List[Entity]) -> None:
-        # このフロアに出現可能なモンスターをフィルタリング
-        possible_monsters = {
-            name: data
-            for name, data in MONSTERS.items()
-            if self.dungeon_level >= data["min_level"]
-            and self.dungeon_level <= data["max_level"]
-        }
-
-        if not possible_monsters:
+        # このフロアに出現可能なモンスターがいなければ何もしない
+        if not self.spawn_table.monster_names:
             return
 
-        # モンスターの数を決定
-        number_of_monsters = random.randint(0, MAX_MONSTERS_PER_ROOM)
+        # モンスターの数を決定し、種類は部屋の分をまとめて抽選
+        number_of_monsters = self.rng.randint(0, MAX_MONSTERS_PER_ROOM)
+        monster_names = self.spawn_table.sample_monsters(self.rng, number_of_monsters)
 
-        for _ in range(number_of_monsters):
+        for monster_name in monster_names:
             # モンスターの位置をランダムに決定
-            x = random.randint(room.x1 + 1, room.x2 - 1)
-            y = random.randint(room.y1 + 1, room.y2 - 1)
+            x = self.rng.randint(room.x1 + 1, room.x2 - 1)
+            y = self.rng.randint(room.y1 + 1, room.y2 - 1)
 
             # 他のエンティティと重ならないかチェック
-            if not any(entity.x == x and entity.y == y for entity in entities):
-                # モンスターをランダムに選択
-                monster_name = random.choice(list(possible_monsters.keys()))
-                monster_data = possible_monsters[monster_name]
-
-                monster = Entity(
-                    x=x,
-                    y=y,
-                    char=monster_data["char"],
-                    color=monster_data["color"],
-                    name=monster_name,
-                    entity_type=EntityType.MONSTER,
-                    blocks=True,
-                    hp=self._roll_hp(monster_data["hp"]),
-                    max_hp=self._roll_hp(monster_data["hp"]),
-                    power=monster_data["damage"],
-                    xp_given=monster_data["xp"],
-                    speed=monster_data.get("speed", 1.0),
-                    special=monster_data.get("special"),
-                    regeneration=monster_data.get("regeneration", False),
-                    sight_radius=monster_data.get("sight_radius", 8),
+            if not self.spatial_index.is_occupied(x, y):
+                hp_dice = MONSTERS[monster_name]["hp"]
+                monster = MONSTER_PROTOTYPES[monster_name].create(
+                    x,
+                    y,
+                    hp=self._roll_hp(hp_dice),
+                    max_hp=self._roll_hp(hp_dice),
                 )
 
                 entities.append(monster)
@@ -140,158 +221,31 @@ class GameMap:
             int: The total HP value.
         """
         base_hp, dice = hp_dice
-        return base_hp + random.randint(1, dice)
+        return base_hp + self.rng.randint(1, dice)
 
     def _place_items(self, room: Rectangle, entities: List[Entity]) -> None:
-        number_of_items = random.randint(0, MAX_ITEMS_PER_ROOM)
+        # アイテムの数を決定し、種類は部屋の分をまとめて抽選
+        number_of_items = self.rng.randint(0, MAX_ITEMS_PER_ROOM)
+        categories = self.spawn_table.sample_items(self.rng, number_of_items)
 
-        for _ in range(number_of_items):
-            x = random.randint(room.x1 + 1, room.x2 - 1)
-            y = random.randint(room.y1 + 1, room.y2 - 1)
+        for category in categories:
+            x = self.rng.randint(room.x1 + 1, room.x2 - 1)
+            y = self.rng.randint(room.y1 + 1, room.y2 - 1)
 
-            if not any(entity.x == x and entity.y == y for entity in entities):
-                item = self._create_item(x, y)
+            if not self.spatial_index.is_occupied(x, y):
+                item = ITEM_FACTORY.create(category, x, y, self.dungeon_level, self.rng)
                 if item:
                     entities.append(item)
 
-    def _create_item(self, x: int, y: int) -> Optional[Entity]:
-        roll = random.randint(1, 100)
-        total = 0
-
-        for item_name, chance in ITEM_CHANCES.items():
-            total += chance
-            if roll <= total:
-                if item_name == "healing_potion":
-                    return Entity(
-                        x,
-                        y,
-                        "!",
-                        (127, 0, 0),
-                        "Healing Potion",
-                        EntityType.ITEM,
-                        blocks=False,
-                        effect="heal",
-                        effect_amount=4,
-                        stack_size=5,
-                    )
-                elif item_name == "lightning_scroll":
-                    return Entity(
-                        x,
-                        y,
-                        "?",
-                        (0, 127, 127),
-                        "Lightning Scroll",
-                        EntityType.ITEM,
-                        blocks=False,
-                        effect="lightning",
-                        effect_amount=5,
-                        stack_size=10,
-                    )
-                elif item_name == "fireball_scroll":
-                    return Entity(
-                        x,
-                        y,
-                        "?",
-                        (127, 127, 0),
-                        "Fireball Scroll",
-                        EntityType.ITEM,
-                        blocks=False,
-                        effect="fireball",
-                        effect_amount=3,
-                        stack_size=10,
-                    )
-                elif item_name == "confusion_scroll":
-                    return Entity(
-                        x,
-                        y,
-                        "?",
-                        (127, 0, 127),
-                        "Confusion Scroll",
-                        EntityType.ITEM,
-                        blocks=False,
-                        effect="confusion",
-                        effect_amount=4,
-                        stack_size=10,
-                    )
-                elif item_name == "teleport_scroll":
-                    return Entity(
-                        x,
-                        y,
-                        "?",
-                        (0, 255, 255),
-                        "Teleport Scroll",
-                        EntityType.ITEM,
-                        blocks=False,
-                        effect="teleport",
-                        effect_amount=0,
-                        stack_size=10,
-                    )
-                elif item_name == "weapon":
-                    weapon_name = random.choice(list(WEAPONS.keys()))
-                    return self._create_weapon(x, y, weapon_name)
-                elif item_name == "armor":
-                    armor_name = random.choice(list(ARMORS.keys()))
-                    return self._create_armor(x, y, armor_name)
-                elif item_name == "ring":
-                    ring_name = random.choice(list(RINGS.keys()))
-                    return self._create_ring(x, y, ring_name)
-        return None
-
-    def _create_weapon(self, x: int, y: int, weapon_name: str) -> Entity:
-        weapon_data = WEAPONS[weapon_name]
-        return Entity(
-            x,
-            y,
-            weapon_data["char"],
-            weapon_data["color"],
-            weapon_name,
-            EntityType.WEAPON,
-            blocks=False,
-            damage_dice=weapon_data["damage"],
-            hit_bonus=weapon_data["hit_bonus"],
-            two_handed=weapon_data["two_handed"],
-            ranged=weapon_data.get("ranged", False),
-        )
-
-    def _create_armor(self, x: int, y: int, armor_name: str) -> Entity:
-        armor_data = ARMORS[armor_name]
-        return Entity(
-            x,
-            y,
-            armor_data["char"],
-            armor_data["color"],
-            armor_name,
-            EntityType.ARMOR,
-            blocks=False,
-            defense=armor_data["defense"],
-            weight=armor_data["weight"],
-        )
-
-    def _create_ring(self, x: int, y: int, ring_name: str) -> Entity:
-        ring_data = RINGS[ring_name]
-        return Entity(
-            x,
-            y,
-            ring_data["char"],
-            ring_data["color"],
-            ring_name,
-            EntityType.RING,
-            blocks=False,
-            defense=ring_data.get("defense", 0),
-            strength=ring_data.get("strength", 0),
-            sustain=ring_data.get("sustain", False),
-            search=ring_data.get("search", 0),
-        )
-
     def _place_gold(self, room: Rectangle, entities: List[Entity]) -> None:
-        number_of_gold = random.randint(0, MAX_GOLD_PER_ROOM)
+        number_of_gold = self.rng.randint(0, MAX_GOLD_PER_ROOM)
 
         for _ in range(number_of_gold):
-            x = random.randint(room.x1 + 1, room.x2 - 1)
-            y = random.randint(room.y1 + 1, room.y2 - 1)
+            x = self.rng.randint(room.x1 + 1, room.x2 - 1)
+            y = self.rng.randint(room.y1 + 1, room.y2 - 1)
 
-            if not any(entity.x == x and entity.y == y for entity in entities):
-                gold_amount = random.randint(GOLD_MIN_AMOUNT, GOLD_MAX_AMOUNT)
+            if not self.spatial_index.is_occupied(x, y):
+                gold_amount = self.rng.randint(GOLD_MIN_AMOUNT, GOLD_MAX_AMOUNT)
                 gold = Entity(
                     x,
                     y,
@@ -309,7 +263,8 @@ class GameMap:
 
         Args:
             player: The player entity to place in the dungeon.
-            entities: List of all entities in the game.
+            entities: List of all entities in the game, as returned by
+                create_entity_list.
         """
         self.logger.info("Generating new dungeon map")
 
@@ -322,7 +277,7 @@ class GameMap:
 
                 if not self.rooms:
                     self.logger.debug(f"Placing player at ({new_x}, {new_y})")
-                    player.x, player.y = new_x, new_y
+                    self.spatial_index.move(player, new_x, new_y)
                     self.compute_fov(player.x, player.y, player.sight_radius)
                 else:
                     prev_x, prev_y = self.rooms[-1].center
@@ -332,20 +287,20 @@ class GameMap:
                     self._connect_rooms(prev_x, prev_y, new_x, new_y)
 
                 self._place_entities(room, entities)
-                self.rooms.append(room)
+                self._add_room(room)
 
         self._place_special_entities(self.rooms, player, entities)
         self.logger.info(f"Map generation complete with {len(self.rooms)} rooms")
 
     def _create_random_room(self) -> Rectangle:
-        w = random.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
-        h = random.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
-        x = random.randint(0, self.width - w - 1)
-        y = random.randint(0, self.height - h - 1)
+        w = self.rng.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
+        h = self.rng.randint(ROOM_MIN_SIZE, ROOM_MAX_SIZE)
+        x = self.rng.randint(0, self.width - w - 1)
+        y = self.rng.randint(0, self.height - h - 1)
         return Rectangle(x, y, w, h)
 
     def _connect_rooms(self, x1: int, y1: int, x2: int, y2: int) -> None:
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             self._create_h_tunnel(x1, x2, y1)
             self._create_v_tunnel(y1, y2, x2)
         else:
@@ -358,14 +313,16 @@ class GameMap:
         if self.dungeon_level == 26:
             self._try_place_amulet(rooms, entities)
         self._place_stairs(rooms, entities)
+        if self.dungeon_level > 1:
+            self._place_up_stairs(player, entities)
 
     def _try_place_amulet(self, rooms: List[Rectangle], entities: List[Entity]) -> None:
         if len(rooms) > 0:
-            room = random.choice(rooms)
-            x = random.randint(room.x1 + 1, room.x2 - 1)
-            y = random.randint(room.y1 + 1, room.y2 - 1)
+            room = self.rng.choice(rooms)
+            x = self.rng.randint(room.x1 + 1, room.x2 - 1)
+            y = self.rng.randint(room.y1 + 1, room.y2 - 1)
 
-            if not any(entity.x == x and entity.y == y for entity in entities):
+            if not self.spatial_index.is_occupied(x, y):
                 amulet = Entity(
                     x,
                     y,
@@ -379,11 +336,11 @@ class GameMap:
 
     def _place_stairs(self, rooms: List[Rectangle], entities: List[Entity]) -> None:
         if len(rooms) > 0:
-            room = random.choice(rooms)
-            x = random.randint(room.x1 + 1, room.x2 - 1)
-            y = random.randint(room.y1 + 1, room.y2 - 1)
+            room = self.rng.choice(rooms)
+            x = self.rng.randint(room.x1 + 1, room.x2 - 1)
+            y = self.rng.randint(room.y1 + 1, room.y2 - 1)
 
-            if not any(entity.x == x and entity.y == y for entity in entities):
+            if not self.spatial_index.is_occupied(x, y):
                 stairs = Entity(
                     x,
                     y,
@@ -395,6 +352,46 @@ class GameMap:
                 )
                 entities.append(stairs)
 
+    def _place_up_stairs(self, player: Entity, entities: List[Entity]) -> None:
+        # 上り階段は到着地点に置く（乱数を使わないので生成結果は変わらない）
+        stairs = Entity(
+            player.x,
+            player.y,
+            "<",
+            (255, 255, 255),
+            "Stairs",
+            EntityType.STAIRS_UP,
+            blocks=False,
+        )
+        entities.append(stairs)
+
+    def find_free_cell(self, x: int, y: int) -> Tuple[int, int]:
+        """Find the walkable, unblocked cell nearest to a position.
+
+        Cells are searched in growing squares around the position, so the
+        result only depends on the map and its entities.
+
+        Args:
+            x: The x-coordinate to start from.
+            y: The y-coordinate to start from.
+
+        Returns:
+            Tuple[int, int]: The free cell, or (x, y) if there is none.
+        """
+        for radius in range(max(self.width, self.height)):
+            for dx in range(-radius, radius + 1):
+                for dy in range(-radius, radius + 1):
+                    if max(abs(dx), abs(dy)) != radius:
+                        continue
+                    cx, cy = x + dx, y + dy
+                    if (
+                        self.in_bounds(cx, cy)
+                        and self.walkable[cx, cy]
+                        and not self.spatial_index.is_blocked(cx, cy)
+                    ):
+                        return cx, cy
+        return x, y
+
     def _create_starting_equipment(self) -> List[Entity]:
         equipment = []
 
@@ -467,61 +464,119 @@ class GameMap:
 
         return equipment
 
+    def _clip_region(self, x1: int, y1: int, x2: int, y2: int) -> Tuple[slice, slice]:
+        """Return the slices covering the inclusive box (x1, y1)-(x2, y2) clipped to the map.
+
+        Args:
+            x1: The left edge.
+            y1: The top edge.
+            x2: The right edge (inclusive).
+            y2: The bottom edge (inclusive).
+
+        Returns:
+            Tuple[slice, slice]: Slices usable to index the [x, y] arrays.
+        """
+        return (
+            slice(max(x1, 0), min(x2 + 1, self.width)),
+            slice(max(y1, 0), min(y2 + 1, self.height)),
+        )
+
     def compute_fov(self, x: int, y: int, radius: int) -> None:
         """Calculate player's field of view using Rogue-style room-based visibility.
 
+        Only the region lit by the previous call is cleared, so the cost depends on
+        the size of the room around the player rather than on the map size.
+
         Args:
             x: The x-coordinate of the player.
             y: The y-coordinate of the player.
             radius: The sight radius (not used in room-based FOV).
         """
-        # Reset all tiles to not visible
-        for i in range(self.width):
-            for j in range(self.height):
-                self.visible[i][j] = False
-
-        # Find the room player is in
-        current_room = None
-        for room in self.rooms:
-            if room.x1 < x < room.x2 and room.y1 < y < room.y2:
-                current_room = room
-                break
+        # Reset the tiles lit by the previous call
+        self.visible[self._fov_region] = False
+
+        current_room = self.room_at(x, y)
 
         if current_room:
             # If in a room, make entire room visible
-            for i in range(current_room.x1, current_room.x2 + 1):
-                for j in range(current_room.y1, current_room.y2 + 1):
-                    if 0 <= i < self.width and 0 <= j < self.height:
-                        self.visible[i][j] = True
-                        self.explored[i][j] = True
+            inner = self._clip_region(
+                current_room.x1, current_room.y1, current_room.x2, current_room.y2
+            )
+            self.visible[inner] = True
 
             # Make 1 tile around room visible (to see doors and corridor entrances)
-            for i in range(current_room.x1 - 1, current_room.x2 + 2):
-                for j in range(current_room.y1 - 1, current_room.y2 + 2):
-                    if 0 <= i < self.width and 0 <= j < self.height:
-                        if self.tiles[i][j].walkable:
-                            self.visible[i][j] = True
-                            self.explored[i][j] = True
+            region = self._clip_region(
+                current_room.x1 - 1,
+                current_room.y1 - 1,
+                current_room.x2 + 1,
+                current_room.y2 + 1,
+            )
+            self.visible[region] |= self.walkable[region]
         else:
-            # If in corridor
-            # Make player's position visible
-            self.visible[x][y] = True
-            self.explored[x][y] = True
-
-            # Make adjacent tiles visible
-            directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
-            for dx, dy in directions:
-                new_x, new_y = x + dx, y + dy
-                if 0 <= new_x < self.width and 0 <= new_y < self.height:
-                    self.visible[new_x][new_y] = True
-                    self.explored[new_x][new_y] = True
-
-                    # If corridor leads to a room, make entrance visible
-                    if self.tiles[new_x][new_y].walkable:
-                        for room in self.rooms:
-                            if (
-                                room.x1 - 1 <= new_x <= room.x2 + 1
-                                and room.y1 - 1 <= new_y <= room.y2 + 1
-                            ):
-                                self.visible[new_x][new_y] = True
-                                self.explored[new_x][new_y] = True
+            # If in corridor, make player's position and adjacent tiles visible
+            region = self._clip_region(x - 1, y - 1, x + 1, y + 1)
+            self.visible[x, region[1]] = True
+            self.visible[region[0], y] = True
+
+        self.explored[region] |= self.visible[region]
+        self._fov_region = region
+
+    def distance_map(self, x: int, y: int) -> np.ndarray:
+        """Return the walking distance from every tile to a target position.
+
+        Distances use 8-way movement with every step costing 1, the same moves
+        monsters make. The map is cached and only recomputed when the target
+        moves or the level is carved.
+
+        Args:
+            x: The x-coordinate of the target.
+            y: The y-coordinate of the target.
+
+        Returns:
+            np.ndarray: Int32 array indexed as [x, y]. Walls and tiles that
+            cannot reach the target hold UNREACHABLE.
+        """
+        if self._distance_map is None or self._distance_target != (x, y):
+            distance = np.full((self.width, self.height), UNREACHABLE, dtype=np.int32)
+            distance[x, y] = 0
+            tcod.path.dijkstra2d(distance, self.walkable, 1, 1, out=distance)
+            self._distance_map = distance
+            self._distance_target = (x, y)
+        return self._distance_map
+
+    def next_step(
+        self, x: int, y: int, distance: np.ndarray, preferred: Tuple[int, int]
+    ) -> Tuple[int, int]:
+        """Pick the step from (x, y) that gets closest to a distance map's target.
+
+        Only tiles free of blocking entities and strictly closer to the target
+        are considered. Ties go to the preferred step, then to the first match
+        in _NEIGHBOURS order, so the choice is deterministic.
+
+        Args:
+            x: The current x-coordinate.
+            y: The current y-coordinate.
+            distance: A map returned by distance_map.
+            preferred: The step to take if the target cannot be reached, and to
+                favour among equally good steps.
+
+        Returns:
+            Tuple[int, int]: The step (dx, dy); (0, 0) when every closer tile is
+            occupied.
+        """
+        best_distance = distance[x, y]
+        if best_distance == UNREACHABLE:
+            return preferred
+
+        best = (0, 0)
+        blocked = self.spatial_index.blocked
+        for dx, dy in (preferred,) + _NEIGHBOURS:
+            nx, ny = x + dx, y + dy
+            if (
+                self.in_bounds(nx, ny)
+                and distance[nx, ny] < best_distance
+                and not blocked[nx, ny]
+            ):
+                best = (dx, dy)
+                best_distance = distance[nx, ny]
+        return best
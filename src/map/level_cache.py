@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+import os
+import pickle
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .game_map import GameMap
+from .spatial_index import EntityList
+from .tile import Rectangle
+from entity.entity import Entity
+from utils.logger import setup_logger
+
+
+def _pack(mask: np.ndarray) -> bytes:
+    return np.packbits(mask, axis=None).tobytes()
+
+
+def _unpack(data: bytes, shape: Tuple[int, int]) -> np.ndarray:
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=shape[0] * shape[1])
+    return bits.reshape(shape).astype(bool)
+
+
+@dataclass
+class LevelSnapshot:
+    """
+    A compact copy of a level the player has left.
+
+    The tile and explored masks are stored as packed bits, and the entities
+    are detached from the level's index and monster store, so a snapshot
+    holds no numpy state besides its bytes and can be pickled as is.
+
+    Snapshots read from a save file may instead carry a picklable
+    entity_loader, which builds the entities the first time they are needed.
+    """
+
+    dungeon_level: int
+    width: int
+    height: int
+    walkable: bytes
+    transparent: bytes
+    explored: bytes
+    rooms: List[Tuple[int, int, int, int]]
+    entities: List[Entity]
+    entity_loader: Optional[Callable[[], List[Entity]]] = None
+
+    @classmethod
+    def capture(cls, game_map: GameMap, entities: EntityList) -> "LevelSnapshot":
+        """Take a snapshot of a level, emptying its entity list.
+
+        Args:
+            game_map: The level's map.
+            entities: The level's entities, without the player.
+
+        Returns:
+            LevelSnapshot: The snapshot.
+        """
+        kept = list(entities)
+        # リストから外すとモンスターの値がストアからエンティティに書き戻される
+        entities.clear()
+        return cls.from_arrays(
+            game_map.dungeon_level,
+            game_map.walkable,
+            game_map.transparent,
+            game_map.explored,
+            [(room.x, room.y, room.w, room.h) for room in game_map.rooms],
+            kept,
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        dungeon_level: int,
+        walkable: np.ndarray,
+        transparent: np.ndarray,
+        explored: np.ndarray,
+        rooms: List[Tuple[int, int, int, int]],
+        entities: List[Entity],
+    ) -> "LevelSnapshot":
+        """Build a snapshot from unpacked (width, height) masks.
+
+        Args:
+            dungeon_level: The depth of the level.
+            walkable: The walkable mask.
+            transparent: The transparent mask.
+            explored: The explored mask.
+            rooms: The rooms as (x, y, w, h).
+            entities: The detached entities of the level.
+
+        Returns:
+            LevelSnapshot: The snapshot.
+        """
+        width, height = walkable.shape
+        return cls(
+            dungeon_level=dungeon_level,
+            width=width,
+            height=height,
+            walkable=_pack(walkable),
+            transparent=_pack(transparent),
+            explored=_pack(explored),
+            rooms=rooms,
+            entities=entities,
+        )
+
+    def get_entities(self) -> List[Entity]:
+        """Return the entities, building them first if they are not loaded."""
+        if self.entity_loader is not None:
+            self.entities = self.entity_loader()
+            self.entity_loader = None
+        return self.entities
+
+    def masks(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the walkable, transparent and explored masks, unpacked."""
+        shape = (self.width, self.height)
+        return (
+            _unpack(self.walkable, shape),
+            _unpack(self.transparent, shape),
+            _unpack(self.explored, shape),
+        )
+
+    def restore(self) -> Tuple[GameMap, EntityList]:
+        """Rebuild the level.
+
+        Returns:
+            Tuple[GameMap, EntityList]: A new map and its entity list, with
+            nothing visible until the FOV is computed.
+        """
+        game_map = GameMap(self.width, self.height, self.dungeon_level)
+        walkable, transparent, explored = self.masks()
+        game_map.walkable[:] = walkable
+        game_map.transparent[:] = transparent
+        game_map.explored[:] = explored
+        for room in self.rooms:
+            game_map._add_room(Rectangle(*room))
+        return game_map, game_map.create_entity_list(self.get_entities())
+
+
+class LevelCache:
+    """
+    Keeps the levels the player has left so they can be revisited.
+
+    At most max_resident snapshots are kept in memory. When more are stored,
+    the least recently used ones are written to spill_dir, or forgotten (and
+    generated anew on the next visit) when there is no spill directory.
+    """
+
+    def __init__(self, max_resident: int = 8, spill_dir: Optional[str] = None):
+        """Create an empty cache.
+
+        Args:
+            max_resident: The number of snapshots kept in memory.
+            spill_dir: A directory to write evicted snapshots to. None drops
+                them instead.
+        """
+        if max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+        self.logger = setup_logger("map")
+        self.max_resident = max_resident
+        self.spill_dir = spill_dir
+        self._resident: "OrderedDict[int, LevelSnapshot]" = OrderedDict()
+        self._spilled: Dict[int, str] = {}
+
+    def __contains__(self, dungeon_level: int) -> bool:
+        return dungeon_level in self._resident or dungeon_level in self._spilled
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._spilled)
+
+    @property
+    def resident_levels(self) -> List[int]:
+        """The levels held in memory, least recently used first."""
+        return list(self._resident)
+
+    def store(self, game_map: GameMap, entities: EntityList) -> None:
+        """Snapshot a level and keep it, evicting old levels if needed.
+
+        Args:
+            game_map: The level's map.
+            entities: The level's entities, without the player. The list is
+                emptied.
+        """
+        self.put(LevelSnapshot.capture(game_map, entities))
+
+    def put(self, snapshot: LevelSnapshot) -> None:
+        """Keep a snapshot as the most recently used level.
+
+        Args:
+            snapshot: The snapshot, replacing any stored for the same level.
+        """
+        level = snapshot.dungeon_level
+        self._discard_spilled(level)
+        self._resident[level] = snapshot
+        self._resident.move_to_end(level)
+
+        while len(self._resident) > self.max_resident:
+            old_level, old = self._resident.popitem(last=False)
+            if self.spill_dir is None:
+                self.logger.debug(f"Dropping cached dungeon level {old_level}")
+                continue
+            self._spill(old)
+
+    def load(self, dungeon_level: int) -> Optional[LevelSnapshot]:
+        """Take a level out of the cache.
+
+        Args:
+            dungeon_level: The level wanted.
+
+        Returns:
+            Optional[LevelSnapshot]: The snapshot, or None if the level was
+            never stored or has been dropped.
+        """
+        snapshot = self._resident.pop(dungeon_level, None)
+        if snapshot is not None:
+            return snapshot
+
+        path = self._spilled.pop(dungeon_level, None)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        os.remove(path)
+        self.logger.debug(f"Loaded dungeon level {dungeon_level} from {path}")
+        return snapshot
+
+    def snapshots(self) -> Iterator[LevelSnapshot]:
+        """Iterate over every stored level, least recently used first.
+
+        Spilled levels are read back from disk but stay spilled.
+        """
+        for path in self._spilled.values():
+            with open(path, "rb") as f:
+                yield pickle.load(f)
+        yield from self._resident.values()
+
+    def clear(self) -> None:
+        """Forget every level and remove the spilled files."""
+        self._resident.clear()
+        for level in list(self._spilled):
+            self._discard_spilled(level)
+
+    def _spill(self, snapshot: LevelSnapshot) -> None:
+        assert self.spill_dir is not None
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f"level_{snapshot.dungeon_level:02d}.pkl")
+        with open(path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spilled[snapshot.dungeon_level] = path
+        self.logger.debug(f"Spilled dungeon level {snapshot.dungeon_level} to {path}")
+
+    def _discard_spilled(self, dungeon_level: int) -> None:
+        path = self._spilled.pop(dungeon_level, None)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
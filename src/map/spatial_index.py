@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+from collections.abc import MutableSequence
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Union,
+)
+
+import numpy as np
+
+from entity.entity import EntityType
+
+if TYPE_CHECKING:
+    from entity.entity import Entity
+    from entity.monster_store import MonsterStore
+
+
+_MONSTER = EntityType.MONSTER
+
+
+def kind_mask(*entity_types: EntityType) -> int:
+    """Return the SpatialIndex.kinds bits of some entity types.
+
+    Args:
+        *entity_types: The entity types to combine.
+
+    Returns:
+        int: A bitmask with one bit per entity type.
+    """
+    mask = 0
+    for entity_type in entity_types:
+        mask |= 1 << entity_type.value
+    return mask
+
+
+class SpatialIndex:
+    """
+    Occupancy index for the entities of one level.
+
+    Blocking entities (the player and monsters) are kept in a grid, at most one
+    per cell. Everything else (items, gold, stairs...) is kept in a per-cell
+    bucket in arrival order.
+
+    Two grids summarize every cell and are updated as entities come and go:
+    glyphs holds the code point of the character drawn there (the blocking
+    entity, else the last non-blocking entity to arrive, 0 if empty), and
+    kinds holds the kind_mask of all the entity types present.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.blocked = np.zeros((width, height), dtype=bool)
+        self.glyphs = np.zeros((width, height), dtype=np.int32)
+        self.kinds = np.zeros((width, height), dtype=np.uint16)
+        self._blockers: Dict[Tuple[int, int], "Entity"] = {}
+        self._items: Dict[Tuple[int, int], List["Entity"]] = {}
+
+    def add(self, entity: "Entity") -> None:
+        """Register an entity at its current position.
+
+        Args:
+            entity: The entity to register.
+        """
+        cell = (entity.x, entity.y)
+        if entity.blocks:
+            self._blockers[cell] = entity
+            self.blocked[cell] = True
+        else:
+            self._items.setdefault(cell, []).append(entity)
+        self._refresh(cell)
+
+    def remove(self, entity: "Entity") -> None:
+        """Unregister an entity. Entities that are not indexed are ignored.
+
+        Args:
+            entity: The entity to unregister.
+        """
+        cell = (entity.x, entity.y)
+        if entity.blocks:
+            if self._blockers.get(cell) is entity:
+                del self._blockers[cell]
+                self.blocked[cell] = False
+                self._refresh(cell)
+            return
+
+        bucket = self._items.get(cell)
+        if bucket is None:
+            return
+        for i, item in enumerate(bucket):
+            if item is entity:
+                del bucket[i]
+                break
+        else:
+            return
+        if not bucket:
+            del self._items[cell]
+        self._refresh(cell)
+
+    def _refresh(self, cell: Tuple[int, int]) -> None:
+        """Recompute the glyph and kinds of one cell."""
+        blocker = self._blockers.get(cell)
+        bucket = self._items.get(cell, ())
+        kinds = 0
+        for item in bucket:
+            kinds |= 1 << item.entity_type.value
+        if blocker is not None:
+            kinds |= 1 << blocker.entity_type.value
+            self.glyphs[cell] = ord(blocker.char)
+        else:
+            self.glyphs[cell] = ord(bucket[-1].char) if bucket else 0
+        self.kinds[cell] = kinds
+
+    def contains(self, entity: "Entity") -> bool:
+        """Check whether an entity is registered at its current position.
+
+        Args:
+            entity: The entity to look for.
+
+        Returns:
+            bool: True if the entity is indexed.
+        """
+        cell = (entity.x, entity.y)
+        if entity.blocks:
+            return self._blockers.get(cell) is entity
+        return any(item is entity for item in self._items.get(cell, ()))
+
+    def move(self, entity: "Entity", x: int, y: int) -> None:
+        """Move an entity to a new position, keeping the index up to date.
+
+        Entities that are not indexed simply get their coordinates updated.
+
+        Args:
+            entity: The entity to move.
+            x: The new x-coordinate.
+            y: The new y-coordinate.
+        """
+        indexed = self.contains(entity)
+        if indexed:
+            self.remove(entity)
+        entity.x = x
+        entity.y = y
+        if indexed:
+            self.add(entity)
+
+    def blocking_entity_at(self, x: int, y: int) -> Optional["Entity"]:
+        """Return the blocking entity at a position, if any."""
+        return self._blockers.get((x, y))
+
+    def is_blocked(self, x: int, y: int) -> bool:
+        """Check whether a blocking entity stands at a position."""
+        return (x, y) in self._blockers
+
+    def items_at(self, x: int, y: int) -> List["Entity"]:
+        """Return a copy of the non-blocking entities at a position.
+
+        A copy is returned so callers may remove entities while iterating.
+        """
+        return list(self._items.get((x, y), ()))
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        """Check whether any entity, blocking or not, stands at a position."""
+        cell = (x, y)
+        return cell in self._blockers or cell in self._items
+
+    def clear(self) -> None:
+        """Forget every entity."""
+        self.blocked[:] = False
+        self.glyphs[:] = 0
+        self.kinds[:] = 0
+        self._blockers.clear()
+        self._items.clear()
+
+
+class EntityList(MutableSequence):
+    """
+    The list of entities on a level, keeping a SpatialIndex in sync.
+
+    It behaves like a list, and every way of adding or removing entities
+    (append, item and slice assignment, del, +=, pop...) updates the index;
+    moving them must go through SpatialIndex.move. When a MonsterStore is
+    given, monsters are attached to it while they are in the list.
+    """
+
+    def __init__(
+        self,
+        index: SpatialIndex,
+        entities: Iterable["Entity"] = (),
+        store: Optional["MonsterStore"] = None,
+    ):
+        self._entities: List["Entity"] = []
+        self.spatial_index = index
+        self.store = store
+        self.extend(entities)
+
+    def _added(self, entity: "Entity") -> None:
+        self.spatial_index.add(entity)
+        if self.store is not None and entity.entity_type is _MONSTER:
+            self.store.attach(entity)
+
+    def _removed(self, entity: "Entity") -> None:
+        self.spatial_index.remove(entity)
+        if self.store is not None:
+            self.store.detach(entity)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __iter__(self) -> Iterator["Entity"]:
+        return iter(self._entities)
+
+    def __reversed__(self) -> Iterator["Entity"]:
+        return reversed(self._entities)
+
+    def __contains__(self, entity: object) -> bool:
+        return entity in self._entities
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._entities!r})"
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        return self._entities[i]
+
+    def __setitem__(self, i: Union[int, slice], value: Any) -> None:
+        if isinstance(i, slice):
+            old = self._entities[i]
+            new = list(value)
+            self._entities[i] = new
+        else:
+            old = [self._entities[i]]
+            new = [value]
+            self._entities[i] = value
+        # 入れ替わる場合に備えて、先に外してから登録し直す
+        for entity in old:
+            self._removed(entity)
+        for entity in new:
+            self._added(entity)
+
+    def __delitem__(self, i: Union[int, slice]) -> None:
+        old = self._entities[i] if isinstance(i, slice) else [self._entities[i]]
+        del self._entities[i]
+        for entity in old:
+            self._removed(entity)
+
+    def insert(self, i: int, entity: "Entity") -> None:
+        self._entities.insert(i, entity)
+        self._added(entity)
+
+    def append(self, entity: "Entity") -> None:
+        self._entities.append(entity)
+        self._added(entity)
+
+    def clear(self) -> None:
+        for entity in self._entities:
+            self._removed(entity)
+        self._entities.clear()
+
+    # 並べ替えは中身が変わらないので索引には触れない
+    def reverse(self) -> None:
+        self._entities.reverse()
+
+    def sort(self, *, key: Any = None, reverse: bool = False) -> None:
+        self._entities.sort(key=key, reverse=reverse)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import random
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Tuple
+
+from config.items import ITEM_CHANCES
+from config.monsters import MONSTERS
+from entity.item_factory import ITEM_FACTORY
+
+
+class SpawnTable:
+    """
+    The monsters and items that can appear on one dungeon level.
+
+    Built once per depth by spawn_table(). The item table holds the
+    ITEM_CHANCES categories that ITEM_FACTORY can create on that level,
+    weighted by their chances over the total of those chances (not a d100).
+    Map generation draws the monsters and items of each room in one
+    rng.choices() call.
+    """
+
+    def __init__(self, dungeon_level: int):
+        """Compile the table of a dungeon level.
+
+        Args:
+            dungeon_level: The depth the table is for.
+        """
+        self.dungeon_level = dungeon_level
+        # MONSTERS の定義順に並べた、このフロアに出現できるモンスター
+        self.monster_names: Tuple[str, ...] = tuple(
+            name
+            for name, data in MONSTERS.items()
+            if data["min_level"] <= dungeon_level <= data["max_level"]
+        )
+        # この階層で作れるカテゴリと、その重みの累計
+        self.item_names: Tuple[str, ...] = tuple(
+            category
+            for category in ITEM_CHANCES
+            if category in ITEM_FACTORY
+            and ITEM_FACTORY.prototypes(category, dungeon_level)
+        )
+        self.item_cumulative: Tuple[int, ...] = tuple(
+            accumulate(ITEM_CHANCES[category] for category in self.item_names)
+        )
+        self.item_total = self.item_cumulative[-1] if self.item_cumulative else 0
+
+    def sample_monsters(self, rng: random.Random, count: int) -> List[str]:
+        """Draw the monsters of a room in one call.
+
+        Args:
+            rng: The random stream of the level.
+            count: The number of monsters.
+
+        Returns:
+            List[str]: count keys of MONSTERS, uniformly drawn, or an empty
+            list if no monster lives at this depth.
+        """
+        if not self.monster_names:
+            return []
+        return rng.choices(self.monster_names, k=count)
+
+    def sample_items(self, rng: random.Random, count: int) -> List[str]:
+        """Draw the item categories of a room in one call.
+
+        Args:
+            rng: The random stream of the level.
+            count: The number of items.
+
+        Returns:
+            List[str]: count keys of ITEM_CHANCES, weighted by their chances,
+            or an empty list if no item can appear on this level.
+        """
+        if not self.item_total:
+            return []
+        return rng.choices(self.item_names, cum_weights=self.item_cumulative, k=count)
+
+
+@lru_cache(maxsize=None)
+def spawn_table(dungeon_level: int) -> SpawnTable:
+    """Return the spawn table of a dungeon level, compiling it on first use.
+
+    Args:
+        dungeon_level: The depth.
+
+    Returns:
+        SpawnTable: The shared table of that depth.
+    """
+    return SpawnTable(dungeon_level)
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
 
 
 @dataclass
@@ -16,6 +19,86 @@ class Tile:
         self.transparent = transparent
 
 
+class TileView:
+    """
+    A single cell of a TileGrid, exposing the Tile attributes on top of the arrays.
+    """
+
+    __slots__ = ("_grid", "_x", "_y")
+
+    def __init__(self, grid: "TileGrid", x: int, y: int):
+        self._grid = grid
+        self._x = x
+        self._y = y
+
+    @property
+    def walkable(self) -> bool:
+        return bool(self._grid.walkable[self._x, self._y])
+
+    @walkable.setter
+    def walkable(self, value: bool) -> None:
+        self._grid.walkable[self._x, self._y] = value
+
+    @property
+    def transparent(self) -> bool:
+        return bool(self._grid.transparent[self._x, self._y])
+
+    @transparent.setter
+    def transparent(self, value: bool) -> None:
+        self._grid.transparent[self._x, self._y] = value
+
+
+class TileColumn:
+    """
+    One x column of a TileGrid, so that grid[x][y] keeps working.
+    """
+
+    __slots__ = ("_grid", "_x")
+
+    def __init__(self, grid: "TileGrid", x: int):
+        self._grid = grid
+        self._x = x
+
+    def __getitem__(self, y: int) -> TileView:
+        if not 0 <= y < len(self):
+            raise IndexError(f"tile y {y} out of range")
+        return TileView(self._grid, self._x, y)
+
+    def __iter__(self) -> Iterator[TileView]:
+        for y in range(len(self)):
+            yield TileView(self._grid, self._x, y)
+
+    def __len__(self) -> int:
+        return self._grid.walkable.shape[1]
+
+
+class TileGrid:
+    """
+    Compatibility view over the walkable/transparent arrays of a map.
+
+    The arrays are the source of truth; grid[x][y] returns a lightweight view
+    whose walkable and transparent attributes read and write the arrays.
+    """
+
+    __slots__ = ("walkable", "transparent")
+
+    def __init__(self, walkable: np.ndarray, transparent: np.ndarray):
+        self.walkable = walkable
+        self.transparent = transparent
+
+    def __getitem__(self, x: int) -> TileColumn:
+        if not 0 <= x < len(self):
+            raise IndexError(f"tile x {x} out of range")
+        return TileColumn(self, x)
+
+    def __iter__(self) -> Iterator[TileColumn]:
+        for x in range(len(self)):
+            yield TileColumn(self, x)
+
+    def __len__(self) -> int:
+        return self.walkable.shape[0]
+
+
 @dataclass
 class Rectangle:
     """
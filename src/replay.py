@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Re-run a recorded game headlessly and report how fast it played.
+
+Example:
+    python src/replay.py logs/roguelike_20240101_120000.replay --repeat 5
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from engine.replay import ReplayPlayer
+from utils.logger import configure_log_levels
+
+# リプレイ実行時にレベルを下げるロガー
+LOGGERS = ("game", "map", "entity", "renderer")
+
+
+def replay(
+    path: str,
+    until_turn: Optional[int] = None,
+    checkpoint_every: int = 0,
+    checkpoint_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Play a replay file once and summarize the run.
+
+    Args:
+        path: The replay file.
+        until_turn: Stop after this many turns. None plays the whole file.
+        checkpoint_every: Save a checkpoint every this many turns.
+        checkpoint_dir: Where to save checkpoints.
+
+    Returns:
+        Dict[str, Any]: A JSON-serializable summary of the run.
+    """
+    start = time.perf_counter()
+    player = ReplayPlayer(path, checkpoint_every, checkpoint_dir)
+    game = player.play(until_turn)
+    seconds = time.perf_counter() - start
+    return {
+        "seed": player.seed,
+        "turns": player.turn,
+        "seconds": seconds,
+        "turns_per_second": player.turn / seconds if seconds > 0 else None,
+        "dungeon_level": game.player.dungeon_level,
+        "hp": game.player.hp,
+        "xp": game.player.xp,
+        "gold": game.player.gold,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Re-run a recorded game headlessly at full speed."
+    )
+    parser.add_argument("path", help="replay file")
+    parser.add_argument("--until", type=int, help="stop after this many turns")
+    parser.add_argument("--repeat", type=int, default=1, help="number of runs")
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=0, help="turns between checkpoints"
+    )
+    parser.add_argument("--checkpoint-dir", help="directory for checkpoints")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    configure_log_levels({name: args.log_level for name in LOGGERS})
+    for _ in range(args.repeat):
+        summary = replay(
+            args.path, args.until, args.checkpoint_every, args.checkpoint_dir
+        )
+        print(json.dumps(summary), flush=True)
+
+
+if __name__ == "__main__":
+    main()
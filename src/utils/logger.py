@@ -1,26 +1,149 @@
 #!/usr/bin/env python3
+import atexit
 import logging
 import os
-import glob
+import queue
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Union
 
+LOG_DIR = "logs"
+LOG_PREFIX = "roguelike_"
+# コンポーネントごとのログレベル指定（例: "renderer=INFO,entity=DEBUG"）
+LOG_LEVELS_ENV = "ROGUELIKE_LOG_LEVELS"
+
+# 設定済みのロガー（名前ごとに1つだけ作成する）
+_loggers: Dict[str, logging.Logger] = {}
+# 全コンポーネントで共有するハンドラ（プロセスごとに1回だけ作成する）
+_handlers: Optional[List[logging.Handler]] = None
+# コンポーネントごとに設定されたログレベル（コード側の既定値より優先）
+_levels: Optional[Dict[str, int]] = None
+# 非同期モードのキューとリスナー
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """レコードを整形せずにそのままキューへ入れるハンドラ
+
+    標準の QueueHandler は呼び出し側のスレッドでメッセージを整形するが、
+    同一プロセス内のキューなので整形はリスナースレッドに任せる。
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logger(name: str, level: int = logging.DEBUG) -> logging.Logger:
+    """各コンポーネント用のロガーを設定
+
+    同じ名前で再度呼ばれた場合は設定済みのロガーをそのまま返すため、
+    ハンドラが重複して追加されることはない。set_log_level や環境変数
+    ROGUELIKE_LOG_LEVELS でレベルが指定されている場合はそちらを優先する。
+    """
+    logger = _loggers.get(name)
+    if logger is not None:
+        return logger
 
-def setup_logger(name: str) -> logging.Logger:
-    """各コンポーネント用のロガーを設定"""
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(_get_levels().get(name, level))
+    for handler in _active_handlers():
+        logger.addHandler(handler)
 
-    # ログディレクトリがなければ作成
-    if not os.path.exists("logs"):
-        os.makedirs("logs")
+    _loggers[name] = logger
+    return logger
+
+
+def set_log_level(name: str, level: Union[int, str]) -> None:
+    """コンポーネントのログレベルを設定（作成済みのロガーにも反映）"""
+    level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level for {name}: {level}")
+
+    _get_levels()[name] = level
+    if name in _loggers:
+        _loggers[name].setLevel(level)
+
+
+def configure_log_levels(levels: Mapping[str, Union[int, str]]) -> None:
+    """複数コンポーネントのログレベルをまとめて設定"""
+    for name, level in levels.items():
+        set_log_level(name, level)
+
+
+def _get_levels() -> Dict[str, int]:
+    """環境変数から読み込んだレベル設定を返す（初回のみ解析）"""
+    global _levels
+    if _levels is None:
+        _levels = {}
+        for entry in os.environ.get(LOG_LEVELS_ENV, "").split(","):
+            name, _, level = entry.partition("=")
+            if name.strip() and level.strip():
+                set_log_level(name.strip(), level.strip())
+    return _levels
 
-    # 古いログファイルを削除（最新5件を残す）
-    _cleanup_old_logs()
+
+def enable_async_logging() -> None:
+    """非同期ログモードを有効にする
+
+    ロガーはレコードをキューに入れるだけになり、整形とファイル・コンソール
+    への書き込みはバックグラウンドのスレッドで行われる。
+    """
+    global _queue_handler, _listener
+    if _listener is not None:
+        return
+
+    record_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(record_queue)
+    _listener = QueueListener(
+        record_queue, *_get_handlers(), respect_handler_level=True
+    )
+    _listener.start()
+    _swap_handlers(_get_handlers(), [_queue_handler])
+    atexit.register(stop_async_logging)
+
+
+def stop_async_logging() -> None:
+    """キューに残ったレコードを書き出し、同期ログモードに戻す"""
+    global _queue_handler, _listener
+    if _listener is None:
+        return
+
+    _swap_handlers([_queue_handler], _get_handlers())
+    _listener.stop()
+    _queue_handler = None
+    _listener = None
+
+
+def _active_handlers() -> List[logging.Handler]:
+    """現在のモードでロガーに取り付けるハンドラを返す"""
+    if _queue_handler is not None:
+        return [_queue_handler]
+    return _get_handlers()
+
+
+def _swap_handlers(old: List[logging.Handler], new: List[logging.Handler]) -> None:
+    """設定済みの全ロガーのハンドラを入れ替える"""
+    for logger in _loggers.values():
+        for handler in old:
+            logger.removeHandler(handler)
+        for handler in new:
+            logger.addHandler(handler)
+
+
+def _get_handlers() -> List[logging.Handler]:
+    """共有ハンドラを返す（初回呼び出し時にログファイルを作成）"""
+    global _handlers
+    if _handlers is not None:
+        return _handlers
+
+    # ログディレクトリがなければ作成
+    os.makedirs(LOG_DIR, exist_ok=True)
 
     # ファイル出力用ハンドラ
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = f"logs/roguelike_{timestamp}.log"
+    log_file = os.path.join(LOG_DIR, f"{LOG_PREFIX}{timestamp}.log")
     fh = RotatingFileHandler(
         log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"  # 10MB
     )
@@ -37,23 +160,30 @@ def setup_logger(name: str) -> logging.Logger:
     fh.setFormatter(formatter)
     ch.setFormatter(formatter)
 
-    # ハンドラをロガーに追加
-    logger.addHandler(fh)
-    logger.addHandler(ch)
+    _handlers = [fh, ch]
+    return _handlers
 
-    return logger
 
+def cleanup_old_logs(
+    log_dir: Union[str, Path] = LOG_DIR,
+    prefix: str = LOG_PREFIX,
+    keep_files: int = 5,
+    suffix: str = ".log",
+) -> None:
+    """古いログファイルを削除（最新 keep_files 件を残す）
+
+    起動時に1回だけ呼び出すことを想定している。suffix を変えるとリプレイなど
+    ログ以外のファイルも同じ規則で整理できる。
+    """
+    files = [str(path) for path in Path(log_dir).glob(f"{prefix}*{suffix}")]
+    if len(files) <= keep_files:
+        return
 
-def _cleanup_old_logs() -> None:
-    """古いログファイルを削除（最新5件を残す）"""
-    pattern = "logs/roguelike_*.log"
-    files = glob.glob(pattern)
-    if len(files) > 5:
-        # タイムスタンプでソート
-        files.sort(key=lambda x: os.path.getctime(x), reverse=True)
-        # 古いファイルを削除
-        for file in files[5:]:
-            try:
-                os.remove(file)
-            except OSError:
-                pass
+    # タイムスタンプでソート（同時刻の場合はファイル名順）
+    files.sort(key=lambda x: (os.path.getctime(x), x), reverse=True)
+    # 古いファイルを削除
+    for file in files[keep_files:]:
+        try:
+            os.remove(file)
+        except OSError:
+            pass
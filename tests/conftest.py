@@ -0,0 +1,18 @@
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# ゲーム本体は src をルートとしてインポートしているため、テストからも同じ形で読み込めるようにする
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import utils.logger  # noqa: E402
+
+# テスト実行中のログは作業ツリーではなく一時ディレクトリに書き出す
+_LOG_DIR = tempfile.mkdtemp(prefix="roguelike_test_logs_")
+utils.logger.LOG_DIR = _LOG_DIR
+
+
+def pytest_unconfigure(config):
+    utils.logger.stop_async_logging()
+    shutil.rmtree(_LOG_DIR, ignore_errors=True)
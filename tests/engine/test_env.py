@@ -0,0 +1,134 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from engine.env import (
+    ACTIONS,
+    ENTITY_LAYERS,
+    MAP_CHANNELS,
+    STAT_NAMES,
+    TILE_LAYERS,
+    RogueEnv,
+    VectorRogueEnv,
+    observe_into,
+)
+from entity.entity import Entity, EntityType
+
+_PLAYER_LAYER = len(TILE_LAYERS) + [name for name, _ in ENTITY_LAYERS].index("player")
+
+
+class TestRogueEnv(TestCase):
+    def test_observation_arrays(self):
+        """観測がマップ・エンティティ層・ステータスの配列になることをテスト"""
+        env = RogueEnv()
+        obs, info = env.reset(seed=3)
+        game = env.game
+        tiles = obs["map"]
+        self.assertEqual(tiles.shape, (MAP_CHANNELS, 80, 45))
+        self.assertEqual(tiles.dtype, np.uint8)
+        np.testing.assert_array_equal(tiles[0], game.game_map.walkable)
+        np.testing.assert_array_equal(tiles[2], game.game_map.visible)
+        self.assertEqual(int(tiles[_PLAYER_LAYER].sum()), 1)
+        self.assertEqual(tiles[_PLAYER_LAYER, game.player.x, game.player.y], 1)
+        self.assertEqual(obs["stats"].shape, (len(STAT_NAMES),))
+        self.assertEqual(obs["stats"][STAT_NAMES.index("hp")], game.player.hp)
+        self.assertEqual(info["seed"], 3)
+        env.close()
+
+    def test_step_returns_five_tuple(self):
+        """step が観測・報酬・終了・打ち切り・情報を返すことをテスト"""
+        env = RogueEnv(max_turns=2)
+        env.reset(seed=3)
+        player = env.game.player
+        stairs = Entity(
+            player.x,
+            player.y,
+            ">",
+            (255, 255, 255),
+            "Stairs",
+            EntityType.STAIRS_DOWN,
+            blocks=False,
+        )
+        env.game.entities.append(stairs)
+
+        obs, reward, terminated, truncated, info = env.step(ACTIONS.index(("descend",)))
+        self.assertEqual(reward, 1.0)
+        self.assertEqual(obs["stats"][STAT_NAMES.index("dungeon_level")], 2)
+        self.assertFalse(terminated or truncated)
+        _, reward, terminated, truncated, info = env.step(("wait",))
+        self.assertEqual(reward, 0.0)
+        self.assertTrue(truncated)
+        self.assertEqual(info["turn"], 2)
+        env.close()
+
+    def test_observe_into_fills_given_arrays(self):
+        """observe_into が渡された配列の中身を書き換えることをテスト"""
+        env = RogueEnv()
+        expected, _ = env.reset(seed=3)
+        tiles = np.full((MAP_CHANNELS, 80, 45), 7, dtype=np.uint8)
+        stats = np.zeros(len(STAT_NAMES), dtype=np.float32)
+        observe_into(env.game, tiles, stats)
+        np.testing.assert_array_equal(tiles, expected["map"])
+        np.testing.assert_array_equal(stats, expected["stats"])
+        with self.assertRaises(ValueError):
+            observe_into(env.game, tiles[:, :40], stats)
+        env.close()
+
+    def test_step_before_reset(self):
+        """reset 前の step はエラーになることをテスト"""
+        with self.assertRaises(RuntimeError):
+            RogueEnv().step(0)
+
+
+class TestVectorRogueEnv(TestCase):
+    def test_matches_single_environments(self):
+        """各スロットが同じシードの単独環境と同じ観測を返すことをテスト"""
+        vector = VectorRogueEnv(3, max_turns=20)
+        obs, infos = vector.reset(seed=5)
+        self.assertEqual(obs["map"].shape, (3, MAP_CHANNELS, 80, 45))
+        self.assertEqual(len({info["seed"] for info in infos}), 3)
+
+        singles = [RogueEnv(max_turns=20) for _ in range(3)]
+        for env, info in zip(singles, infos):
+            env.reset(info["seed"])
+
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            actions = rng.integers(0, 8, size=3).tolist()
+            obs, rewards, terminated, truncated, infos = vector.step(actions)
+            for i, env in enumerate(singles):
+                expected, reward, *_ = env.step(actions[i])
+                if terminated[i] or truncated[i]:
+                    final = infos[i]["final_observation"]
+                    np.testing.assert_array_equal(final["map"], expected["map"])
+                    env.reset(infos[i]["seed"])
+                    continue
+                np.testing.assert_array_equal(obs["map"][i], expected["map"])
+                np.testing.assert_array_equal(obs["stats"][i], expected["stats"])
+                self.assertEqual(rewards[i], reward)
+
+        # 打ち切られたゲームは次のシードで始め直している
+        self.assertTrue(truncated.all())
+        self.assertTrue(all(info["turn"] == 0 for info in infos))
+        self.assertTrue(all(info["final_info"]["turn"] == 20 for info in infos))
+        vector.close()
+
+    def test_writes_into_caller_arrays(self):
+        """呼び出し側の配列に観測をそのまま書き込むことをテスト"""
+        out = {
+            "map": np.zeros((2, MAP_CHANNELS, 80, 45), dtype=np.uint8),
+            "stats": np.zeros((2, len(STAT_NAMES)), dtype=np.float32),
+        }
+        vector = VectorRogueEnv(2, out=out)
+        obs, _ = vector.reset(seed=5)
+        self.assertIs(obs["map"], out["map"])
+        self.assertEqual(int(out["map"][:, _PLAYER_LAYER].sum()), 2)
+        obs, *_ = vector.step([0, 0])
+        self.assertIs(obs["stats"], out["stats"])
+        vector.close()
+        with self.assertRaises(ValueError):
+            VectorRogueEnv(3, out=out)
+
+
+if __name__ == "__main__":
+    main()
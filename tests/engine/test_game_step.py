@@ -0,0 +1,97 @@
+import random
+from unittest import TestCase, main
+
+from config.messages import MESSAGES
+from engine.game import Game
+from entity.entity import Entity, EntityType
+
+_MOVES = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+class TestGameStep(TestCase):
+    def setUp(self):
+        """固定シードでゲームを作成"""
+        random.seed(3)
+        self.game = Game()
+        self.addCleanup(self.game.close)
+
+    def _state(self, game):
+        return (
+            game.player.x,
+            game.player.y,
+            game.player.hp,
+            game.player.gold,
+            tuple((e.name, e.x, e.y, e.hp) for e in game.entities),
+            tuple(game.messages),
+        )
+
+    def test_step_matches_keyboard_play(self):
+        """step() と run() のループで同じ結果になることをテスト"""
+        moves = random.Random(0).choices(_MOVES, k=100)
+
+        random.seed(3)
+        with Game() as headless:
+            for dx, dy in moves:
+                if headless.step(("move", dx, dy)).done:
+                    break
+
+        random.seed(3)
+        with Game() as interactive:
+            for dx, dy in moves:
+                # run() のループ1回分と同じ流れ（死亡していたら終了）
+                if interactive.player.hp <= 0:
+                    interactive.add_message(MESSAGES["death"])
+                    break
+                result = interactive.perform(("move", dx, dy))
+                if result and interactive._process_result(result):
+                    break
+                interactive._process_monster_turns()
+            else:
+                if interactive.player.hp <= 0:
+                    interactive.add_message(MESSAGES["death"])
+
+        self.assertEqual(self._state(headless), self._state(interactive))
+
+    def test_observation_reports_player_and_new_messages(self):
+        """観測にプレイヤーの状態とそのターンのメッセージが入ることをテスト"""
+        before = len(self.game.messages)
+        observation = self.game.step(("drop", 0))
+
+        self.assertEqual(observation.turn, 1)
+        self.assertEqual(
+            (observation.x, observation.y), (self.game.player.x, self.game.player.y)
+        )
+        self.assertEqual(observation.inventory_size, 3)
+        self.assertFalse(observation.done)
+        self.assertEqual(observation.messages, self.game.messages[before:])
+
+        dropped = self.game.game_map.spatial_index.items_at(
+            self.game.player.x, self.game.player.y
+        )
+        self.assertIn("Dagger", [e.name for e in dropped])
+
+    def test_descend_changes_level(self):
+        """階段の上で descend すると次の階層に移動することをテスト"""
+        player = self.game.player
+        stairs = Entity(
+            player.x,
+            player.y,
+            ">",
+            (255, 255, 255),
+            "Stairs",
+            EntityType.STAIRS_DOWN,
+            blocks=False,
+        )
+        self.game.entities.append(stairs)
+        observation = self.game.step(("descend",))
+        self.assertEqual(observation.dungeon_level, 2)
+
+    def test_quit_and_unknown_actions(self):
+        """quit で終了し、未知の行動はエラーになることをテスト"""
+        self.assertTrue(self.game.step(("quit",)).done)
+        with self.assertRaises(ValueError):
+            self.game.step(("fly",))
+
+
+if __name__ == "__main__":
+    main()
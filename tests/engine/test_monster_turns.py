@@ -0,0 +1,65 @@
+import random
+from unittest import TestCase, main
+
+from engine.game import Game
+from entity.entity import EntityType
+
+
+def _play(seed, batched, turns=150):
+    """同じシードでゲームを進め、各ターンの状態を記録する"""
+    random.seed(seed)
+    with Game() as game:
+        if not batched:
+            # ストアを外すと Entity.take_turn による逐次処理になる
+            game.game_map.monster_store = None
+
+        history = []
+        for _ in range(turns):
+            dx, dy = random.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+            game._move_player(dx, dy)
+            game._process_monster_turns()
+            history.append(
+                (
+                    game.player.x,
+                    game.player.y,
+                    game.player.hp,
+                    tuple(
+                        (e.name, e.x, e.y, e.hp, e.gold)
+                        for e in game.entities
+                        if e.entity_type == EntityType.MONSTER
+                    ),
+                )
+            )
+            if game.player.hp <= 0:
+                break
+        return history, list(game.messages)
+
+
+class TestMonsterTurns(TestCase):
+    def test_batched_turns_match_sequential_turns(self):
+        """一括処理の結果が逐次処理と一致することをテスト"""
+        for seed in range(5):
+            self.assertEqual(_play(seed, batched=True), _play(seed, batched=False))
+
+    def test_monsters_approach_player(self):
+        """視界内のモンスターがプレイヤーに近づくことをテスト"""
+        random.seed(1)
+        game = Game()
+        self.addCleanup(game.close)
+        monster = next(e for e in game.entities if e.entity_type == EntityType.MONSTER)
+        monster.speed = 1.0
+        monster.sight_radius = 100
+        # 部屋の床に置き直して、プレイヤーとの間に障害物がない状態にする
+        room = game.game_map.rooms[0]
+        x, y = room.x1 + 1, room.y1 + 1
+        game.game_map.spatial_index.move(game.player, room.x2 - 1, room.y2 - 1)
+        game.game_map.spatial_index.move(monster, x, y)
+
+        before = max(abs(game.player.x - x), abs(game.player.y - y))
+        game._process_monster_turns()
+        after = max(abs(game.player.x - monster.x), abs(game.player.y - monster.y))
+        self.assertLess(after, before)
+
+
+if __name__ == "__main__":
+    main()
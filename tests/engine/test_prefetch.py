@@ -0,0 +1,92 @@
+import threading
+from unittest import TestCase, main
+
+from engine.game import Game
+from engine.prefetch import LevelPrefetcher
+from entity.entity import Entity, EntityType
+
+
+def _descend(game):
+    """下り階段の上に移動して次の階層へ進む"""
+    player = game.player
+    stairs = Entity(
+        player.x,
+        player.y,
+        ">",
+        (255, 255, 255),
+        "Stairs",
+        EntityType.STAIRS_DOWN,
+        blocks=False,
+    )
+    game.entities.append(stairs)
+    return game.step(("descend",))
+
+
+def _level_state(game):
+    return (
+        game.game_map.walkable.tobytes(),
+        game.game_map.explored.tobytes(),
+        [(e.name, e.x, e.y, e.hp) for e in game.entities],
+        game.entities[0] is game.player,
+    )
+
+
+class TestLevelPrefetcher(TestCase):
+    def test_generates_in_background(self):
+        """バックグラウンドのスレッドで生成されることをテスト"""
+        threads = []
+
+        def generate(level):
+            threads.append(threading.current_thread())
+            return f"level {level}"
+
+        prefetcher = LevelPrefetcher(generate)
+        prefetcher.prefetch(2)
+        self.assertEqual(prefetcher.take(2), "level 2")
+        self.assertIsNot(threads[0], threading.current_thread())
+        # 取り出した後や、先読みしていない階層は None
+        self.assertIsNone(prefetcher.take(2))
+        self.assertIsNone(prefetcher.take(3))
+        prefetcher.shutdown()
+
+    def test_new_request_replaces_old_one(self):
+        """別の階層を先読みすると前の要求は破棄されることをテスト"""
+        prefetcher = LevelPrefetcher(lambda level: level)
+        prefetcher.prefetch(2)
+        prefetcher.prefetch(3)
+        self.assertIsNone(prefetcher.take(2))
+        self.assertEqual(prefetcher.take(3), 3)
+        prefetcher.shutdown()
+
+
+class TestGamePrefetch(TestCase):
+    def test_prefetched_levels_match_synchronous_generation(self):
+        """先読みした階層が同期生成と同じになることをテスト"""
+        prefetching = Game(seed=21)
+        synchronous = Game(seed=21, prefetch_levels=False)
+        for game in (prefetching, synchronous):
+            self.addCleanup(game.close)
+        self.assertIsNotNone(prefetching.prefetcher)
+
+        for _ in range(3):
+            for game in (prefetching, synchronous):
+                _descend(game)
+            self.assertEqual(_level_state(prefetching), _level_state(synchronous))
+            self.assertEqual(
+                (prefetching.player.x, prefetching.player.y),
+                (synchronous.player.x, synchronous.player.y),
+            )
+            index = prefetching.game_map.spatial_index
+            self.assertTrue(index.contains(prefetching.player))
+
+    def test_with_block_stops_the_prefetch_thread(self):
+        """with 文を抜けると先読みスレッドが止まることをテスト"""
+        with Game(seed=21) as game:
+            prefetcher = game.prefetcher
+            self.assertIsNotNone(prefetcher._executor)
+        self.assertIsNone(prefetcher._executor)
+        self.assertEqual(prefetcher._pending, {})
+
+
+if __name__ == "__main__":
+    main()
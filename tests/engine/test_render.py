@@ -0,0 +1,144 @@
+from unittest import TestCase, main
+
+import tcod
+
+from engine.render import Renderer
+from entity.entity import Entity, EntityType
+from map.game_map import GameMap
+from map.tile import Rectangle
+
+
+class TestRenderMap(TestCase):
+    def setUp(self):
+        """部屋と通路を持つマップと描画先コンソールを用意"""
+        self.game_map = GameMap(20, 10, 1)
+        room = Rectangle(1, 1, 5, 4)
+        self.game_map._create_room(room)
+        self.game_map._add_room(room)
+        self.game_map._create_h_tunnel(6, 12, 3)
+        self.console = tcod.console.Console(20, 12, order="F")
+        self.renderer = Renderer(self.console)
+
+    def _cell(self, x, y):
+        """マップ座標 (x, y) に描画された文字・前景色・背景色を返す"""
+        ch, fg, bg = self.console.rgb[x, y + 1]
+        return chr(ch), tuple(fg), tuple(bg)
+
+    def test_visible_and_explored_tiles(self):
+        """視界内と探索済みのタイルがそれぞれの色で描画されることをテスト"""
+        self.game_map.compute_fov(3, 3, 8)
+        self.game_map.explored[10, 3] = True
+        self.renderer._render_map(self.game_map)
+
+        self.assertEqual(self._cell(3, 3), (".", (192, 192, 192), (0, 0, 0)))
+        self.assertEqual(self._cell(1, 1), ("#", (255, 255, 255), (0, 0, 0)))
+        self.assertEqual(self._cell(10, 3), (".", (64, 64, 64), (0, 0, 0)))
+        self.game_map.explored[10, 2] = True
+        self.renderer._render_map(self.game_map)
+        self.assertEqual(self._cell(10, 2), ("#", (128, 128, 128), (0, 0, 0)))
+
+    def test_unexplored_tiles_are_left_untouched(self):
+        """未探索のタイルには何も描画されないことをテスト"""
+        self.console.clear()
+        self.game_map.compute_fov(3, 3, 8)
+        self.renderer._render_map(self.game_map)
+        self.assertEqual(self._cell(15, 8), (" ", (255, 255, 255), (0, 0, 0)))
+        # ステータスバーの行には描画しない
+        self.assertEqual(chr(self.console.rgb[3, 0]["ch"]), " ")
+
+    def test_background_layer_is_updated_not_rebuilt(self):
+        """同じマップでは背景レイヤーを作り直さず、新しく探索したタイルだけ追加することをテスト"""
+        self.game_map.compute_fov(3, 3, 8)
+        self.renderer._render_map(self.game_map)
+        background = self.renderer._background
+
+        # キャッシュ済みのタイルは描き直さない
+        background.rgb[2, 2] = (ord("X"), (1, 2, 3), (0, 0, 0))
+        self.game_map.compute_fov(10, 3, 8)
+        self.renderer._render_map(self.game_map)
+        self.assertIs(self.renderer._background, background)
+        self.assertEqual(self._cell(2, 2)[0], "X")
+        self.assertEqual(self._cell(10, 3), (".", (192, 192, 192), (0, 0, 0)))
+        self.assertEqual(chr(background.rgb[10, 3]["ch"]), ".")
+
+        self.renderer.drop_map_cache()
+        self.renderer._render_map(self.game_map)
+        self.assertIsNot(self.renderer._background, background)
+        self.assertEqual(self._cell(2, 2), (".", (64, 64, 64), (0, 0, 0)))
+
+
+class TestIncrementalRender(TestCase):
+    def setUp(self):
+        """同じ状態を全体描画と差分描画で描くための準備"""
+        self.game_map = GameMap(20, 10, 1)
+        room = Rectangle(1, 1, 5, 4)
+        self.game_map._create_room(room)
+        self.game_map._add_room(room)
+        self.game_map._create_h_tunnel(6, 12, 3)
+
+        self.player = Entity(
+            3, 3, "@", (255, 255, 255), "Player", EntityType.PLAYER, hp=10, max_hp=10
+        )
+        self.monster = Entity(
+            4, 2, "k", (0, 255, 0), "Kobold", EntityType.MONSTER, hp=3, max_hp=3
+        )
+        self.entities = self.game_map.create_entity_list([self.player, self.monster])
+        self.messages = ["Welcome"]
+
+        self.full = Renderer(tcod.console.Console(20, 12, order="F"))
+        self.incremental = Renderer(
+            tcod.console.Console(20, 12, order="F"), incremental=True
+        )
+
+    def _render(self):
+        """両方のレンダラーで描画し、結果が一致することを確認"""
+        self.game_map.compute_fov(self.player.x, self.player.y, 8)
+        for renderer in (self.full, self.incremental):
+            renderer.render_all(
+                self.entities, self.game_map, self.player, self.messages
+            )
+        self.assertTrue((self.full.console.rgb == self.incremental.console.rgb).all())
+        for renderer in (self.full, self.incremental):
+            renderer.clear_all(self.entities)
+
+    def test_matches_full_redraw(self):
+        """移動・FOV変化・ステータスとメッセージの変化で全体描画と一致することをテスト"""
+        self._render()
+        index = self.game_map.spatial_index
+        for _ in range(6):
+            index.move(self.player, self.player.x + 1, self.player.y)
+            self._render()
+        self.player.hp -= 3
+        self.messages.append("The kobold hits!")
+        self.entities.remove(self.monster)
+        self._render()
+
+    def test_redraws_only_changed_cells(self):
+        """変化のないフレームでは何も描き直さないことをテスト"""
+        self._render()
+        console = self.incremental.console
+        console.rgb[15, 8] = (ord("X"), (1, 2, 3), (4, 5, 6))
+        self.incremental.render_all(
+            self.entities, self.game_map, self.player, self.messages
+        )
+        self.assertEqual(chr(console.rgb[15, 8]["ch"]), "X")
+
+        # invalidate 後は全体を描き直す
+        self.incremental.invalidate()
+        self.incremental.render_all(
+            self.entities, self.game_map, self.player, self.messages
+        )
+        self.assertEqual(chr(console.rgb[15, 8]["ch"]), " ")
+
+    def test_new_map_is_fully_redrawn(self):
+        """マップが入れ替わった場合は全体を描き直すことをテスト"""
+        self._render()
+        self.game_map = GameMap(20, 10, 2)
+        self.entities = self.game_map.create_entity_list()
+        self.player.x, self.player.y = 0, 0
+        self.entities.append(self.player)
+        self._render()
+
+
+if __name__ == "__main__":
+    main()
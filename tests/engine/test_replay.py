@@ -0,0 +1,136 @@
+import os
+import random
+import tempfile
+from unittest import TestCase, main
+
+from config.messages import MESSAGES
+from engine.game import Game
+from engine.replay import (
+    ReplayFormatError,
+    ReplayPlayer,
+    decode_ops,
+    encode_action,
+)
+
+_ACTIONS = [
+    ("move", 1, 0),
+    ("move", -1, -1),
+    ("move", 2, -3),
+    ("pickup",),
+    ("use", 3),
+    ("drop", 0),
+    ("descend",),
+    ("ascend",),
+    ("wait",),
+    ("quit",),
+]
+
+
+def _state(game):
+    return (
+        (game.player.x, game.player.y, game.player.hp, game.player.xp),
+        game.player.dungeon_level,
+        [(e.name, e.x, e.y, e.hp) for e in game.entities],
+        game.game_map.explored.tobytes(),
+        game.rng.getstate(),
+        list(game.messages),
+        game.turn,
+    )
+
+
+def _record(path, turns, seed=30):
+    """記録しながらランダムに移動し、終了時のゲームを返す"""
+    game = Game(seed=seed, prefetch_levels=False, record_path=path)
+    rng = random.Random(seed)
+    moves = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+    for _ in range(turns):
+        if game.step(("move",) + rng.choice(moves)).done:
+            break
+    game.close()
+    return game
+
+
+def _record_death(path, min_turns=0, turns=300):
+    """min_turns ターンより後に死亡するまでシードを変えて記録し、そのゲームを返す"""
+    for seed in range(100):
+        game = _record(path, turns, seed)
+        if game.player.hp <= 0 and game.turn > min_turns:
+            return game
+    raise AssertionError("no recorded game ended in death")
+
+
+class TestReplayFormat(TestCase):
+    def test_actions_round_trip(self):
+        """すべての行動が符号化・復号で元に戻ることをテスト"""
+        data = b"".join(encode_action(action) for action in _ACTIONS) + b"\0"
+        decoded = [action for _, action in decode_ops(data)]
+        self.assertEqual(decoded, _ACTIONS + [None])
+        # 1マスの移動は1バイト
+        self.assertEqual(len(encode_action(("move", 0, 1))), 1)
+
+    def test_truncated_last_op_is_ignored(self):
+        """途中で切れた最後の命令は無視されることをテスト"""
+        data = encode_action(("wait",)) + encode_action(("move", 5, 5))[:2]
+        self.assertEqual([a for _, a in decode_ops(data)], [("wait",)])
+
+    def test_rejects_unknown_actions_and_files(self):
+        """未知の行動や別形式のファイルを拒否することをテスト"""
+        with self.assertRaises(ValueError):
+            encode_action(("dance",))
+        with self.assertRaises(ReplayFormatError):
+            list(decode_ops(b"\xff"))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bad.replay")
+            with open(path, "wb") as f:
+                f.write(b"not a replay file at all")
+            with self.assertRaises(ReplayFormatError):
+                ReplayPlayer(path)
+
+
+class TestReplayPlayer(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "game.replay")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_reproduces_the_game(self):
+        """記録したゲームを再生すると同じ状態になることをテスト"""
+        recorded = _record(self.path, 150)
+        player = ReplayPlayer(self.path)
+        self.assertEqual(player.seed, recorded.rng.seed)
+        replayed = player.play()
+        self.assertTrue(player.finished)
+        self.assertEqual(_state(replayed), _state(recorded))
+
+    def test_replay_reproduces_the_death(self):
+        """プレイヤーが死亡したゲームも死亡メッセージまで同じに再生されることをテスト"""
+        recorded = _record_death(self.path)
+        self.assertEqual(recorded.messages[-1], MESSAGES["death"])
+        player = ReplayPlayer(self.path)
+        replayed = player.play()
+        self.assertTrue(player.finished)
+        self.assertEqual(_state(replayed), _state(recorded))
+
+    def test_seek_uses_checkpoints(self):
+        """チェックポイントからのシークが先頭からの再生と一致することをテスト"""
+        recorded = _record_death(self.path, min_turns=60)
+        expected = _state(ReplayPlayer(self.path).play(until_turn=60))
+
+        checkpoint_dir = os.path.join(self.tmp.name, "checkpoints")
+        player = ReplayPlayer(self.path, 25, checkpoint_dir)
+        player.play()
+        self.assertTrue({25, 50}.issubset(player.checkpoints))
+
+        # 別のプレイヤーも保存済みのチェックポイントを使える
+        seeker = ReplayPlayer(self.path, 25, checkpoint_dir)
+        self.assertEqual(_state(seeker.seek(60)), expected)
+        self.assertEqual(seeker.turn, 60)
+        self.assertEqual(_state(seeker.seek(30)), _state(player.seek(30)))
+        # 最後より先へのシークは死亡した最終状態で止まる
+        self.assertEqual(_state(seeker.seek(1000)), _state(recorded))
+
+
+if __name__ == "__main__":
+    main()
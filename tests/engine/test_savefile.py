@@ -0,0 +1,100 @@
+import os
+import tempfile
+from unittest import TestCase, main
+
+from engine.game import Game
+from engine.savefile import ALIGNMENT, SaveFormatError, _read_header
+from entity.entity import EntityType
+
+_MOVES = [(1, 0), (0, 1), (-1, 0), (0, -1)] * 10
+
+
+def _state(game):
+    player = game.player
+    return (
+        (player.x, player.y, player.hp, player.xp, player.gold, player.strength),
+        player.dungeon_level,
+        [(e.name, e.count, e.damage_dice, e.effect) for e in player.inventory],
+        [(e.name, e.char, e.x, e.y, e.hp, e.move_count) for e in game.entities],
+        game.game_map.walkable.tobytes(),
+        game.game_map.explored.tobytes(),
+        game.game_map.visible.tobytes(),
+        list(game.messages),
+        game.turn,
+        game.rng.getstate(),
+    )
+
+
+class TestSaveFile(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "game.sav")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_plays_on_identically(self):
+        """保存して読み込んだゲームが元のゲームと同じように進むことをテスト"""
+        game = Game(seed=8, prefetch_levels=False)
+        self.addCleanup(game.close)
+        for dx, dy in _MOVES[:20]:
+            game.step(("move", dx, dy))
+        game.save(self.path)
+
+        loaded = Game.load(self.path, prefetch_levels=False)
+        self.addCleanup(loaded.close)
+        self.assertIs(Game.instance, loaded)
+        self.assertIs(loaded.entities[0], loaded.player)
+        self.assertEqual(_state(loaded), _state(game))
+
+        for dx, dy in _MOVES[20:]:
+            expected = game.step(("move", dx, dy))
+            self.assertEqual(loaded.step(("move", dx, dy)), expected)
+        self.assertEqual(_state(loaded), _state(game))
+
+    def test_visited_levels_are_saved(self):
+        """訪問済みの階層も保存され、戻ったときに復元されることをテスト"""
+        game = Game(seed=8, prefetch_levels=False)
+        self.addCleanup(game.close)
+        for level in (2, 3):
+            game._change_level(level)
+        game.save(self.path)
+        loaded = Game.load(self.path, prefetch_levels=False)
+        self.addCleanup(loaded.close)
+        self.assertEqual(sorted(loaded.level_cache.resident_levels), [1, 2])
+
+        for current in (game, loaded):
+            Game.instance = current
+            current._change_level(2)
+        self.assertEqual(_state(loaded), _state(game))
+        types = [e.entity_type for e in loaded.entities]
+        self.assertIn(EntityType.STAIRS_UP, types)
+
+    def test_buffers_are_aligned(self):
+        """配列データが ALIGNMENT バイト境界から始まることをテスト"""
+        with Game(seed=8, prefetch_levels=False) as game:
+            game.save(self.path)
+        meta, data_offset = _read_header(self.path)
+        self.assertEqual(data_offset % ALIGNMENT, 0)
+        for level in meta["levels"]:
+            for name in ("walkable", "transparent", "explored", "entities"):
+                self.assertEqual(level[name] % ALIGNMENT, 0)
+
+    def test_rejects_other_files(self):
+        """セーブファイル以外や別バージョンのファイルを拒否することをテスト"""
+        with open(self.path, "wb") as f:
+            f.write(b"not a save file")
+        with self.assertRaises(SaveFormatError):
+            Game.load(self.path)
+
+        with Game(seed=8, prefetch_levels=False) as game:
+            game.save(self.path)
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write((99).to_bytes(4, "little"))
+        with self.assertRaises(SaveFormatError):
+            Game.load(self.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+from unittest import TestCase, main
+
+from entity.entity import Entity, EntityType
+
+
+class TestEntityComponents(TestCase):
+    def test_entity_is_slotted(self):
+        """エンティティがインスタンス辞書を持たないことをテスト"""
+        gold = Entity(
+            1,
+            2,
+            "$",
+            (255, 215, 0),
+            "10 Gold",
+            EntityType.GOLD,
+            blocks=False,
+            gold_amount=10,
+        )
+        self.assertFalse(hasattr(gold, "__dict__"))
+        with self.assertRaises(AttributeError):
+            gold.unknown_attribute = 1
+
+    def test_components_created_only_when_needed(self):
+        """必要なコンポーネントだけが作成されることをテスト"""
+        gold = Entity(
+            1,
+            2,
+            "$",
+            (255, 215, 0),
+            "10 Gold",
+            EntityType.GOLD,
+            blocks=False,
+            gold_amount=10,
+        )
+        self.assertIsNone(gold.combat)
+        self.assertIsNone(gold.stack)
+        self.assertEqual(gold.gold_amount, 10)
+        self.assertIsNone(gold.hp)
+        self.assertEqual(gold.count, 1)
+
+        monster = Entity(
+            0, 0, "B", (1, 2, 3), "Bat", EntityType.MONSTER, hp=4, max_hp=4, speed=2.0
+        )
+        self.assertIsNone(monster.item)
+        self.assertEqual(monster.speed, 2.0)
+        self.assertEqual(monster.inventory, [])
+
+        stairs = Entity(
+            0, 0, ">", (255, 255, 255), "Stairs", EntityType.STAIRS_DOWN, blocks=False
+        )
+        self.assertIsNone(stairs.combat)
+        self.assertIsNone(stairs.item)
+        self.assertIsNone(stairs.stack)
+
+    def test_setting_value_creates_component(self):
+        """既定値以外を代入するとコンポーネントが作成されることをテスト"""
+        stairs = Entity(
+            0, 0, ">", (255, 255, 255), "Stairs", EntityType.STAIRS_DOWN, blocks=False
+        )
+        stairs.confused_turns = 0
+        self.assertIsNone(stairs.combat)
+        stairs.defense = 2
+        self.assertEqual(stairs.item.defense, 2)
+
+    def test_strength_routing(self):
+        """筋力が生物では戦闘値、指輪では補正値として扱われることをテスト"""
+        player = Entity(
+            0,
+            0,
+            "@",
+            (255, 255, 255),
+            "Player",
+            EntityType.PLAYER,
+            hp=12,
+            max_hp=12,
+            strength=16,
+        )
+        ring = Entity(
+            0,
+            0,
+            "=",
+            (255, 0, 0),
+            "Ring of Strength",
+            EntityType.RING,
+            blocks=False,
+            strength=1,
+        )
+        self.assertEqual(player.strength, 16)
+        self.assertIsNone(player.item)
+        self.assertEqual(ring.strength, 1)
+        self.assertIsNone(ring.combat)
+
+    def test_split_stack(self):
+        """スタックの分割で個数が正しく分かれることをテスト"""
+        arrows = Entity(
+            0,
+            0,
+            "]",
+            (139, 69, 19),
+            "Arrow",
+            EntityType.AMMO,
+            blocks=False,
+            ammo_type="arrow",
+            stack_size=20,
+            count=12,
+        )
+        part = arrows.split_stack(5)
+        self.assertEqual((arrows.count, part.count), (7, 5))
+        self.assertTrue(arrows.can_stack_with(part))
+
+
+if __name__ == "__main__":
+    main()
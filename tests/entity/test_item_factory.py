@@ -0,0 +1,65 @@
+import random
+from unittest import TestCase, main
+
+from config.items import ARMORS, ITEM_CHANCES, RANGED_WEAPONS
+from entity.entity import EntityType
+from entity.item_factory import ITEM_FACTORY, ItemFactory
+from entity.prototype import EntityPrototype
+
+
+class TestItemFactory(TestCase):
+    def test_every_category_is_covered(self):
+        """ITEM_CHANCES のすべてのカテゴリから最深部でアイテムが作れることをテスト"""
+        rng = random.Random(0)
+        for category in ITEM_CHANCES:
+            item = ITEM_FACTORY.create(category, 1, 2, 26, rng)
+            self.assertIsNotNone(item, category)
+            self.assertEqual((item.x, item.y), (1, 2))
+            self.assertFalse(item.blocks)
+
+    def test_items_follow_config_tables(self):
+        """作られたアイテムが設定の表の値を持つことをテスト"""
+        potion = ITEM_FACTORY.create("healing_potion", 0, 0, 1)
+        self.assertEqual(potion.name, "Potion of Healing")
+        self.assertEqual((potion.effect, potion.effect_amount), ("heal", 15))
+
+        bow = ITEM_FACTORY.create("ranged_weapon", 0, 0, 1)
+        self.assertEqual(bow.entity_type, EntityType.RANGED)
+        self.assertEqual(bow.damage_dice, RANGED_WEAPONS[bow.name]["damage"])
+        self.assertTrue(bow.ranged)
+
+        armor = ITEM_FACTORY.create("armor", 0, 0, 26, random.Random(1))
+        self.assertEqual(armor.defense, ARMORS[armor.name]["defense"])
+
+    def test_level_ranges_are_respected(self):
+        """出現階層の範囲外のアイテムは作られないことをテスト"""
+        self.assertIsNone(ITEM_FACTORY.create("rare_weapon", 0, 0, 1))
+        names = {p.name for p in ITEM_FACTORY.prototypes("ranged_weapon", 1)}
+        self.assertEqual(names, {"Short Bow"})
+
+    def test_clones_do_not_share_state(self):
+        """複製したアイテムが互いの状態を共有しないことをテスト"""
+        first = ITEM_FACTORY.create("arrow", 0, 0, 1)
+        second = ITEM_FACTORY.create("arrow", 0, 0, 1)
+        first.count = 5
+        first.damage_dice = (9, 9)
+        self.assertEqual(second.count, 1)
+        self.assertEqual(second.damage_dice, (1, 2))
+
+    def test_register_replaces_a_category(self):
+        """カテゴリを登録し直すと新しいプロトタイプが使われることをテスト"""
+        factory = ItemFactory()
+        snack = EntityPrototype(
+            "%", (0, 255, 0), "Snack", EntityType.FOOD, levels=(1, 1), nutrition=50
+        )
+        factory.register("snack", [snack])
+        self.assertEqual(factory.create("snack", 0, 0, 1).name, "Snack")
+        self.assertIsNone(factory.create("snack", 0, 0, 2))
+        factory.register("snack", [])
+        self.assertIsNone(factory.create("snack", 0, 0, 1))
+        with self.assertRaises(KeyError):
+            factory.create("unknown", 0, 0, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from unittest import TestCase, main
+
+import numpy as np
+
+from entity.entity import Entity, EntityType
+from entity.monster_store import MonsterStore
+
+
+def _monster(x, y, hp=5, speed=1.0, regeneration=False):
+    return Entity(
+        x,
+        y,
+        "T",
+        (0, 255, 0),
+        "Troll",
+        EntityType.MONSTER,
+        hp=hp,
+        max_hp=8,
+        power=(1, 8),
+        speed=speed,
+        regeneration=regeneration,
+        sight_radius=6,
+    )
+
+
+class TestMonsterStore(TestCase):
+    def test_attached_entity_reads_and_writes_arrays(self):
+        """格納中のエンティティが配列を読み書きすることをテスト"""
+        store = MonsterStore()
+        monster = _monster(3, 4)
+        self.assertTrue(store.attach(monster))
+
+        monster.hp -= 2
+        monster.x = 7
+        self.assertEqual(store.hp[monster._slot], 3)
+        self.assertEqual(store.x[monster._slot], 7)
+
+        store.y[monster._slot] = 9
+        self.assertEqual(monster.y, 9)
+        self.assertIsInstance(monster.y, int)
+
+    def test_detach_restores_values(self):
+        """取り外したエンティティに値が書き戻されることをテスト"""
+        store = MonsterStore()
+        monster = _monster(3, 4)
+        store.attach(monster)
+        monster.confused_turns = 2
+        store.detach(monster)
+
+        self.assertIsNone(monster._store)
+        self.assertEqual(monster.confused_turns, 2)
+        self.assertEqual(len(store), 0)
+
+    def test_grows_past_capacity(self):
+        """容量を超えても格納できることをテスト"""
+        store = MonsterStore(capacity=2)
+        monsters = [_monster(i, i) for i in range(5)]
+        for monster in monsters:
+            store.attach(monster)
+        self.assertEqual(len(store), 5)
+        self.assertEqual([m.x for m in monsters], list(range(5)))
+
+    def test_batched_operations(self):
+        """距離・速度・再生の一括処理をテスト"""
+        store = MonsterStore()
+        slow = _monster(0, 0, speed=0.5)
+        fast = _monster(3, 4, hp=7, speed=1.5, regeneration=True)
+        for monster in (slow, fast):
+            store.attach(monster)
+        slots = store.slots_of([slow, fast])
+
+        dx, dy, distances = store.offsets_to(0, 0, slots)
+        np.testing.assert_allclose(distances, [0.0, 5.0])
+        self.assertEqual((dx.tolist(), dy.tolist()), ([0.0, -3.0], [0.0, -4.0]))
+        self.assertEqual(store.accumulate_speed(slots).tolist(), [False, True])
+        self.assertEqual((slow.move_count, fast.move_count), (0.5, 1.5))
+
+        store.regenerate(slots)
+        store.regenerate(slots)
+        self.assertEqual((slow.hp, fast.hp), (5, 8))
+
+
+if __name__ == "__main__":
+    main()
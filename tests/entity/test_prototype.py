@@ -0,0 +1,75 @@
+import pickle
+from unittest import TestCase, main
+
+from config.monsters import MONSTERS
+from entity.entity import EntityType
+from entity.prototype import MONSTER_PROTOTYPES, EntityPrototype
+
+
+def _ring():
+    return EntityPrototype(
+        "=", (255, 0, 0), "Ring of Strength", EntityType.RING, strength=1
+    )
+
+
+class TestEntityPrototype(TestCase):
+    def test_items_share_components_until_written(self):
+        """同じ種類のアイテムは書き込むまで部品を共有することをテスト"""
+        prototype = EntityPrototype(
+            "]",
+            (139, 69, 19),
+            "Arrow",
+            EntityType.AMMO,
+            damage_dice=(1, 2),
+            stack_size=20,
+        )
+        first, second = prototype.create(1, 1), prototype.create(2, 2)
+        self.assertIs(first.prototype, prototype)
+        self.assertIs(first.item, second.item)
+        self.assertIs(first.stack, prototype.stack)
+
+        first.count = 7
+        self.assertIsNot(first.stack, prototype.stack)
+        self.assertEqual((first.count, second.count, prototype.stack.count), (7, 1, 1))
+        # 書き込んでいない部品は共有したまま
+        self.assertIs(first.item, second.item)
+
+    def test_strength_setter_copies_on_write(self):
+        """指輪の筋力補正の書き換えがプロトタイプに影響しないことをテスト"""
+        prototype = _ring()
+        ring = prototype.create(0, 0)
+        ring.strength = 3
+        self.assertEqual(ring.strength, 3)
+        self.assertEqual(prototype.item.strength, 1)
+        self.assertEqual(prototype.create(0, 0).strength, 1)
+
+    def test_prototypes_are_read_only(self):
+        """プロトタイプの属性は書き換えられないことをテスト"""
+        with self.assertRaises(AttributeError):
+            _ring().name = "Ring of Weakness"
+
+    def test_monsters_own_their_creature_stats(self):
+        """モンスターは自分の戦闘ステータスとインベントリを持つことをテスト"""
+        prototype = MONSTER_PROTOTYPES["Bat"]
+        bat = prototype.create(3, 4, hp=5, max_hp=6)
+        other = prototype.create(5, 5, hp=1, max_hp=1)
+        self.assertEqual((bat.x, bat.y, bat.hp, bat.max_hp), (3, 4, 5, 6))
+        self.assertEqual(bat.power, MONSTERS["Bat"]["damage"])
+        self.assertEqual(bat.speed, MONSTERS["Bat"]["speed"])
+        self.assertTrue(bat.blocks)
+        self.assertIsNot(bat.combat, other.combat)
+        self.assertIsNot(bat.inventory, other.inventory)
+        self.assertEqual(prototype.levels, (1, MONSTERS["Bat"]["max_level"]))
+
+    def test_pickling_keeps_sharing(self):
+        """pickle で復元しても部品の共有が保たれることをテスト"""
+        prototype = _ring()
+        rings = pickle.loads(pickle.dumps([prototype.create(0, 0) for _ in range(2)]))
+        self.assertIs(rings[0].item, rings[1].item)
+        self.assertIs(rings[0].item, rings[0].prototype.item)
+        rings[0].strength = 2
+        self.assertEqual(rings[1].strength, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+from unittest import TestCase, main
+
+from map.game_map import TILE_LAYERS, GameMap, UNREACHABLE
+from map.tile import Rectangle
+
+
+class TestGameMapTiles(TestCase):
+    def setUp(self):
+        """テスト用の小さなマップを用意"""
+        self.game_map = GameMap(20, 10, 1)
+
+    def test_initial_tiles_are_walls(self):
+        """初期状態ではすべてのタイルが壁であることをテスト"""
+        self.assertFalse(self.game_map.walkable.any())
+        self.assertFalse(self.game_map.transparent.any())
+        self.assertFalse(self.game_map.tiles[3][4].walkable)
+
+    def test_create_room_carves_interior(self):
+        """部屋の内側だけが掘られることをテスト"""
+        room = Rectangle(2, 2, 4, 3)
+        self.game_map._create_room(room)
+        self.assertEqual(int(self.game_map.walkable.sum()), 3 * 2)
+        self.assertTrue(self.game_map.tiles[3][3].walkable)
+        self.assertTrue(self.game_map.tiles[3][3].transparent)
+        self.assertFalse(self.game_map.tiles[2][2].walkable)
+
+    def test_tunnels_are_inclusive(self):
+        """通路が両端を含めて掘られることをテスト"""
+        self.game_map._create_h_tunnel(5, 1, 2)
+        self.game_map._create_v_tunnel(7, 3, 8)
+        self.assertTrue(self.game_map.walkable[1:6, 2].all())
+        self.assertTrue(self.game_map.walkable[8, 3:8].all())
+        self.assertEqual(int(self.game_map.walkable.sum()), 5 + 5)
+
+    def test_tile_view_writes_through(self):
+        """tiles[x][y] への代入が配列に反映されることをテスト"""
+        self.game_map.tiles[4][5].walkable = True
+        self.assertTrue(self.game_map.walkable[4, 5])
+        self.assertFalse(self.game_map.transparent[4, 5])
+
+    def test_tile_grid_iterates_like_nested_lists(self):
+        """tiles をリストのリストと同じように走査できることをテスト"""
+        self.game_map._create_room(Rectangle(2, 2, 4, 3))
+        columns = list(self.game_map.tiles)
+        self.assertEqual(len(columns), 20)
+        self.assertTrue(all(len(list(column)) == 10 for column in columns))
+        walkable = sum(tile.walkable for column in columns for tile in column)
+        self.assertEqual(walkable, 3 * 2)
+        with self.assertRaises(IndexError):
+            self.game_map.tiles[20]
+        with self.assertRaises(IndexError):
+            self.game_map.tiles[0][10]
+
+    def test_layer_views_are_live_and_read_only(self):
+        """層のビューが現在の状態を映し、書き込めないことをテスト"""
+        layers = self.game_map.tile_layers
+        self.assertEqual(layers.shape, (len(TILE_LAYERS), 20, 10))
+        self.game_map._create_room(Rectangle(2, 2, 4, 3))
+        self.game_map.explored[3, 3] = True
+        self.assertTrue(layers[TILE_LAYERS.index("walkable"), 3, 3])
+        self.assertTrue(layers[TILE_LAYERS.index("explored"), 3, 3])
+        self.assertIs(self.game_map.tile_layers, layers)
+        with self.assertRaises(ValueError):
+            layers[0, 0, 0] = True
+        with self.assertRaises(ValueError):
+            self.game_map.entity_glyphs[0, 0] = 1
+
+
+class TestRoomLookup(TestCase):
+    def test_room_at_uses_interior(self):
+        """部屋の内側だけが部屋として扱われることをテスト"""
+        game_map = GameMap(30, 20, 1)
+        rooms = [Rectangle(1, 1, 5, 5), Rectangle(10, 3, 6, 4)]
+        for room in rooms:
+            game_map._create_room(room)
+            game_map._add_room(room)
+
+        self.assertIs(game_map.room_at(3, 3), rooms[0])
+        self.assertIs(game_map.room_at(12, 5), rooms[1])
+        self.assertIsNone(game_map.room_at(1, 3))  # 壁
+        self.assertIsNone(game_map.room_at(8, 3))  # 部屋の外
+        self.assertIsNone(game_map.room_at(-1, 3))
+        self.assertEqual(game_map.room_ids[12, 5], 1)
+
+
+class TestComputeFov(TestCase):
+    def setUp(self):
+        """部屋と通路を持つマップを用意"""
+        self.game_map = GameMap(30, 20, 1)
+        self.room = Rectangle(2, 2, 6, 5)
+        self.game_map._create_room(self.room)
+        self.game_map._add_room(self.room)
+        self.game_map._create_h_tunnel(7, 20, 4)
+
+    def test_room_is_fully_visible(self):
+        """部屋の中では部屋全体と出入口が見えることをテスト"""
+        self.game_map.compute_fov(4, 4, 8)
+        self.assertTrue(self.game_map.visible[2:9, 2:8].all())
+        self.assertTrue(self.game_map.visible[9, 4])  # 通路の入口
+        self.assertFalse(self.game_map.visible[9, 3])
+        self.assertFalse(self.game_map.visible[12, 4])
+        self.assertTrue((self.game_map.explored == self.game_map.visible).all())
+
+    def test_corridor_shows_neighbors(self):
+        """通路では自分と上下左右だけが見えることをテスト"""
+        self.game_map.compute_fov(4, 4, 8)
+        self.game_map.compute_fov(15, 4, 8)
+        visible = {tuple(p) for p in zip(*self.game_map.visible.nonzero())}
+        self.assertEqual(visible, {(15, 4), (14, 4), (16, 4), (15, 3), (15, 5)})
+        # 以前見た部屋は探索済みのまま残る
+        self.assertTrue(self.game_map.explored[2:9, 2:8].all())
+
+
+class TestDistanceMap(TestCase):
+    def setUp(self):
+        """L字の通路でつながった2つの部屋を用意"""
+        self.game_map = GameMap(30, 20, 1)
+        self.game_map._create_room(Rectangle(1, 1, 5, 5))  # 内側 (2..5, 2..5)
+        self.game_map._create_room(Rectangle(15, 10, 5, 5))  # 内側 (16..19, 11..14)
+        self.game_map._create_h_tunnel(5, 10, 3)
+        self.game_map._create_v_tunnel(3, 12, 10)
+        self.game_map._create_h_tunnel(10, 16, 12)
+
+    def test_distances_follow_corridors(self):
+        """距離が壁を回り込んだ歩数になることをテスト"""
+        distance = self.game_map.distance_map(17, 12)
+        self.assertEqual(distance[17, 12], 0)
+        self.assertEqual(distance[10, 12], 7)
+        self.assertEqual(distance[10, 3], 15)
+        self.assertEqual(distance[0, 0], UNREACHABLE)
+
+    def test_map_is_cached_until_target_moves_or_map_changes(self):
+        """目標が同じなら再計算せず、移動や掘削で再計算することをテスト"""
+        first = self.game_map.distance_map(17, 12)
+        self.assertIs(self.game_map.distance_map(17, 12), first)
+        self.assertIsNot(self.game_map.distance_map(18, 12), first)
+
+        moved = self.game_map.distance_map(18, 12)
+        self.game_map._create_h_tunnel(20, 25, 12)
+        self.assertIsNot(self.game_map.distance_map(18, 12), moved)
+
+    def test_next_step_goes_around_corners(self):
+        """直進できない角では通路に沿って進むことをテスト"""
+        distance = self.game_map.distance_map(17, 12)
+        # 通路の角 (10, 3) から目標は右下だが、進めるのは下だけ
+        self.assertEqual(self.game_map.next_step(10, 3, distance, (1, 1)), (0, 1))
+
+    def test_next_step_prefers_given_direction_on_ties(self):
+        """同じ距離の候補では指定の方向を優先することをテスト"""
+        distance = self.game_map.distance_map(5, 5)
+        self.assertEqual(self.game_map.next_step(2, 3, distance, (1, 0)), (1, 0))
+        self.assertEqual(self.game_map.next_step(2, 3, distance, (1, 1)), (1, 1))
+
+    def test_next_step_waits_when_blocked(self):
+        """近づけるマスがすべて塞がっていれば待機することをテスト"""
+        distance = self.game_map.distance_map(17, 12)
+        self.game_map.spatial_index.blocked[10, 4] = True
+        self.assertEqual(self.game_map.next_step(10, 3, distance, (1, 1)), (0, 0))
+
+    def test_next_step_falls_back_when_unreachable(self):
+        """目標に到達できない場合は指定の方向を返すことをテスト"""
+        distance = self.game_map.distance_map(17, 12)
+        self.assertEqual(self.game_map.next_step(25, 2, distance, (-1, 1)), (-1, 1))
+
+
+if __name__ == "__main__":
+    main()
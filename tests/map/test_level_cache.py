@@ -0,0 +1,135 @@
+import os
+import random
+import tempfile
+from unittest import TestCase, main
+
+from engine.game import Game
+from entity.entity import Entity, EntityType
+from map.game_map import GameMap
+from map.level_cache import LevelCache, LevelSnapshot
+
+
+def _make_level(dungeon_level, seed=1):
+    player = Entity(0, 0, "@", (255, 255, 255), "Player", EntityType.PLAYER)
+    game_map = GameMap(80, 45, dungeon_level, rng=random.Random(seed))
+    entities = game_map.create_entity_list([player])
+    game_map.make_map(player, entities)
+    entities.remove(player)
+    return game_map, entities
+
+
+def _level_state(game_map, entities):
+    return (
+        game_map.walkable.tobytes(),
+        game_map.transparent.tobytes(),
+        game_map.explored.tobytes(),
+        game_map.room_ids.tobytes(),
+        [(e.name, e.x, e.y, e.hp) for e in entities],
+    )
+
+
+def _take_stairs(game, stairs_type):
+    """プレイヤーの位置に階段を置いて上り下りする"""
+    char = ">" if stairs_type == EntityType.STAIRS_DOWN else "<"
+    player = game.player
+    stairs = Entity(
+        player.x, player.y, char, (255, 255, 255), "Stairs", stairs_type, blocks=False
+    )
+    game.entities.append(stairs)
+    action = "descend" if stairs_type == EntityType.STAIRS_DOWN else "ascend"
+    return game.step((action,))
+
+
+class TestLevelSnapshot(TestCase):
+    def test_restore_round_trip(self):
+        """スナップショットから同じ階層が復元されることをテスト"""
+        game_map, entities = _make_level(3)
+        game_map.explored[10:20, 5:9] = True
+        # モンスターのHPはストアに保持されている
+        monster = next(e for e in entities if e.entity_type == EntityType.MONSTER)
+        monster.hp = 1
+        expected = _level_state(game_map, entities)
+
+        snapshot = LevelSnapshot.capture(game_map, entities)
+        self.assertEqual(len(entities), 0)
+        restored_map, restored = snapshot.restore()
+        self.assertEqual(_level_state(restored_map, restored), expected)
+        self.assertFalse(restored_map.visible.any())
+        for entity in restored:
+            self.assertTrue(restored_map.spatial_index.contains(entity))
+
+
+class TestLevelCache(TestCase):
+    def test_lru_levels_are_dropped_without_spill_dir(self):
+        """保持数を超えると最も古い階層が破棄されることをテスト"""
+        cache = LevelCache(max_resident=2)
+        for level in (1, 2, 3):
+            cache.store(*_make_level(level))
+        self.assertNotIn(1, cache)
+        self.assertEqual(cache.resident_levels, [2, 3])
+        self.assertIsNone(cache.load(1))
+        self.assertEqual(cache.load(2).dungeon_level, 2)
+        self.assertNotIn(2, cache)
+
+    def test_lru_levels_are_spilled_to_disk(self):
+        """保持数を超えた階層がディスクに書き出され、読み戻せることをテスト"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LevelCache(max_resident=1, spill_dir=tmp)
+            game_map, entities = _make_level(1)
+            expected = _level_state(game_map, entities)
+            cache.store(game_map, entities)
+            cache.store(*_make_level(2))
+            self.assertEqual(cache.resident_levels, [2])
+            self.assertIn(1, cache)
+            self.assertEqual(len(os.listdir(tmp)), 1)
+
+            self.assertEqual(_level_state(*cache.load(1).restore()), expected)
+            self.assertEqual(os.listdir(tmp), [])
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+
+
+class TestGameLevelCache(TestCase):
+    def test_levels_below_the_first_have_up_stairs(self):
+        """2階以降は到着地点に上り階段があることをテスト"""
+        game = Game(seed=4, prefetch_levels=False)
+        self.addCleanup(game.close)
+        _take_stairs(game, EntityType.STAIRS_DOWN)
+        index = game.game_map.spatial_index
+        types = [e.entity_type for e in index.items_at(game.player.x, game.player.y)]
+        self.assertIn(EntityType.STAIRS_UP, types)
+
+    def test_revisited_levels_are_restored(self):
+        """上り下りで戻った階層が再生成されずに復元されることをテスト"""
+        game = Game(seed=4)
+        self.addCleanup(game.close)
+        _take_stairs(game, EntityType.STAIRS_DOWN)
+        level1 = game.level_cache._resident[1]
+        self.assertNotIn(game.player, level1.entities)
+        down_stairs = next(
+            e for e in level1.entities if e.entity_type == EntityType.STAIRS_DOWN
+        )
+        level1_walkable = level1.walkable
+
+        game.step(("wait",))
+        level2_walkable = game.game_map.walkable.tobytes()
+        up_stairs = next(
+            e for e in game.entities if e.entity_type == EntityType.STAIRS_UP
+        )
+
+        game.game_map.spatial_index.move(game.player, up_stairs.x, up_stairs.y)
+        game.step(("ascend",))
+        self.assertEqual(game.player.dungeon_level, 1)
+        self.assertIn(down_stairs, game.entities)
+        self.assertEqual((game.player.x, game.player.y), (down_stairs.x, down_stairs.y))
+        self.assertIs(game.entities[0], game.player)
+
+        game.step(("descend",))
+        self.assertEqual(game.player.dungeon_level, 2)
+        self.assertEqual(game.game_map.walkable.tobytes(), level2_walkable)
+        self.assertEqual((game.player.x, game.player.y), (up_stairs.x, up_stairs.y))
+        self.assertEqual(game.level_cache._resident[1].walkable, level1_walkable)
+
+
+if __name__ == "__main__":
+    main()
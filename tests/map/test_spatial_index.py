@@ -0,0 +1,129 @@
+from unittest import TestCase, main
+
+from entity.entity import Entity, EntityType
+from map.spatial_index import EntityList, SpatialIndex, kind_mask
+
+
+def _monster(x, y):
+    return Entity(x, y, "B", (255, 255, 255), "Bat", EntityType.MONSTER, hp=3, max_hp=3)
+
+
+def _gold(x, y):
+    return Entity(x, y, "$", (255, 215, 0), "10 Gold", EntityType.GOLD, blocks=False)
+
+
+class TestSpatialIndex(TestCase):
+    def setUp(self):
+        """索引とそれに結び付いたエンティティリストを用意"""
+        self.index = SpatialIndex(10, 10)
+        self.entities = EntityList(self.index)
+
+    def test_append_and_remove_update_index(self):
+        """追加・削除で索引が更新されることをテスト"""
+        monster = _monster(2, 3)
+        gold = _gold(2, 3)
+        self.entities.append(monster)
+        self.entities.append(gold)
+
+        self.assertIs(self.index.blocking_entity_at(2, 3), monster)
+        self.assertTrue(self.index.blocked[2, 3])
+        self.assertEqual(self.index.items_at(2, 3), [gold])
+
+        self.entities.remove(monster)
+        self.entities.remove(gold)
+        self.assertIsNone(self.index.blocking_entity_at(2, 3))
+        self.assertFalse(self.index.blocked[2, 3])
+        self.assertFalse(self.index.is_occupied(2, 3))
+
+    def test_move_updates_cells(self):
+        """移動で古いマスが空き、新しいマスが埋まることをテスト"""
+        monster = _monster(1, 1)
+        self.entities.append(monster)
+        self.index.move(monster, 4, 5)
+
+        self.assertEqual((monster.x, monster.y), (4, 5))
+        self.assertFalse(self.index.is_blocked(1, 1))
+        self.assertIs(self.index.blocking_entity_at(4, 5), monster)
+
+    def test_move_unindexed_entity(self):
+        """索引に登録されていないエンティティは座標だけ更新されることをテスト"""
+        monster = _monster(1, 1)
+        self.index.move(monster, 3, 3)
+        self.assertEqual((monster.x, monster.y), (3, 3))
+        self.assertFalse(self.index.is_occupied(3, 3))
+
+    def test_glyphs_and_kinds_follow_entities(self):
+        """文字と種類の層が追加・移動・削除に追従することをテスト"""
+        monster = _monster(2, 3)
+        gold = _gold(2, 3)
+        self.entities.append(gold)
+        self.assertEqual(self.index.glyphs[2, 3], ord("$"))
+        self.entities.append(monster)
+        # 塞ぐエンティティが上に描かれる
+        self.assertEqual(self.index.glyphs[2, 3], ord("B"))
+        both = kind_mask(EntityType.MONSTER, EntityType.GOLD)
+        self.assertEqual(self.index.kinds[2, 3], both)
+
+        self.index.move(monster, 4, 4)
+        self.assertEqual(self.index.glyphs[2, 3], ord("$"))
+        self.assertEqual(self.index.kinds[2, 3], kind_mask(EntityType.GOLD))
+        self.assertEqual(self.index.glyphs[4, 4], ord("B"))
+
+        self.entities.clear()
+        self.assertFalse(self.index.glyphs.any())
+        self.assertFalse(self.index.kinds.any())
+
+    def test_item_assignment_and_del_update_index(self):
+        """要素の代入と del で索引が更新されることをテスト"""
+        first, second = _monster(1, 1), _monster(2, 2)
+        self.entities.append(first)
+        self.entities[0] = second
+        self.assertFalse(self.index.is_occupied(1, 1))
+        self.assertIs(self.index.blocking_entity_at(2, 2), second)
+
+        del self.entities[0]
+        self.assertEqual(len(self.entities), 0)
+        self.assertFalse(self.index.is_occupied(2, 2))
+
+    def test_slice_assignment_and_del_update_index(self):
+        """スライスへの代入と del で索引が更新されることをテスト"""
+        self.entities.extend([_gold(1, 1), _gold(2, 2), _gold(3, 3)])
+        self.entities[1:] = [_monster(4, 4)]
+        self.assertEqual([(e.x, e.y) for e in self.entities], [(1, 1), (4, 4)])
+        self.assertFalse(self.index.is_occupied(2, 2))
+        self.assertFalse(self.index.is_occupied(3, 3))
+        self.assertTrue(self.index.is_blocked(4, 4))
+
+        del self.entities[:]
+        self.assertFalse(self.index.is_occupied(1, 1))
+        self.assertFalse(self.index.blocked.any())
+
+    def test_inplace_add_pop_and_insert_update_index(self):
+        """+=、pop、insert、remove で索引が更新されることをテスト"""
+        gold, monster = _gold(1, 1), _monster(2, 2)
+        self.entities += [gold]
+        self.entities.insert(0, monster)
+        self.assertIsInstance(self.entities, EntityList)
+        self.assertEqual(list(self.entities), [monster, gold])
+        self.assertEqual(self.index.items_at(1, 1), [gold])
+        self.assertTrue(self.index.is_blocked(2, 2))
+
+        self.assertIs(self.entities.pop(), gold)
+        self.assertFalse(self.index.is_occupied(1, 1))
+        self.entities.remove(monster)
+        self.assertFalse(self.index.is_occupied(2, 2))
+
+    def test_reordering_keeps_index(self):
+        """並べ替えても索引の内容が変わらないことをテスト"""
+        gold, monster = _gold(1, 1), _monster(2, 2)
+        self.entities.extend([gold, monster])
+        self.entities.reverse()
+        self.assertEqual(list(self.entities), [monster, gold])
+        self.entities.sort(key=lambda entity: entity.x)
+        self.assertEqual(list(self.entities), [gold, monster])
+        self.assertEqual(self.index.items_at(1, 1), [gold])
+        self.assertIs(self.index.blocking_entity_at(2, 2), monster)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import random
+from collections import Counter
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from config.items import ITEM_CHANCES
+from config.monsters import MONSTERS
+from entity.entity import Entity, EntityType
+from map.game_map import GameMap
+from map.spawn_table import SpawnTable, spawn_table
+
+
+class TestSpawnTable(TestCase):
+    def test_tables_are_shared_per_depth(self):
+        """深さごとのテーブルが一度だけ作られることをテスト"""
+        self.assertIs(spawn_table(3), spawn_table(3))
+        self.assertIsNot(spawn_table(3), spawn_table(4))
+
+    def test_monsters_match_depth(self):
+        """そのフロアに出現できるモンスターだけが定義順に並ぶことをテスト"""
+        for level in (1, 10, 26):
+            expected = [
+                name
+                for name, data in MONSTERS.items()
+                if data["min_level"] <= level <= data["max_level"]
+            ]
+            self.assertEqual(list(spawn_table(level).monster_names), expected)
+
+    def test_items_match_depth(self):
+        """その階層で作れるカテゴリだけが抽選対象になることをテスト"""
+        self.assertEqual(spawn_table(26).item_names, tuple(ITEM_CHANCES))
+        self.assertEqual(spawn_table(26).item_total, sum(ITEM_CHANCES.values()))
+        shallow = spawn_table(1).item_names
+        self.assertIn("healing_potion", shallow)
+        self.assertNotIn("rare_weapon", shallow)
+
+    def test_items_follow_their_chances(self):
+        """アイテムの種類が重みに比例して抽選されることをテスト"""
+        table = spawn_table(26)
+        draws = Counter(table.sample_items(random.Random(1), 50000))
+        for name in ("healing_potion", "food", "rare_ring"):
+            expected = ITEM_CHANCES[name] / table.item_total
+            self.assertAlmostEqual(draws[name] / 50000, expected, delta=0.005)
+
+    def test_batches_are_reproducible(self):
+        """同じ乱数列からは同じ抽選結果になることをテスト"""
+        table = spawn_table(5)
+        for sample in (table.sample_monsters, table.sample_items):
+            first = sample(random.Random(3), 10)
+            self.assertEqual(len(first), 10)
+            self.assertEqual(first, sample(random.Random(3), 10))
+        monsters = table.sample_monsters(random.Random(3), 50)
+        self.assertTrue(set(monsters) <= set(table.monster_names))
+        self.assertEqual(table.sample_items(random.Random(3), 0), [])
+
+    def test_levels_are_generated_from_batches(self):
+        """マップ生成が部屋ごとにまとめて抽選することをテスト"""
+        player = Entity(0, 0, "@", (255, 255, 255), "Player", EntityType.PLAYER)
+        game_map = GameMap(80, 45, 3, rng=random.Random(9))
+        entities = game_map.create_entity_list([player])
+        monsters = patch.object(
+            SpawnTable,
+            "sample_monsters",
+            autospec=True,
+            wraps=SpawnTable.sample_monsters,
+        )
+        items = patch.object(
+            SpawnTable, "sample_items", autospec=True, wraps=SpawnTable.sample_items
+        )
+        with monsters as sample_monsters, items as sample_items:
+            game_map.make_map(player, entities)
+
+        # 部屋ごとに1回ずつ抽選され、置けた分だけがマップに出る
+        rooms = len(game_map.rooms)
+        self.assertEqual(sample_monsters.call_count, rooms)
+        self.assertEqual(sample_items.call_count, rooms)
+        drawn = sum(call.args[2] for call in sample_monsters.call_args_list)
+        placed = sum(e.entity_type == EntityType.MONSTER for e in entities)
+        self.assertLessEqual(placed, drawn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+import os
+import random
+import tempfile
+from unittest import TestCase, main
+
+from batch import POLICIES, descend_policy, game_seed, main as batch_main, run_game
+from config.constants import INVENTORY_CAPACITY
+from engine.game import Game
+from entity.item_factory import ITEM_FACTORY
+
+
+class TestBatchRunner(TestCase):
+    def test_run_game_is_reproducible(self):
+        """同じシードと方針のゲームは同じ結果になることをテスト"""
+        for policy in POLICIES:
+            first = run_game(5, policy=policy, max_turns=300)
+            self.assertEqual(first, run_game(5, policy=policy, max_turns=300))
+            self.assertLessEqual(first["turns"], 300)
+            self.assertIn(first["outcome"], ("died", "ended", "max_turns"))
+            if first["outcome"] == "died":
+                self.assertIsNotNone(first["killed_by"])
+
+    def test_game_seeds_differ(self):
+        """バッチ内の各ゲームに異なるシードが割り当てられることをテスト"""
+        seeds = {game_seed(1, i) for i in range(100)}
+        self.assertEqual(len(seeds), 100)
+        self.assertEqual(game_seed(1, 3), game_seed(1, 3))
+
+    def test_main_writes_one_line_per_game(self):
+        """ゲームごとに1行のJSONが出力されることをテスト"""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "results.jsonl")
+            batch_main(
+                ["--games", "3", "--workers", "2", "--seed", "7"]
+                + ["--max-turns", "50", "--out", out]
+            )
+            with open(out, encoding="utf-8") as f:
+                summaries = [json.loads(line) for line in f]
+
+        self.assertEqual(
+            [s["seed"] for s in summaries], [game_seed(7, i) for i in range(3)]
+        )
+        self.assertEqual(summaries[0], run_game(game_seed(7, 0), max_turns=50))
+
+    def test_descend_policy_skips_pickup_when_full(self):
+        """インベントリが満杯なら拾わずに移動することをテスト"""
+        with Game(seed=3, prefetch_levels=False) as game:
+            player = game.player
+            arrow = ITEM_FACTORY.create("arrow", player.x, player.y, 1)
+            game.entities.append(arrow)
+            rng = random.Random(0)
+            self.assertEqual(descend_policy(game, rng), ("pickup",))
+
+            while len(player.inventory) < INVENTORY_CAPACITY:
+                player.inventory.append(ITEM_FACTORY.create("food", 0, 0, 1))
+            self.assertEqual(descend_policy(game, rng)[0], "move")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,28 @@
 import logging
-import shutil
+import logging.handlers
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from unittest import TestCase, main
 
-from src.utils.logger import setup_logger, cleanup_old_logs
+from utils.logger import (
+    cleanup_old_logs,
+    enable_async_logging,
+    set_log_level,
+    setup_logger,
+    stop_async_logging,
+)
 
 
 class TestLogger(TestCase):
     def setUp(self):
         """テスト実行前の準備"""
-        self.test_log_dir = Path("test_logs")
-        self.test_log_dir.mkdir(exist_ok=True)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.test_log_dir = Path(self.tmp.name)
     
     def tearDown(self):
         """テスト実行後のクリーンアップ"""
-        if self.test_log_dir.exists():
-            shutil.rmtree(self.test_log_dir)
+        self.tmp.cleanup()
     
     def test_logger_creation(self):
         """ロガーが正しく作成されることをテスト"""
@@ -34,6 +40,43 @@ class TestLogger(TestCase):
         self.assertEqual(logger1, logger2)
         self.assertEqual(len(logger2.handlers), handlers_count)
     
+    def test_handlers_shared_between_loggers(self):
+        """別名のロガーでもログファイルのハンドラが共有されることをテスト"""
+        logger1 = setup_logger("test_shared_a")
+        logger2 = setup_logger("test_shared_b", logging.INFO)
+        self.assertEqual(logger1.handlers, logger2.handlers)
+        self.assertEqual(logger2.level, logging.INFO)
+
+    def test_async_logging_mode(self):
+        """非同期モードではキュー経由になり、終了時に元のハンドラへ戻ることをテスト"""
+        logger = setup_logger("test_async")
+        direct_handlers = list(logger.handlers)
+
+        enable_async_logging()
+        try:
+            self.assertEqual(len(logger.handlers), 1)
+            self.assertIsInstance(logger.handlers[0], logging.handlers.QueueHandler)
+            # 有効化後に作成したロガーもキューを使う
+            late_logger = setup_logger("test_async_late")
+            self.assertEqual(late_logger.handlers, logger.handlers)
+            logger.info("queued message")
+        finally:
+            stop_async_logging()
+
+        self.assertEqual(logger.handlers, direct_handlers)
+
+    def test_set_log_level(self):
+        """コンポーネントごとのレベル設定が作成前後どちらでも反映されることをテスト"""
+        set_log_level("test_level_late", "WARNING")
+        self.assertEqual(setup_logger("test_level_late").level, logging.WARNING)
+
+        logger = setup_logger("test_level_early")
+        set_log_level("test_level_early", logging.ERROR)
+        self.assertEqual(logger.level, logging.ERROR)
+
+        with self.assertRaises(ValueError):
+            set_log_level("test_level_early", "LOUD")
+
     def test_cleanup_old_logs(self):
         """古いログファイルが正しく削除されることをテスト"""
         # テスト用のログファイルを作成
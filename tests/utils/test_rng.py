@@ -0,0 +1,85 @@
+import random
+from unittest import TestCase, main
+
+from engine.game import Game
+from utils.rng import RandomStreams
+
+_MOVES = random.Random(1).choices([(0, 1), (1, 0), (0, -1), (-1, 0)], k=200)
+
+
+def _play(game):
+    """決まった行動列でゲームを進め、最終状態を返す"""
+    for dx, dy in _MOVES:
+        if game.step(("move", dx, dy)).done:
+            break
+    return _state(game)
+
+
+def _state(game):
+    return (
+        game.player.x,
+        game.player.y,
+        game.player.hp,
+        game.player.xp,
+        [(e.name, e.x, e.y) for e in game.entities],
+        list(game.messages),
+    )
+
+
+class TestRandomStreams(TestCase):
+    def test_same_seed_same_streams(self):
+        """同じシードからは同じ乱数列が得られることをテスト"""
+        a, b = RandomStreams(42), RandomStreams(42)
+        self.assertEqual(a.combat.random(), b.combat.random())
+        self.assertEqual(a.ai.random(), b.ai.random())
+        self.assertEqual(a.mapgen(3).random(), b.mapgen(3).random())
+        self.assertNotEqual(a.mapgen(3).random(), a.mapgen(4).random())
+
+    def test_mapgen_does_not_depend_on_other_streams(self):
+        """戦闘の乱数を消費しても階層の生成結果は変わらないことをテスト"""
+        a, b = RandomStreams(7), RandomStreams(7)
+        for _ in range(100):
+            b.combat.random()
+        self.assertEqual(a.mapgen(2).random(), b.mapgen(2).random())
+
+    def test_state_round_trip(self):
+        """getstate/setstate で乱数列を再現できることをテスト"""
+        streams = RandomStreams(5)
+        state = streams.getstate()
+        expected = [streams.combat.random(), streams.ai.random()]
+
+        restored = RandomStreams(99)
+        restored.setstate(state)
+        self.assertEqual(restored.seed, 5)
+        self.assertEqual([restored.combat.random(), restored.ai.random()], expected)
+
+
+class TestSeededGame(TestCase):
+    def test_seeded_games_are_reproducible(self):
+        """同じシードのゲームはグローバルの乱数状態によらず同じ結果になることをテスト"""
+        random.seed(1)
+        with Game(seed=123) as game:
+            first = _play(game)
+        random.seed(2)
+        with Game(seed=123) as game:
+            second = _play(game)
+        self.assertEqual(first, second)
+
+    def test_interleaved_games_do_not_interfere(self):
+        """複数のゲームを交互に進めても互いに影響しないことをテスト"""
+        with Game(seed=10) as game:
+            alone = _play(game)
+
+        games = [Game(seed=10), Game(seed=11)]
+        for game in games:
+            self.addCleanup(game.close)
+        done = [False, False]
+        for dx, dy in _MOVES:
+            for i, game in enumerate(games):
+                if not done[i]:
+                    done[i] = game.step(("move", dx, dy)).done
+        self.assertEqual(alone, _state(games[0]))
+
+
+if __name__ == "__main__":
+    main()